@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+
+"""Benchmarks for the speech recognizers in kaldi.asr.
+
+All models are synthetic and built locally from a fixed random seed: a
+monophone HMM/transition model, a word loop decoding graph where each phone is
+a word, a diagonal GMM acoustic model and a small TDNN acoustic model. Inputs
+are random waveforms. Recognition outputs are meaningless, but the amount of
+work done by each component is representative of small real setups.
+
+For each recognizer, this reports real-time factor (RTF), per-utterance latency
+for each processing stage and peak resident set size (RSS). Each recognizer is
+benchmarked in a separate process so that peak RSS figures are not mixed up.
+Results are written as JSON so that they can be compared across releases.
+
+Usage::
+
+    python asr-benchmark.py --output results.json
+    python asr-benchmark.py --recognizers gmm nnet --num-utts 20
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+
+import numpy
+
+import kaldi
+from kaldi.asr import (GmmLatticeFasterRecognizer,
+                       NnetLatticeFasterRecognizer,
+                       NnetLatticeFasterBatchRecognizer,
+                       NnetLatticeFasterOnlineRecognizer)
+from kaldi.base.io import istringstream
+from kaldi.decoder import (DecodableMatrixScaledMapped,
+                           LatticeFasterDecoder,
+                           LatticeFasterDecoderOptions,
+                           LatticeFasterOnlineDecoder)
+from kaldi.feat.mfcc import Mfcc, MfccOptions
+from kaldi.feat.window import FrameExtractionOptions
+from kaldi.fstext import StdFstCompiler, SymbolTable, compose
+from kaldi.gmm import DiagGmm
+from kaldi.gmm.am import AmDiagGmm
+from kaldi.hmm import (HmmTopology, HTransducerConfig, TransitionModel,
+                       add_self_loops, get_h_transducer)
+from kaldi.matrix import Matrix, Vector
+from kaldi.nnet3 import (AmNnetSimple, DecodableNnetSimple, Nnet,
+                         NnetBatchComputerOptions,
+                         NnetSimpleComputationOptions,
+                         NnetSimpleLoopedComputationOptions,
+                         get_output_for_frames)
+from kaldi.online2 import (OnlineNnetFeaturePipeline,
+                           OnlineNnetFeaturePipelineConfig,
+                           OnlineNnetFeaturePipelineInfo)
+from kaldi.tree import monophone_context_dependency
+
+# Private helper used by Recognizer.decode. Calling it separately allows timing
+# lattice determinization and output formatting on their own.
+from kaldi.asr import _get_decoding_output
+
+RECOGNIZERS = ["gmm", "nnet", "batch", "online"]
+
+SAMP_FREQ = 16000.0
+
+TOPOLOGY = """<Topology>
+<TopologyEntry>
+<ForPhones> {phones} </ForPhones>
+<State> 0 <PdfClass> 0 <Transition> 0 0.5 <Transition> 1 0.5 </State>
+<State> 1 <PdfClass> 1 <Transition> 1 0.5 <Transition> 2 0.5 </State>
+<State> 2 <PdfClass> 2 <Transition> 2 0.5 <Transition> 3 0.5 </State>
+<State> 3 </State>
+</TopologyEntry>
+</Topology>
+"""
+
+NNET_CONFIG = """input-node name=input dim={input_dim}
+component name=tdnn1.affine type=AffineComponent input-dim={tdnn1_dim} output-dim={hidden_dim}
+component name=tdnn1.relu type=RectifiedLinearComponent dim={hidden_dim}
+component name=tdnn2.affine type=AffineComponent input-dim={tdnn2_dim} output-dim={hidden_dim}
+component name=tdnn2.relu type=RectifiedLinearComponent dim={hidden_dim}
+component name=output.affine type=AffineComponent input-dim={hidden_dim} output-dim={output_dim}
+component name=output.log-softmax type=LogSoftmaxComponent dim={output_dim}
+component-node name=tdnn1.affine component=tdnn1.affine input=Append(Offset(input, -1), input, Offset(input, 1))
+component-node name=tdnn1.relu component=tdnn1.relu input=tdnn1.affine
+component-node name=tdnn2.affine component=tdnn2.affine input=Append(Offset(tdnn1.relu, -2), tdnn1.relu, Offset(tdnn1.relu, 2))
+component-node name=tdnn2.relu component=tdnn2.relu input=tdnn2.affine
+component-node name=output.affine component=output.affine input=tdnn2.relu
+component-node name=output.log-softmax component=output.log-softmax input=output.affine
+output-node name=output input=output.log-softmax objective=linear
+"""
+
+
+def make_mfcc_opts(args):
+    # Nested options are returned by value, so they are assigned as a whole.
+    frame_opts = FrameExtractionOptions()
+    frame_opts.samp_freq = SAMP_FREQ
+    frame_opts.dither = 0.0
+    mfcc_opts = MfccOptions()
+    mfcc_opts.frame_opts = frame_opts
+    mfcc_opts.num_ceps = args.feat_dim
+    return mfcc_opts
+
+
+class Setup(object):
+    """Synthetic models, decoding graph and inputs."""
+
+    def __init__(self, args):
+        rng = numpy.random.RandomState(args.seed)
+        phones = list(range(1, args.num_phones + 1))
+
+        # Transition model
+        topo = HmmTopology()
+        topo.read(istringstream.from_str(
+            TOPOLOGY.format(phones=" ".join(map(str, phones)))), False)
+        self.ctx_dep = monophone_context_dependency(
+            phones, [0] + [3] * args.num_phones)
+        self.transition_model = TransitionModel.from_topo(self.ctx_dep, topo)
+        num_pdfs = self.transition_model.num_pdfs()
+
+        # Decoding graph: H o G, where G is a loop over one-phone words
+        self.symbols = SymbolTable()
+        self.symbols.add_symbol("<eps>")
+        compiler = StdFstCompiler()
+        for phone in phones:
+            self.symbols.add_symbol("w{}".format(phone))
+            print("0 0 {0} {0} {1}".format(phone, numpy.log(len(phones))),
+                  file=compiler)
+        print("0", file=compiler)
+        grammar = compiler.compile()
+        grammar.arcsort("ilabel")
+        ilabel_info = [[]] + [[phone] for phone in phones]
+        h_transducer, disambig = get_h_transducer(
+            ilabel_info, self.ctx_dep, self.transition_model,
+            HTransducerConfig())
+        h_transducer.arcsort("olabel")
+        self.graph = compose(h_transducer, grammar)
+        add_self_loops(self.transition_model, disambig, 0.1, True, True,
+                       self.graph)
+
+        # GMM acoustic model
+        self.gmm = AmDiagGmm()
+        for _ in range(num_pdfs):
+            gmm = DiagGmm.from_nmix_dim(args.num_gauss, args.feat_dim)
+            gmm.set_weights(Vector([1.0 / args.num_gauss] * args.num_gauss))
+            gmm.set_inv_vars_and_means(
+                Matrix(numpy.ones((args.num_gauss, args.feat_dim))),
+                Matrix(rng.randn(args.num_gauss, args.feat_dim)))
+            gmm.compute_gconsts()
+            self.gmm.add_pdf(gmm)
+
+        # TDNN acoustic model
+        nnet = Nnet()
+        nnet.read_config(istringstream.from_str(NNET_CONFIG.format(
+            input_dim=args.feat_dim, tdnn1_dim=3 * args.feat_dim,
+            tdnn2_dim=3 * args.hidden_dim, hidden_dim=args.hidden_dim,
+            output_dim=num_pdfs)))
+        self.nnet = AmNnetSimple.from_nnet(nnet)
+        self.nnet.set_priors(Vector([1.0 / num_pdfs] * num_pdfs))
+
+        # Inputs
+        num_samples = int(args.utt_dur * SAMP_FREQ)
+        self.waves = [Vector(1000.0 * rng.randn(num_samples))
+                      for _ in range(args.num_utts)]
+        self.audio_seconds = args.num_utts * args.utt_dur
+
+        self.mfcc_opts = make_mfcc_opts(args)
+        self.mfcc = Mfcc(self.mfcc_opts)
+
+    def features(self, wave):
+        return self.mfcc.compute_features(wave, SAMP_FREQ, 1.0)
+
+    def decoder_opts(self, args):
+        opts = LatticeFasterDecoderOptions()
+        opts.beam = args.beam
+        opts.lattice_beam = args.lattice_beam
+        opts.max_active = args.max_active
+        return opts
+
+
+class Stages(object):
+    """Collects per-utterance latencies for processing stages."""
+
+    def __init__(self):
+        self.latencies = {}
+        self._stage = None
+
+    def __call__(self, stage):
+        self._stage = stage
+        return self
+
+    def __enter__(self):
+        self._start = time.time()
+
+    def __exit__(self, type, value, traceback):
+        elapsed = time.time() - self._start
+        self.latencies.setdefault(self._stage, []).append(elapsed)
+
+    def summary(self):
+        summary = {}
+        for stage, latencies in self.latencies.items():
+            ms = 1000.0 * numpy.asarray(latencies)
+            summary[stage] = {
+                "count": len(latencies),
+                "total_ms": float(ms.sum()),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(numpy.percentile(ms, 50)),
+                "p90_ms": float(numpy.percentile(ms, 90)),
+                "max_ms": float(ms.max()),
+            }
+        return summary
+
+
+def bench_gmm(setup, args):
+    asr = GmmLatticeFasterRecognizer(
+        setup.transition_model, setup.gmm,
+        LatticeFasterDecoder(setup.graph, setup.decoder_opts(args)),
+        setup.symbols)
+
+    start = time.time()
+    for wave in setup.waves:
+        asr.decode(setup.features(wave))
+    wall = time.time() - start
+
+    # GMM likelihoods are computed on demand during search.
+    stages = Stages()
+    for wave in setup.waves:
+        with stages("feature"):
+            feats = setup.features(wave)
+        with stages("search"):
+            asr.decoder.decode(asr._make_decodable(feats))
+        with stages("determinize"):
+            _get_decoding_output(asr, ["lattice"])
+        with stages("output"):
+            _get_decoding_output(asr, ["best_path", "text"])
+    return wall, stages
+
+
+def bench_nnet(setup, args):
+    decodable_opts = NnetSimpleComputationOptions()
+    decodable_opts.acoustic_scale = args.acoustic_scale
+    decodable_opts.frames_per_chunk = args.frames_per_chunk
+    asr = NnetLatticeFasterRecognizer(
+        setup.transition_model, setup.nnet,
+        LatticeFasterDecoder(setup.graph, setup.decoder_opts(args)),
+        setup.symbols, decodable_opts=decodable_opts)
+
+    start = time.time()
+    for wave in setup.waves:
+        asr.decode(setup.features(wave))
+    wall = time.time() - start
+
+    # Nnet outputs are computed up front so that search is timed separately.
+    # They already include the acoustic scale.
+    stages = Stages()
+    nnet = setup.nnet.get_nnet()
+    for wave in setup.waves:
+        with stages("feature"):
+            feats = setup.features(wave)
+        with stages("nnet"):
+            computer = DecodableNnetSimple(
+                asr.decodable_opts, nnet, setup.nnet.priors(), feats,
+                asr.compiler, None, None, 0)
+            loglikes = Matrix(computer.num_frames(), computer.output_dim())
+            get_output_for_frames(computer, 0, loglikes)
+        with stages("search"):
+            asr.decoder.decode(DecodableMatrixScaledMapped(
+                setup.transition_model, loglikes, 1.0))
+        with stages("determinize"):
+            _get_decoding_output(asr, ["lattice"])
+        with stages("output"):
+            _get_decoding_output(asr, ["best_path", "text"])
+    return wall, stages
+
+
+def bench_batch(setup, args):
+    compute_opts = NnetBatchComputerOptions()
+    compute_opts.acoustic_scale = args.acoustic_scale
+    compute_opts.frames_per_chunk = args.frames_per_chunk
+    asr = NnetLatticeFasterBatchRecognizer(
+        setup.transition_model, setup.nnet, setup.graph, setup.symbols,
+        decoder_opts=setup.decoder_opts(args), compute_opts=compute_opts,
+        num_threads=args.num_threads)
+
+    # Nnet computation, search and determinization run in background threads,
+    # so only feature extraction and input submission are timed separately.
+    stages = Stages()
+    start = time.time()
+    for i, wave in enumerate(setup.waves):
+        with stages("feature"):
+            feats = setup.features(wave)
+        with stages("accept_input"):
+            asr.accept_input(str(i), feats)
+        for _ in asr.get_outputs():
+            pass
+    with stages("finish"):
+        asr.finished()
+        for _ in asr.get_outputs():
+            pass
+    wall = time.time() - start
+    return wall, stages
+
+
+def bench_online(setup, args):
+    decodable_opts = NnetSimpleLoopedComputationOptions()
+    decodable_opts.acoustic_scale = args.acoustic_scale
+    decodable_opts.frames_per_chunk = args.frames_per_chunk
+    asr = NnetLatticeFasterOnlineRecognizer(
+        setup.transition_model, setup.nnet,
+        LatticeFasterOnlineDecoder(setup.graph, setup.decoder_opts(args)),
+        setup.symbols, decodable_opts=decodable_opts)
+    feat_opts = OnlineNnetFeaturePipelineConfig()
+    feat_info = OnlineNnetFeaturePipelineInfo.from_config(feat_opts)
+    feat_info.mfcc_opts = setup.mfcc_opts
+    chunk_size = int(args.chunk_dur * SAMP_FREQ)
+
+    # Feature extraction, nnet computation and search are interleaved while
+    # streaming. The "finalize" stage is the latency after end of input.
+    stages = Stages()
+    start = time.time()
+    for wave in setup.waves:
+        feat_pipeline = OnlineNnetFeaturePipeline(feat_info)
+        asr.set_input_pipeline(feat_pipeline)
+        asr.init_decoding()
+        data = wave.numpy()
+        for i in range(0, len(data), chunk_size):
+            with stages("chunk"):
+                feat_pipeline.accept_waveform(
+                    SAMP_FREQ, Vector(data[i:i + chunk_size]))
+                asr.advance_decoding()
+        with stages("finalize"):
+            feat_pipeline.input_finished()
+            asr.advance_decoding()
+            asr.finalize_decoding()
+        with stages("determinize"):
+            _get_decoding_output(asr, ["lattice"])
+        with stages("output"):
+            _get_decoding_output(asr, ["best_path", "text"])
+    wall = time.time() - start
+    return wall, stages
+
+
+def peak_rss_mb():
+    """Returns peak resident set size of this process in megabytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # bytes on macOS, kilobytes elsewhere
+        return rss / 2 ** 20
+    return rss / 2 ** 10
+
+
+def run(name, args):
+    """Runs a single benchmark. Called in a separate process."""
+    setup_start = time.time()
+    setup = Setup(args)
+    setup_seconds = time.time() - setup_start
+    bench = globals()["bench_" + name]
+    for _ in range(args.warmup):
+        bench(setup, args)
+    wall, stages = bench(setup, args)
+    return {
+        "setup_seconds": setup_seconds,
+        "audio_seconds": setup.audio_seconds,
+        "wall_seconds": wall,
+        "rtf": wall / setup.audio_seconds,
+        "stages": stages.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks kaldi.asr recognizers on synthetic models.")
+    parser.add_argument("--recognizers", nargs="+", choices=RECOGNIZERS,
+                        default=RECOGNIZERS, help="Recognizers to benchmark.")
+    parser.add_argument("--output", default="-",
+                        help="Output JSON file. Defaults to stdout.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--num-utts", type=int, default=10)
+    parser.add_argument("--utt-dur", type=float, default=5.0,
+                        help="Utterance duration in seconds.")
+    parser.add_argument("--chunk-dur", type=float, default=0.1,
+                        help="Online chunk duration in seconds.")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Number of warmup passes over the inputs.")
+    parser.add_argument("--num-phones", type=int, default=40)
+    parser.add_argument("--num-gauss", type=int, default=8)
+    parser.add_argument("--feat-dim", type=int, default=13)
+    parser.add_argument("--hidden-dim", type=int, default=256)
+    parser.add_argument("--beam", type=float, default=13.0)
+    parser.add_argument("--lattice-beam", type=float, default=6.0)
+    parser.add_argument("--max-active", type=int, default=7000)
+    parser.add_argument("--acoustic-scale", type=float, default=0.1)
+    parser.add_argument("--frames-per-chunk", type=int, default=50)
+    parser.add_argument("--num-threads", type=int, default=2,
+                        help="Number of search threads for batch recognizer.")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.recognizers:
+        print("Benchmarking {} recognizer...".format(name), file=sys.stderr)
+        pool = multiprocessing.Pool(1)
+        try:
+            results[name] = pool.apply(run, (name, args))
+        finally:
+            pool.terminate()
+            pool.join()
+        print("  RTF: {:.4f}, peak RSS: {:.1f} MB".format(
+                  results[name]["rtf"], results[name]["peak_rss_mb"]),
+              file=sys.stderr)
+
+    report = {
+        "pykaldi_version": kaldi.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+from __future__ import print_function
+
+from kaldi.asr import NnetLatticeFasterRecognizer, RecognizerPool
+from kaldi.decoder import LatticeFasterDecoderOptions
+from kaldi.nnet3 import NnetSimpleComputationOptions
+
+
+# Construct recognizer (called once in each worker process)
+def make_recognizer():
+    decoder_opts = LatticeFasterDecoderOptions()
+    decoder_opts.beam = 13
+    decoder_opts.max_active = 7000
+    decodable_opts = NnetSimpleComputationOptions()
+    decodable_opts.acoustic_scale = 1.0
+    decodable_opts.frame_subsampling_factor = 3
+    decodable_opts.frames_per_chunk = 150
+    return NnetLatticeFasterRecognizer.from_files(
+        "final.mdl", "HCLG.fst", "words.txt",
+        decoder_opts=decoder_opts, decodable_opts=decodable_opts)
+
+
+# Define feature pipelines as Kaldi rspecifiers
+feats_rspec = "ark:compute-mfcc-feats --config=mfcc.conf scp:wav.scp ark:- |"
+ivectors_rspec = (
+    "ark:compute-mfcc-feats --config=mfcc.conf scp:wav.scp ark:-"
+    " | ivector-extract-online2 --config=ivector.conf ark:spk2utt ark:- ark:- |"
+    )
+
+# Decode wav files with 4 worker processes
+if __name__ == "__main__":
+    with RecognizerPool(make_recognizer, num_workers=4) as pool:
+        num_success, num_failed = pool.decode_table(
+            feats_rspec, lattice_wspecifier="ark:lat.ark",
+            text_wxfilename="text", ivectors_rspecifier=ivectors_rspec)
+    print("Done {} utterances, failed for {}.".format(num_success, num_failed))
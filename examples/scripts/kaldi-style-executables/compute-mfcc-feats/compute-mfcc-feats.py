@@ -57,8 +57,7 @@ def compute_mfcc_feats(wav_rspecifier, feats_wspecifier, opts, mfcc_opts):
                 mean = Vector(feats.num_cols)
                 mean.add_row_sum_mat_(1.0, feats)
                 mean.scale_(1.0 / feats.num_rows)
-                for i in range(feats.num_rows):
-                    feats[i].add_vec_(-1.0, mean)
+                feats.add_vec_to_rows_(-1.0, mean)
 
             writer[key] = feats
             num_success += 1
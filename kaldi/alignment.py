@@ -1,5 +1,6 @@
 from __future__ import division
 
+from .asr import _nnet_lock, _prepare_nnet
 from .base import io as _base_io
 from . import decoder as _dec
 from . import fstext as _fst
@@ -459,9 +460,7 @@ class NnetAligner(Aligner):
             raise TypeError("acoustic_model should be a AmNnetSimple object")
         self.acoustic_model = acoustic_model
         nnet = self.acoustic_model.get_nnet()
-        _nnet3.set_batchnorm_test_mode(True, nnet)
-        _nnet3.set_dropout_test_mode(True, nnet)
-        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), nnet)
+        _prepare_nnet(nnet)
         if decodable_opts:
             if not isinstance(decodable_opts,
                               _nnet3.NnetSimpleComputationOptions):
@@ -537,6 +536,10 @@ class NnetAligner(Aligner):
                    transition_scale, self_loop_scale, decodable_opts,
                    online_ivector_period)
 
+    def align(self, input, text):
+        with _nnet_lock.shared():
+            return super(NnetAligner, self).align(input, text)
+
     def _make_decodable(self, features):
         """Constructs a new decodable object from input features.
 
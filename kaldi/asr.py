@@ -10,6 +10,21 @@ this module cover only the most "typical" combinations.
 
 from __future__ import division
 
+import collections
+import contextlib
+import logging
+import multiprocessing
+import threading
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
 from . import cudamatrix as _cumatrix
 from . import decoder as _dec
 from . import fstext as _fst
@@ -21,11 +36,14 @@ from .gmm import am as _gmm_am
 from . import hmm as _hmm
 from .lat import functions as _lat_funcs
 from . import lm as _lm
+from . import matrix as _matrix
 from .matrix import _kaldi_matrix
+from .matrix import _kaldi_vector
 from . import rnnlm as _rnnlm
 from . import nnet3 as _nnet3
 from . import online2 as _online2
 from .util import io as _util_io
+from .util import table as _util_table
 
 
 __all__ = ['Recognizer',
@@ -44,18 +62,208 @@ __all__ = ['Recognizer',
            'NnetFasterRecognizer',
            'NnetLatticeFasterRecognizer',
            'NnetLatticeFasterBatchRecognizer',
+           'AsyncBatchRecognizer',
+           'NnetBatchLikelihoodComputer',
            'NnetLatticeFasterGrammarRecognizer',
            'NnetLatticeBiglmFasterRecognizer',
            'OnlineRecognizer',
            'NnetOnlineRecognizer',
            'NnetLatticeFasterOnlineRecognizer',
            'NnetLatticeFasterOnlineGrammarRecognizer',
+           'RecognizerPool',
            'LatticeLmRescorer']
 
 
+class _SharedLock(object):
+    """Lock that is held either by any number of readers or by one writer.
+
+    Writers are preferred: once a writer is waiting, new readers wait until
+    it is done, so a steady stream of readers cannot starve writers.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextlib.contextmanager
+    def shared(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+# Guards neural networks shared across recognizers and segmenters. Networks are
+# prepared in place under the exclusive lock and evaluated under the shared
+# lock, so preparing a network never races with a computation using it. The
+# lock is global rather than per network since Python wrappers do not identify
+# networks: the same C++ network is returned in a new wrapper by each call to
+# `AmNnetSimple.get_nnet`, and wrappers cannot be weakly referenced. Networks
+# are only prepared on construction, so the global lock only
+# delays construction until ongoing computations finish.
+_nnet_lock = _SharedLock()
+
+
+def _prepare_nnet(nnet):
+    """Prepares a neural network for inference.
+
+    This modifies the network in place. It waits for ongoing synchronous
+    computations with any network to finish, so that recognizers sharing the
+    same acoustic model can be constructed from one thread while others are
+    decoding with it.
+
+    Args:
+        nnet (Nnet): The neural network.
+    """
+    with _nnet_lock.exclusive():
+        _nnet3.set_batchnorm_test_mode(True, nnet)
+        _nnet3.set_dropout_test_mode(True, nnet)
+        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), nnet)
+
+
+# Decoding outputs derived from the best path.
+_BEST_PATH_OUTPUTS = frozenset(["alignment", "best_path", "likelihood", "text",
+                                "weight", "words"])
+_DECODING_OUTPUTS = _BEST_PATH_OUTPUTS | frozenset(["lattice"])
+
+
+def _get_decoding_output(recognizer, outputs=None):
+    """Returns decoding output for a recognizer that finished decoding.
+
+    Only the requested outputs are computed, e.g. lattice determinization and
+    scaling are skipped unless the "lattice" output is requested.
+
+    Args:
+        recognizer (Recognizer or OnlineRecognizer): The recognizer.
+        outputs (Iterable[str]): Names of the outputs to compute. If ``None``,
+            computes all outputs.
+
+    Returns:
+        A dictionary representing decoding output.
+
+    Raises:
+        ValueError: If an unknown output is requested.
+        RuntimeError: If decoding fails.
+    """
+    if outputs is None:
+        outputs = _DECODING_OUTPUTS
+    else:
+        outputs = frozenset(outputs)
+        if not outputs <= _DECODING_OUTPUTS:
+            raise ValueError("Unknown decoding outputs: {}".format(
+                ", ".join(sorted(outputs - _DECODING_OUTPUTS))))
+
+    decoder = recognizer.decoder
+    if not (recognizer.allow_partial or decoder.reached_final()):
+        raise RuntimeError("No final state was active on the last frame.")
+
+    output = {}
+    if recognizer.acoustic_scale != 0.0:
+        scale = _fst_utils.acoustic_lattice_scale(
+            1.0 / recognizer.acoustic_scale)
+
+    if outputs & _BEST_PATH_OUTPUTS:
+        try:
+            best_path = decoder.get_best_path()
+        except RuntimeError:
+            raise RuntimeError("Empty decoding output.")
+
+        ali, words, weight = _fst_utils.get_linear_symbol_sequence(best_path)
+        if "alignment" in outputs:
+            output["alignment"] = ali
+        if "words" in outputs:
+            output["words"] = words
+        if "weight" in outputs:
+            output["weight"] = weight
+        if "likelihood" in outputs:
+            output["likelihood"] = - (weight.value1 + weight.value2)
+
+        if "text" in outputs:
+            if recognizer.symbols:
+                output["text"] = " ".join(
+                    _fst.indices_to_symbols(recognizer.symbols, words))
+            else:
+                output["text"] = " ".join(map(str, words))
+
+        if "best_path" in outputs:
+            if recognizer.acoustic_scale != 0.0:
+                _fst_utils.scale_lattice(scale, best_path)
+            output["best_path"] = (
+                _fst_utils.convert_lattice_to_compact_lattice(best_path))
+
+    if "lattice" in outputs:
+        try:
+            lat = decoder.get_raw_lattice()
+        except AttributeError:
+            return output
+        if lat.num_states() == 0:
+            raise RuntimeError("Empty output lattice.")
+        lat.connect()
+
+        lat = recognizer._determinize_lattice(lat)
+
+        if recognizer.acoustic_scale != 0.0:
+            if isinstance(lat, _fst.CompactLatticeVectorFst):
+                _fst_utils.scale_compact_lattice(scale, lat)
+            else:
+                _fst_utils.scale_lattice(scale, lat)
+        output["lattice"] = lat
+
+    return output
+
+
 class Recognizer(object):
     """Base class for speech recognizers.
 
+    Thread safety: The long running native calls made while decoding, e.g.
+    decoder search, neural network computation, lattice determinization,
+    release the global interpreter lock, so multiple recognizers can decode in
+    parallel from multiple Python threads. A recognizer instance holds mutable
+    decoding state and should be used by a single thread at a time. Read-only
+    resources, i.e. the decoding graph, the transition model, the acoustic
+    model and the symbol table, can be shared across recognizer instances
+    decoding concurrently. Each instance should be constructed with its own
+    decoder object. Neural network recognizers prepare the acoustic model in
+    place when they are constructed. Construction waits for ongoing neural
+    network decoding to finish, so new recognizers sharing a model can be
+    constructed while others are decoding. Batch recognizers evaluate the
+    model in background threads, hence recognizers sharing a model with a
+    batch recognizer should be constructed before it starts decoding.
+
+    Sharing decoding graphs: To avoid loading a separate copy of a large
+    decoding graph for each recognizer, read the graph once and construct the
+    decoders of all recognizers with the same graph object. If the graph is
+    stored as an aligned constant FST, it can be memory mapped with
+    ``read_fst_kaldi(graph_rxfilename, memory_map=True)``. A memory mapped
+    graph is backed by the OS page cache, so it is also shared by forked worker
+    processes and by independent processes mapping the same file.
+
     Args:
         decoder (object): The decoder.
         symbols (SymbolTable): The symbol table. If provided, "text" output of
@@ -105,7 +313,7 @@ class Recognizer(object):
         else:
             return lattice
 
-    def decode(self, input):
+    def decode(self, input, outputs=None):
         """Decodes input.
 
         Output is a dictionary with the following `(key, value)` pairs:
@@ -132,71 +340,26 @@ class Recognizer(object):
         separated symbols. The "weight" output is a lattice weight consisting of
         (graph-score, acoustic-score).
 
+        If **outputs** is provided, only the requested outputs are computed
+        and included in the output dictionary, e.g. with ``outputs={"text"}``
+        lattice generation, determinization and scaling as well as the
+        conversion of the best path to a compact lattice are skipped.
+
         Args:
             input (object): Input to decode.
+            outputs (Iterable[str]): Names of the outputs to compute. If
+                ``None``, computes all outputs.
 
         Returns:
             A dictionary representing decoding output.
 
         Raises:
+            ValueError: If an unknown output is requested.
             RuntimeError: If decoding fails.
         """
         self.decoder.decode(self._make_decodable(input))
 
-        if not (self.allow_partial or self.decoder.reached_final()):
-            raise RuntimeError("No final state was active on the last frame.")
-
-        try:
-            best_path = self.decoder.get_best_path()
-        except RuntimeError:
-            raise RuntimeError("Empty decoding output.")
-
-        ali, words, weight = _fst_utils.get_linear_symbol_sequence(best_path)
-
-        if self.symbols:
-            text = " ".join(_fst.indices_to_symbols(self.symbols, words))
-        else:
-            text = " ".join(map(str, words))
-
-        likelihood = - (weight.value1 + weight.value2)
-
-        if self.acoustic_scale != 0.0:
-            scale = _fst_utils.acoustic_lattice_scale(1.0 / self.acoustic_scale)
-            _fst_utils.scale_lattice(scale, best_path)
-        best_path = _fst_utils.convert_lattice_to_compact_lattice(best_path)
-
-        try:
-            lat = self.decoder.get_raw_lattice()
-        except AttributeError:
-            return {
-                "alignment": ali,
-                "best_path": best_path,
-                "likelihood": likelihood,
-                "text": text,
-                "weight": weight,
-                "words": words,
-            }
-        if lat.num_states() == 0:
-            raise RuntimeError("Empty output lattice.")
-        lat.connect()
-
-        lat = self._determinize_lattice(lat)
-
-        if self.acoustic_scale != 0.0:
-            if isinstance(lat, _fst.CompactLatticeVectorFst):
-                _fst_utils.scale_compact_lattice(scale, lat)
-            else:
-                _fst_utils.scale_lattice(scale, lat)
-
-        return {
-            "alignment": ali,
-            "best_path": best_path,
-            "lattice": lat,
-            "likelihood": likelihood,
-            "text": text,
-            "weight": weight,
-            "words": words,
-        }
+        return _get_decoding_output(self, outputs)
 
 
 class FasterRecognizer(Recognizer):
@@ -865,9 +1028,7 @@ class NnetRecognizer(Recognizer):
         self.transition_model = transition_model
         self.acoustic_model = acoustic_model
         nnet = self.acoustic_model.get_nnet()
-        _nnet3.set_batchnorm_test_mode(True, nnet)
-        _nnet3.set_dropout_test_mode(True, nnet)
-        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), nnet)
+        _prepare_nnet(nnet)
         if decodable_opts:
             if not isinstance(decodable_opts,
                               _nnet3.NnetSimpleComputationOptions):
@@ -891,6 +1052,10 @@ class NnetRecognizer(Recognizer):
             acoustic_model = _nnet3.AmNnetSimple().read(ki.stream(), ki.binary)
         return transition_model, acoustic_model
 
+    def decode(self, input, outputs=None):
+        with _nnet_lock.shared():
+            return super(NnetRecognizer, self).decode(input, outputs)
+
     def _make_decodable(self, features):
         """Constructs a new decodable object from input features.
 
@@ -1092,9 +1257,7 @@ class NnetLatticeFasterBatchRecognizer(object):
         self.transition_model = transition_model
         self.acoustic_model = acoustic_model
         nnet = self.acoustic_model.get_nnet()
-        _nnet3.set_batchnorm_test_mode(True, nnet)
-        _nnet3.set_dropout_test_mode(True, nnet)
-        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), nnet)
+        _prepare_nnet(nnet)
         self.graph = graph
         self.symbols = symbols
         if not decoder_opts:
@@ -1261,6 +1424,412 @@ class NnetLatticeFasterBatchRecognizer(object):
         self.decoder.utterance_failed()
 
 
+def _set_future_result(future, result):
+    """Sets the result of a future unless it is already done."""
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future, exception):
+    """Sets the exception of a future unless it is already done."""
+    if not future.done():
+        future.set_exception(exception)
+
+
+class AsyncBatchRecognizer(object):
+    """Asynchronous (asyncio) front-end for a batch speech recognizer.
+
+    This wraps a :class:`NnetLatticeFasterBatchRecognizer` and exposes an
+    awaitable :meth:`decode` method, so that many utterances can be decoded
+    concurrently from a single asyncio event loop without a thread per
+    utterance. A single background thread owns the batch recognizer. It feeds
+    the inputs to the recognizer, polls the outputs and resolves the
+    corresponding futures on the event loop.
+
+    Usage::
+
+        asr = AsyncBatchRecognizer(
+            NnetLatticeFasterBatchRecognizer.from_files(
+                "final.mdl", "HCLG.fst", "words.txt", num_threads=8))
+
+        async def handle(key, feats):
+            out = await asr.decode(key, feats)
+            return out["text"]
+
+    Once constructed, the batch recognizer should not be accessed directly.
+    Call :meth:`close` to shut down the background thread when done. This
+    class also implements the context manager protocol. If the background
+    thread fails, e.g. because the batch recognizer raises an error, the
+    futures for all pending and subsequent inputs are failed with the
+    exception raised.
+
+    Args:
+        recognizer (NnetLatticeFasterBatchRecognizer): The batch recognizer.
+        loop (asyncio.AbstractEventLoop): The event loop futures are attached
+            to. If ``None``, futures are attached to the event loop running
+            :meth:`decode`.
+        poll_interval (float): Number of seconds to wait for new input before
+            polling the recognizer for pending outputs.
+    """
+    def __init__(self, recognizer, loop=None, poll_interval=0.01):
+        if asyncio is None:
+            raise RuntimeError("AsyncBatchRecognizer requires asyncio.")
+        self.recognizer = recognizer
+        self.loop = loop
+        self.poll_interval = poll_interval
+        self._requests = queue.Queue()
+        self._pending = collections.OrderedDict()
+        self._next_id = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def decode(self, key, input):
+        """Decodes input asynchronously.
+
+        This should be called from the event loop thread, e.g. from a
+        coroutine running on the event loop. It returns an
+        awaitable future that resolves to a dictionary like the output of
+        :meth:`NnetLatticeFasterBatchRecognizer.get_output`. If decoding fails,
+        awaiting the future raises a `RuntimeError` (or the `ValueError` raised
+        for invalid input).
+
+        Args:
+            key (str): Utterance ID.
+            input (Matrix or Tuple[Matrix, Vector] or Tuple[Matrix, Matrix]):
+                Input to decode.
+
+        Returns:
+            asyncio.Future: A future for the decoding output.
+
+        Raises:
+            ValueError: If the recognizer is closed.
+            RuntimeError: If no event loop was specified and there is no
+                running event loop.
+        """
+        if self._closed:
+            raise ValueError("Decoding with a closed recognizer.")
+        loop = self.loop if self.loop else asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((key, input, loop, future))
+        return future
+
+    def close(self):
+        """Finishes decoding and shuts down the background thread.
+
+        This blocks until all inputs have been decoded and the corresponding
+        futures are resolved. Use `loop.run_in_executor` to call it from a
+        coroutine without blocking the event loop.
+        """
+        if not self._closed:
+            self._closed = True
+            self._requests.put(None)
+            self._thread.join()
+
+    def _resolve(self, output):
+        """Resolves the future for a decoding output.
+
+        Outputs are generated in input order, but outputs for failed
+        utterances are missing. Futures for the utterances skipped before the
+        current output are failed.
+        """
+        while self._pending:
+            id, (key, loop, future) = self._pending.popitem(last=False)
+            if id == output["key"]:
+                output["key"] = key
+                loop.call_soon_threadsafe(_set_future_result, future, output)
+                return
+            loop.call_soon_threadsafe(
+                _set_future_exception, future,
+                RuntimeError("Decoding failed for utterance {}.".format(key)))
+
+    def _fail_pending(self, exception=None):
+        """Fails the futures for all utterances without outputs.
+
+        If **exception** is ``None``, each future is failed with a new
+        `RuntimeError`.
+        """
+        while self._pending:
+            _, (key, loop, future) = self._pending.popitem(last=False)
+            if exception is None:
+                e = RuntimeError("Decoding failed for utterance {}."
+                                 .format(key))
+            else:
+                e = exception
+            loop.call_soon_threadsafe(_set_future_exception, future, e)
+
+    def _run(self):
+        """Background thread feeding inputs and collecting outputs."""
+        try:
+            self._serve()
+        except Exception as e:
+            # Fail the pending futures and keep failing new requests until the
+            # recognizer is closed.
+            self._fail_pending(e)
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                _, _, loop, future = request
+                loop.call_soon_threadsafe(_set_future_exception, future, e)
+
+    def _serve(self):
+        """Feeds inputs to the batch recognizer and collects outputs."""
+        while True:
+            # Block until new input arrives if there are no pending outputs.
+            timeout = self.poll_interval if self._pending else None
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                request = False
+            if request is None:
+                break
+            if request:
+                key, input, loop, future = request
+                id = str(self._next_id)
+                self._next_id += 1
+                try:
+                    self.recognizer.accept_input(id, input)
+                except Exception as e:
+                    loop.call_soon_threadsafe(_set_future_exception, future, e)
+                else:
+                    self._pending[id] = (key, loop, future)
+            for output in self.recognizer.get_outputs():
+                self._resolve(output)
+        self.recognizer.finished()
+        for output in self.recognizer.get_outputs():
+            self._resolve(output)
+        self._fail_pending()
+
+
+class NnetBatchLikelihoodComputer(object):
+    """Neural network based batch log-likelihood computer.
+
+    This computes acoustic log-likelihoods for many utterances using a
+    background computation thread that batches chunks of small utterances
+    together into larger minibatches. It is meant to be used as a standalone
+    inference stage, separate from the graph search. Its outputs can be
+    decoded with any mapped recognizer, e.g. :class:`MappedLatticeFasterRecognizer`,
+    or aligned with a :class:`~kaldi.alignment.MappedAligner`. Decoupling
+    inference from search allows sizing each stage independently, e.g. a
+    single batch computer feeding a pool of mapped recognizers.
+
+    Acoustic scale specified in **compute_opts** is applied to the output
+    log-likelihoods. When output log-likelihoods are decoded with a mapped
+    recognizer, leave it at the default value ``1.0`` and specify the acoustic
+    scale for decoding when constructing the recognizer.
+
+    The interface of this object should be accessed from only one thread,
+    presumably the main thread of the program.
+
+    The background computation thread used by :meth:`accept_input` and
+    :meth:`get_output` is started when the first input is accepted. It is shut
+    down by :meth:`finished`. Call :meth:`close` when done to make sure it is
+    shut down even if :meth:`finished` was not called. This class also
+    implements the context manager protocol.
+
+    Args:
+        acoustic_model (AmNnetSimple): The acoustic model.
+        compute_opts (NnetBatchComputerOptions): Configuration options
+            for neural network batch computer.
+        online_ivector_period (int): Onlne ivector period. Relevant only if
+            online ivectors are used.
+    """
+    def __init__(self, acoustic_model, compute_opts=None,
+                 online_ivector_period=10):
+        self.acoustic_model = acoustic_model
+        _prepare_nnet(self.acoustic_model.get_nnet())
+        if not compute_opts:
+            compute_opts = _nnet3.NnetBatchComputerOptions()
+        self.compute_opts = compute_opts
+        self.online_ivector_period = online_ivector_period
+        self._inference = None
+        self._finished = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _make_inference(self):
+        """Constructs a new batch inference object."""
+        return _nnet3.NnetBatchInference(self.compute_opts,
+                                         self.acoustic_model.get_nnet(),
+                                         self.acoustic_model.priors())
+
+    read_model = staticmethod(NnetRecognizer.read_model)
+
+    @classmethod
+    def from_files(cls, model_rxfilename, compute_opts=None,
+                   online_ivector_period=10):
+        """Constructs a new batch log-likelihood computer from given files.
+
+        Args:
+            model_rxfilename (str): Extended filename for reading the model.
+            compute_opts (NnetBatchComputerOptions): Configuration options
+                for neural network batch computer.
+            online_ivector_period (int): Onlne ivector period. Relevant only if
+                online ivectors are used.
+
+        Returns:
+            NnetBatchLikelihoodComputer: A new batch log-likelihood computer.
+        """
+        _, acoustic_model = cls.read_model(model_rxfilename)
+        return cls(acoustic_model, compute_opts, online_ivector_period)
+
+    def _accept_input(self, inference, key, input):
+        """Accepts input for the given batch inference object."""
+        ivector, online_ivectors = None, None
+        if isinstance(input, tuple):
+            features, ivector_features = input
+            if isinstance(ivector_features, _kaldi_matrix.MatrixBase):
+                online_ivectors = ivector_features
+            else:
+                ivector = ivector_features
+        else:
+            features = input
+        if features.num_rows == 0:
+            raise ValueError("Empty feature matrix.")
+        inference.accept_input(key, features, ivector, online_ivectors,
+                               self.online_ivector_period)
+
+    def accept_input(self, key, input):
+        """Accepts input for computing log-likelihoods.
+
+        This should be called for each utterance (interspersed with calls to
+        :meth:`get_output`). This call does not block.
+
+        Input can be just a feature matrix or a tuple of a feature matrix and
+        an ivector or a tuple of a feature matrix and an online ivector matrix.
+
+        Args:
+            key (str): Utterance ID. This ID will be used to identify the
+                utterance when returned by :meth:`get_output`.
+            input (Matrix or Tuple[Matrix, Vector] or Tuple[Matrix, Matrix]):
+                Input features.
+
+        Raises:
+            ValueError: If :meth:`finished` or :meth:`close` has been called.
+        """
+        if self._finished:
+            raise ValueError("Input accepted after finished() was called.")
+        if self._inference is None:
+            self._inference = self._make_inference()
+        self._accept_input(self._inference, key, input)
+
+    def get_output(self):
+        """Returns the next available output.
+
+        The outputs returned by this method are guaranteed to be in the same
+        order the inputs were provided, but they may be delayed. This call does
+        not block unless :meth:`finished` has been called.
+
+        Output is a dictionary with the following `(key, value)` pairs:
+
+        ============ =========================== ==============================
+        key          value                       value type
+        ============ =========================== ==============================
+        "key"        Utterence ID                `str`
+        "loglikes"   Output log-likelihoods      `Matrix`
+        ============ =========================== ==============================
+
+        Returns:
+            A dictionary representing the output.
+
+        Raises:
+            ValueError: If there is no output to return.
+        """
+        if self._inference is None:
+            raise ValueError("No output available.")
+        key, loglikes = self._inference.get_output()
+        return {"key": key, "loglikes": loglikes}
+
+    def get_outputs(self):
+        """Creates a generator for iterating over available outputs.
+
+        Each output generated will be a dictionary like the output of
+        :meth:`get_output`. The outputs are generated in the same order the
+        inputs were provided.
+
+        See Also: :meth:`get_output`
+        """
+        while True:
+            try:
+                yield self.get_output()
+            except ValueError:
+                return
+
+    def finished(self):
+        """Informs the computer that all input has been provided.
+
+        After this call, :meth:`get_output` blocks until the next output is
+        ready, so you can keep calling it, until it raises a `ValueError`, to
+        get the outputs for the remaining utterances. No more input can be
+        accepted after this call. Subsequent calls to :meth:`compute` are not
+        affected.
+        """
+        if not self._finished:
+            self._finished = True
+            if self._inference is not None:
+                self._inference.finished()
+
+    def close(self):
+        """Shuts down the background computation thread.
+
+        This calls :meth:`finished` if it has not been called yet and discards
+        the outputs that have not been retrieved with :meth:`get_output`.
+        """
+        self.finished()
+        self._inference = None
+
+    def compute(self, inputs):
+        """Creates a generator for computing log-likelihoods for given inputs.
+
+        Each output generated will be a tuple of the utterance ID and the
+        output log-likelihood matrix. The outputs are generated in the same
+        order the inputs were provided. Available outputs are generated while
+        the inputs are still being consumed, so the number of utterances held
+        in memory stays small when the inputs are read lazily, e.g. from a
+        `SequentialMatrixReader`.
+
+        This method uses a separate batch inference object, hence it does not
+        interfere with :meth:`accept_input` and :meth:`get_output`.
+
+        Args:
+            inputs (Iterable[Tuple[str, object]]): An iterable of
+                `(key, input)` pairs, where each input is in a format accepted
+                by :meth:`accept_input`.
+        """
+        inference = self._make_inference()
+        finished = False
+        try:
+            for key, input in inputs:
+                self._accept_input(inference, key, input)
+                while True:
+                    try:
+                        yield inference.get_output()
+                    except ValueError:
+                        break
+            inference.finished()
+            finished = True
+            while True:
+                try:
+                    yield inference.get_output()
+                except ValueError:
+                    return
+        finally:
+            if not finished:
+                inference.finished()
+
+
 class NnetLatticeFasterGrammarRecognizer(NnetRecognizer):
     """Neural network based lattice generating faster grammar speech recognizer.
 
@@ -1404,6 +1973,9 @@ class NnetLatticeBiglmFasterRecognizer(NnetRecognizer):
 class OnlineRecognizer(object):
     """Base class for online speech recognizers.
 
+    The thread safety contract of :class:`Recognizer` applies to online
+    recognizers as well.
+
     Args:
         decoder (object): The online decoder.
         symbols (SymbolTable): The symbol table. If provided, "text" output of
@@ -1498,7 +2070,7 @@ class OnlineRecognizer(object):
         """
         self.decoder.finalize_decoding()
 
-    def decode(self):
+    def decode(self, outputs=None):
         """Decodes all frames in the input pipeline and returns the output.
 
         Output is a dictionary with the following `(key, value)` pairs:
@@ -1525,19 +2097,24 @@ class OnlineRecognizer(object):
         separated symbols. The "weight" output is a lattice weight consisting of
         (graph-score, acoustic-score).
 
+        If **outputs** is provided, only the requested outputs are computed.
+        See :meth:`get_output` for details.
+
         Args:
-            input (object): Input to decode.
+            outputs (Iterable[str]): Names of the outputs to compute. If
+                ``None``, computes all outputs.
 
         Returns:
             A dictionary representing decoding output.
 
         Raises:
+            ValueError: If an unknown output is requested.
             RuntimeError: If decoding fails.
         """
         self.decoder.decode(self._decodable)
-        return self.get_output()
+        return self.get_output(outputs)
 
-    def get_output(self):
+    def get_output(self, outputs=None):
         """Returns decoding output.
 
         Output is a dictionary with the following `(key, value)` pairs:
@@ -1564,66 +2141,23 @@ class OnlineRecognizer(object):
         separated symbols. The "weight" output is a lattice weight consisting of
         (graph-score, acoustic-score).
 
+        If **outputs** is provided, only the requested outputs are computed
+        and included in the output dictionary, e.g. with ``outputs={"text"}``
+        lattice generation, determinization and scaling as well as the
+        conversion of the best path to a compact lattice are skipped.
+
+        Args:
+            outputs (Iterable[str]): Names of the outputs to compute. If
+                ``None``, computes all outputs.
+
         Returns:
             A dictionary representing decoding output.
 
         Raises:
+            ValueError: If an unknown output is requested.
             RuntimeError: If decoding fails.
         """
-        if not (self.allow_partial or self.decoder.reached_final()):
-            raise RuntimeError("No final state was active on the last frame.")
-
-        try:
-            best_path = self.decoder.get_best_path()
-        except RuntimeError:
-            raise RuntimeError("Empty decoding output.")
-
-        ali, words, weight = _fst_utils.get_linear_symbol_sequence(best_path)
-
-        if self.symbols:
-            text = " ".join(_fst.indices_to_symbols(self.symbols, words))
-        else:
-            text = " ".join(map(str, words))
-
-        likelihood = - (weight.value1 + weight.value2)
-
-        if self.acoustic_scale != 0.0:
-            scale = _fst_utils.acoustic_lattice_scale(1.0 / self.acoustic_scale)
-            _fst_utils.scale_lattice(scale, best_path)
-        best_path = _fst_utils.convert_lattice_to_compact_lattice(best_path)
-
-        try:
-            lat = self.decoder.get_raw_lattice()
-        except AttributeError:
-            return {
-                "alignment": ali,
-                "best_path": best_path,
-                "likelihood": likelihood,
-                "text": text,
-                "weight": weight,
-                "words": words,
-            }
-        if lat.num_states() == 0:
-            raise RuntimeError("Empty output lattice.")
-        lat.connect()
-
-        lat = self._determinize_lattice(lat)
-
-        if self.acoustic_scale != 0.0:
-            if isinstance(lat, _fst.CompactLatticeVectorFst):
-                _fst_utils.scale_compact_lattice(scale, lat)
-            else:
-                _fst_utils.scale_lattice(scale, lat)
-
-        return {
-            "alignment": ali,
-            "best_path": best_path,
-            "lattice": lat,
-            "likelihood": likelihood,
-            "text": text,
-            "weight": weight,
-            "words": words,
-        }
+        return _get_decoding_output(self, outputs)
 
     def get_partial_output(self, use_final_probs=False):
         """Returns partial decoding output.
@@ -1702,9 +2236,7 @@ class NnetOnlineRecognizer(OnlineRecognizer):
         self.transition_model = transition_model
         self.acoustic_model = acoustic_model
         nnet = self.acoustic_model.get_nnet()
-        _nnet3.set_batchnorm_test_mode(True, nnet)
-        _nnet3.set_dropout_test_mode(True, nnet)
-        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), nnet)
+        _prepare_nnet(nnet)
 
         if decodable_opts:
             if not isinstance(decodable_opts,
@@ -1738,6 +2270,14 @@ class NnetOnlineRecognizer(OnlineRecognizer):
             acoustic_model = _nnet3.AmNnetSimple().read(ki.stream(), ki.binary)
         return transition_model, acoustic_model
 
+    def advance_decoding(self, max_num_frames=-1):
+        with _nnet_lock.shared():
+            super(NnetOnlineRecognizer, self).advance_decoding(max_num_frames)
+
+    def decode(self, outputs=None):
+        with _nnet_lock.shared():
+            return super(NnetOnlineRecognizer, self).decode(outputs)
+
     def _make_decodable(self, feature_pipeline):
         """Constructs a new online decodable object from input feature pipeline.
 
@@ -1912,6 +2452,299 @@ class NnetLatticeFasterOnlineGrammarRecognizer(NnetOnlineRecognizer):
             self.output_frame_shift, self.decoder)
 
 
+# Recognizer used by the current RecognizerPool worker process.
+_pool_recognizer = None
+
+
+def _pool_init(recognizer_factory):
+    """Constructs the recognizer of a RecognizerPool worker process."""
+    global _pool_recognizer
+    _pool_recognizer = recognizer_factory()
+
+
+def _pack_input(input):
+    """Converts recognizer input into a picklable form."""
+    if isinstance(input, tuple):
+        return tuple(_pack_input(x) for x in input)
+    if isinstance(input, (_kaldi_matrix.MatrixBase, _kaldi_vector.VectorBase)):
+        return input.numpy()
+    return input
+
+
+def _unpack_input(input):
+    """Converts picklable recognizer input back into Kaldi objects."""
+    if isinstance(input, tuple):
+        return tuple(_unpack_input(x) for x in input)
+    if getattr(input, "ndim", None) == 2:
+        return _matrix.Matrix(input)
+    if getattr(input, "ndim", None) == 1:
+        return _matrix.Vector(input)
+    return input
+
+
+def _pack_output(output):
+    """Converts recognizer output into a picklable form."""
+    packed = {}
+    for name, value in output.items():
+        if isinstance(value, _fst.CompactLatticeVectorFst):
+            packed[name] = ("clat", value.to_bytes())
+        elif isinstance(value, _fst.LatticeVectorFst):
+            packed[name] = ("lat", value.to_bytes())
+        elif isinstance(value, _fst._lattice_weight.LatticeWeight):
+            packed[name] = ("weight", (value.value1, value.value2))
+        else:
+            packed[name] = (None, value)
+    return packed
+
+
+def _unpack_output(packed):
+    """Converts picklable recognizer output back into Kaldi objects."""
+    output = {}
+    for name, (kind, value) in packed.items():
+        if kind == "clat":
+            value = _fst.CompactLatticeVectorFst.from_bytes(value)
+        elif kind == "lat":
+            value = _fst.LatticeVectorFst.from_bytes(value)
+        elif kind == "weight":
+            value = _fst.LatticeWeight(value)
+        output[name] = value
+    return output
+
+
+def _pool_decode(key, input):
+    """Decodes a single utterance in a RecognizerPool worker process.
+
+    Errors are returned instead of raised so that a failing utterance does not
+    take down the rest of the batch.
+    """
+    try:
+        output = _pool_recognizer.decode(_unpack_input(input))
+        return _pack_output(output), None
+    except Exception as e:
+        return None, "{}: {}".format(type(e).__name__, e)
+
+
+class RecognizerPool(object):
+    """Process pool for decoding utterances in parallel.
+
+    This fans utterances out to a pool of worker processes, each holding its
+    own recognizer, and collects the decoding outputs in input order. Since
+    each worker process decodes with its own interpreter, throughput scales
+    with the number of CPU cores available.
+
+    Each worker process constructs its recognizer by calling
+    **recognizer_factory** with no arguments. The factory is pickled and sent
+    to the workers, so it should be a module level function (or a
+    `functools.partial` of one), e.g. a function calling
+    :meth:`NnetLatticeFasterRecognizer.from_files`. Any recognizer providing
+    a :meth:`Recognizer.decode` method can be used.
+
+    Inputs are transferred to the workers as NumPy arrays, decoding outputs
+    are transferred back with FSTs serialized to bytes. At most
+    **max_in_flight** utterances are submitted to the workers at any time.
+    The input iterator is not advanced further until the oldest submitted
+    utterance is done, which keeps memory usage bounded when decoding large
+    tables.
+
+    Decoding errors are isolated to the failing utterance. They are logged as
+    warnings and the failing utterance is skipped. The number of successfully
+    decoded and failed utterances are available in :attr:`num_success` and
+    :attr:`num_failed` attributes.
+
+    This class implements the context manager protocol. Worker processes are
+    terminated when the pool is closed.
+
+    Args:
+        recognizer_factory (callable): A callable taking no arguments and
+            returning a new recognizer.
+        num_workers (int): Number of worker processes. Defaults to the number
+            of CPUs.
+        max_in_flight (int): Maximum number of utterances submitted to the
+            workers at any time. Defaults to twice the number of workers.
+        timeout (float): Number of seconds to wait for the output of an
+            utterance before treating it as failed. The worker processes are
+            restarted after a timeout. If ``None``, waits indefinitely.
+        start_method (str): Multiprocessing start method, e.g. "fork",
+            "forkserver" or "spawn". If ``None``, uses the platform default.
+    """
+    def __init__(self, recognizer_factory, num_workers=None,
+                 max_in_flight=None, timeout=None, start_method=None):
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        if num_workers < 1:
+            raise ValueError("num_workers should be positive.")
+        if max_in_flight is None:
+            max_in_flight = 2 * num_workers
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight should be positive.")
+        self.num_workers = num_workers
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.num_success = 0
+        self.num_failed = 0
+        if start_method is None:
+            self._context = multiprocessing
+        else:
+            self._context = multiprocessing.get_context(start_method)
+        self._recognizer_factory = recognizer_factory
+        self._pool = self._new_pool()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        """Terminates the worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _new_pool(self):
+        """Starts a new set of worker processes."""
+        return self._context.Pool(self.num_workers, _pool_init,
+                                  (self._recognizer_factory,))
+
+    def _submit(self, key, packed):
+        """Submits a packed utterance to the workers."""
+        return self._pool.apply_async(_pool_decode, (key, packed))
+
+    def _restart(self, pending):
+        """Restarts the worker processes and resubmits pending utterances."""
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = self._new_pool()
+        for item in pending:
+            item[2] = self._submit(item[0], item[1])
+
+    def _pop_output(self, pending):
+        """Waits for the output of the oldest pending utterance."""
+        key, _, result = pending.popleft()
+        try:
+            packed, error = result.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            # The worker is still busy with this utterance. Restart the
+            # workers so that the remaining utterances do not queue up behind
+            # it indefinitely.
+            self._restart(pending)
+            packed, error = None, "Timed out after {} seconds.".format(
+                self.timeout)
+        if error is not None:
+            self.num_failed += 1
+            logging.warning("Decoding failed for utterance %s. %s", key, error)
+            return key, None
+        self.num_success += 1
+        return key, _unpack_output(packed)
+
+    def decode(self, inputs):
+        """Creates a generator for decoding inputs in parallel.
+
+        Each output generated will be a tuple of the utterance ID and a
+        dictionary like the output of :meth:`Recognizer.decode`. The outputs
+        are generated in the same order the inputs were provided. Failed
+        utterances are skipped.
+
+        If an utterance times out, the worker processes are restarted, which
+        reconstructs their recognizers, and the other pending utterances are
+        submitted again.
+
+        Args:
+            inputs (Iterable[Tuple[str, object]]): An iterable of
+                `(key, input)` pairs, e.g. a `SequentialMatrixReader`.
+        """
+        if self._pool is None:
+            raise ValueError("Decoding with a closed pool.")
+        pending = collections.deque()
+        for key, input in inputs:
+            if len(pending) >= self.max_in_flight:
+                out_key, output = self._pop_output(pending)
+                if output is not None:
+                    yield out_key, output
+            packed = _pack_input(input)
+            pending.append([key, packed, self._submit(key, packed)])
+        while pending:
+            out_key, output = self._pop_output(pending)
+            if output is not None:
+                yield out_key, output
+
+    def decode_table(self, feats_rspecifier, lattice_wspecifier=None,
+                     words_wspecifier=None, alignment_wspecifier=None,
+                     text_wxfilename=None, ivectors_rspecifier=None):
+        """Decodes a feature table in parallel and writes the outputs.
+
+        Outputs are written in the same order as the input table. Lattices
+        are written as compact lattices. Raw state-level lattices, i.e.
+        lattices that are not determinized, are converted to compact lattices
+        before writing. Transcripts are written in the usual Kaldi text
+        format, one utterance per line. If the recognizers do not produce a
+        "text" output, transcripts consist of integer word indices.
+
+        Args:
+            feats_rspecifier (str): Rspecifier for reading the features.
+            lattice_wspecifier (str): Wspecifier for writing the lattices.
+            words_wspecifier (str): Wspecifier for writing the words on the best
+                paths.
+            alignment_wspecifier (str): Wspecifier for writing the frame-level
+                alignments.
+            text_wxfilename (str): Extended filename for writing the
+                transcripts.
+            ivectors_rspecifier (str): Rspecifier for reading the online
+                ivectors, which are read by utterance ID.
+
+        Returns:
+            Tuple[int, int]: The number of successfully decoded and failed
+            utterances.
+        """
+        num_success, num_failed = self.num_success, self.num_failed
+        feats = _util_table.SequentialMatrixReader(feats_rspecifier)
+        ivectors = (_util_table.RandomAccessMatrixReader(ivectors_rspecifier)
+                    if ivectors_rspecifier else None)
+        lat_writer = (_util_table.CompactLatticeWriter(lattice_wspecifier)
+                      if lattice_wspecifier else None)
+        words_writer = (_util_table.IntVectorWriter(words_wspecifier)
+                        if words_wspecifier else None)
+        ali_writer = (_util_table.IntVectorWriter(alignment_wspecifier)
+                      if alignment_wspecifier else None)
+        text_writer = (_util_io.xopen(text_wxfilename, "wt")
+                       if text_wxfilename else None)
+
+        def inputs():
+            for key, value in feats:
+                if ivectors is None:
+                    yield key, value
+                elif key in ivectors:
+                    yield key, (value, ivectors[key])
+                else:
+                    self.num_failed += 1
+                    logging.warning("No ivectors for utterance %s.", key)
+
+        try:
+            for key, out in self.decode(inputs()):
+                if lat_writer:
+                    lat = out["lattice"]
+                    if not isinstance(lat, _fst.CompactLatticeVectorFst):
+                        lat = _fst_utils.convert_lattice_to_compact_lattice(
+                            lat)
+                    lat_writer[key] = lat
+                if words_writer:
+                    words_writer[key] = out["words"]
+                if ali_writer:
+                    ali_writer[key] = out["alignment"]
+                if text_writer:
+                    text = out.get("text")
+                    if text is None:
+                        text = " ".join(map(str, out["words"]))
+                    text_writer.write("{} {}\n".format(key, text))
+        finally:
+            for f in (feats, ivectors, lat_writer, words_writer, ali_writer,
+                      text_writer):
+                if f is not None:
+                    f.close()
+        return (self.num_success - num_success, self.num_failed - num_failed)
+
+
 class LatticeLmRescorer(object):
     """Lattice LM rescorer.
 
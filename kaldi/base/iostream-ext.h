@@ -34,6 +34,13 @@ string Read(istream &is) {
   return buffer.str();   // return the string that the stringstream uses.
 }
 
+string ReadChunk(istream &is, size_t size) {
+  string s(size, '\0');    // Reads at most size bytes. Returns fewer bytes
+  is.read(&s[0], size);    // only if EOF is reached (or an error occurs).
+  s.resize(is.gcount());
+  return s;
+}
+
 string ReadLine(istream &is) {
   string s;
   getline(is, s);
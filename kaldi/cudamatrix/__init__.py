@@ -13,6 +13,84 @@ from ._cu_array import *
 from ._cu_vector import *
 from ._cu_matrix import *
 from ._cu_sparse_matrix import *
+from . import _cu_matrix_ext
+
+from .. import matrix as _matrix
+
+
+# (type, host view, host view wrapper, data address, typestr)
+_ARRAY_VIEW_TYPES = [
+    (CuMatrixBase, _cu_matrix_ext._cu_matrix_host_view, _matrix.SubMatrix,
+     _cu_matrix_ext._cu_matrix_data_address, "<f4"),
+    (CuDoubleMatrixBase, _cu_matrix_ext._cu_double_matrix_host_view,
+     _matrix.DoubleSubMatrix, _cu_matrix_ext._cu_double_matrix_data_address,
+     "<f8"),
+    (CuVectorBase, _cu_matrix_ext._cu_vector_host_view, _matrix.SubVector,
+     _cu_matrix_ext._cu_vector_data_address, "<f4"),
+    (CuDoubleVectorBase, _cu_matrix_ext._cu_double_vector_host_view,
+     _matrix.DoubleSubVector, _cu_matrix_ext._cu_double_vector_data_address,
+     "<f8"),
+]
+
+
+class _CudaArrayView(object):
+    """View of CuMatrix/CuVector data residing in GPU memory.
+
+    Exposes the data via the CUDA array interface understood by CuPy, Numba,
+    PyTorch and others. Keeps the viewed vector/matrix alive.
+    """
+
+    def __init__(self, obj, shape, strides, typestr, address):
+        self.base = obj
+        self.shape = shape
+        self.__cuda_array_interface__ = {
+            "shape": shape,
+            "strides": strides,
+            "typestr": typestr,
+            "data": (address, False),
+            "version": 2,
+        }
+
+
+def array_view(obj):
+    """Returns a view of a CUDA vector/matrix for other array libraries.
+
+    No data is copied. If the data resides in host memory, i.e. if CUDA is not
+    available or the GPU is not in use, the view is a
+    :class:`kaldi.matrix.SubVector` or :class:`kaldi.matrix.SubMatrix` (or
+    their double precision counterparts) supporting NumPy, DLPack and the
+    buffer protocol. Otherwise, the view exposes the GPU memory via
+    ``__cuda_array_interface__``, e.g. ``torch.as_tensor(array_view(obj))``.
+
+    The view keeps `obj` alive. It is invalidated if `obj` is resized.
+
+    Args:
+        obj (CuVectorBase or CuMatrixBase or CuDoubleVectorBase or
+            CuDoubleMatrixBase): The vector/matrix to view.
+
+    Returns:
+        A view sharing data with `obj`.
+
+    Raises:
+        TypeError: If `obj` is not a CUDA vector/matrix.
+    """
+    for cls, host_view, view_type, address, typestr in _ARRAY_VIEW_TYPES:
+        if isinstance(obj, cls):
+            break
+    else:
+        raise TypeError("obj should be a CUDA vector or matrix.")
+    if _cu_matrix_ext._cu_data_device() < 0:
+        view = view_type(host_view(obj))
+        view._cu_obj = obj  # keep obj alive
+        return view
+    itemsize = int(typestr[2:])
+    if isinstance(obj, (CuMatrixBase, CuDoubleMatrixBase)):
+        shape = (obj.num_rows(), obj.num_cols())
+        strides = (obj.stride() * itemsize, itemsize)
+    else:
+        shape, strides = (obj.dim(),), None
+    return _CudaArrayView(obj, shape, strides, typestr, address(obj))
+
 
 __all__ = [name for name in dir()
            if name[0] != '_'
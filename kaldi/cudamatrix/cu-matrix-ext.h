@@ -0,0 +1,57 @@
+#ifndef PYKALDI_CUDAMATRIX_CU_MATRIX_EXT_H_
+#define PYKALDI_CUDAMATRIX_CU_MATRIX_EXT_H_ 1
+
+#include <cstdint>
+
+#include "cudamatrix/cu-common.h"
+#include "cudamatrix/cu-device.h"
+#include "cudamatrix/cu-matrix.h"
+#include "cudamatrix/cu-vector.h"
+
+/// Helpers for exporting CuMatrix/CuVector data to other array libraries
+/// without copies.
+
+namespace kaldi {
+
+/// Returns the ordinal of the GPU holding CuMatrix/CuVector data or -1 if
+/// the data resides in host memory, i.e. if the GPU is not in use.
+inline int CuDataDevice() {
+#if HAVE_CUDA == 1
+  if (CuDevice::Instantiate().Enabled()) {
+    int device;
+    CU_SAFE_CALL(cudaGetDevice(&device));
+    return device;
+  }
+#endif
+  return -1;
+}
+
+template<typename Real>
+uintptr_t CuMatrixDataAddress(const CuMatrixBase<Real> &M) {
+  return reinterpret_cast<uintptr_t>(M.Data());
+}
+
+template<typename Real>
+uintptr_t CuVectorDataAddress(const CuVectorBase<Real> &v) {
+  return reinterpret_cast<uintptr_t>(v.Data());
+}
+
+/// Host memory views. These fail if the data resides in GPU memory.
+
+template<typename Real>
+SubMatrix<Real> CuMatrixHostView(CuMatrixBase<Real> *M) {
+  if (CuDataDevice() >= 0)
+    KALDI_ERR << "Cannot create a host view of a matrix in GPU memory.";
+  return SubMatrix<Real>(M->Mat(), 0, M->NumRows(), 0, M->NumCols());
+}
+
+template<typename Real>
+SubVector<Real> CuVectorHostView(CuVectorBase<Real> *v) {
+  if (CuDataDevice() >= 0)
+    KALDI_ERR << "Cannot create a host view of a vector in GPU memory.";
+  return SubVector<Real>(v->Vec(), 0, v->Dim());
+}
+
+}  // namespace kaldi
+
+#endif  // PYKALDI_CUDAMATRIX_CU_MATRIX_EXT_H_
@@ -1240,13 +1240,24 @@ KwsIndexConstFst._mutable_fst_type = KwsIndexVectorFst
 
 # Kaldi I/O
 
-def read_fst_kaldi(rxfilename):
+def read_fst_kaldi(rxfilename, memory_map=False):
     """Reads FST using Kaldi I/O mechanisms.
 
     Does not support reading in text mode.
 
+    If **memory_map** is ``True``, the states and arcs of constant FSTs are
+    memory mapped instead of being read into memory. Memory mapped FSTs are
+    backed by the OS page cache, hence they are shared by all objects and
+    processes (including forked worker processes) reading the same file. This
+    is useful for sharing a large read-only decoding graph across many decoders
+    and worker processes. Memory mapping is advisory. It is only possible if
+    **rxfilename** is a regular file and the FST was written with aligned data
+    (see :func:`write_fst_kaldi`). Otherwise, the FST is read into memory.
+    Vector FSTs are always read into memory.
+
     Args:
         rxfilename (str): Extended filename for reading the FST.
+        memory_map (bool): Whether to memory map constant FSTs.
 
     Returns:
         An FST object.
@@ -1294,20 +1305,27 @@ def read_fst_kaldi(rxfilename):
         else:
             raise TypeError("Unsupported FST arc type: {}.".format(arc_type))
         ropts = FstReadOptions(rxfilename, hdr)
+        if memory_map:
+            ropts.mode = FstReadOptions.read_mode("map")
         fst = fst_class.read_from_stream(ki.stream(), ropts)
         if not fst:
             raise IOError("Error reading FST (after reading header).")
         return fst
 
 
-def write_fst_kaldi(fst, wxfilename):
+def write_fst_kaldi(fst, wxfilename, align=False):
     """Writes FST using Kaldi I/O mechanisms.
 
     FST is written in binary mode without Kaldi binary mode header.
 
+    If **align** is ``True``, FST data is written aligned, which is required
+    for memory mapping constant FSTs when reading them back (see
+    :func:`read_fst_kaldi`). Aligned writing may fail on pipes.
+
     Args:
         fst: The FST to write.
         wxfilename (str): Extended filename for writing the FST.
+        align (bool): Whether to write FST data aligned.
 
     Raises:
         IOError: If writing fails.
@@ -1317,6 +1335,7 @@ def write_fst_kaldi(fst, wxfilename):
         if not ko.stream().good():
             raise IOError("Could not open {} for writing.".format(wxfilename))
         wopts = FstWriteOptions(wxfilename)
+        wopts.align = align
         try:
             if not fst.write_to_stream(ko.stream(), wopts):
                 raise IOError("Error writing FST.")
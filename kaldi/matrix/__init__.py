@@ -37,7 +37,10 @@ instead be passed a :class:`SubVector`/:class:`SubMatrix` instance.
     unless they have other return values, to support method chaining.
 """
 
+import collections
 import sys
+import threading
+
 import numpy
 
 from . import _compressed_matrix
@@ -64,6 +67,8 @@ class _VectorBase(object):
     No constructor.
     """
 
+    _cached_view = None
+
     def copy_(self, src):
         """Copies the elements from another vector.
 
@@ -135,6 +140,12 @@ class _VectorBase(object):
         """
         return _matrix_ext.vector_to_numpy(self)
 
+    def _view(self):
+        # NumPy view cached for indexing. It does not hold a reference to this
+        # vector, hence it is never handed out.
+        self._cached_view = _matrix_ext.vector_view(self, self._cached_view)
+        return self._cached_view
+
     @property
     def data(self):
         """Vector data as a memoryview."""
@@ -577,6 +588,8 @@ class _VectorBase(object):
         For details see `NumPy Array Indexing`_.
 
         Slicing shares data with the source vector when possible (see Caveats).
+        Integer indexing and unit step slicing are handled natively without
+        creating any intermediate NumPy arrays.
 
         Returns:
             - a float if the result of numpy indexing is a scalar
@@ -603,6 +616,12 @@ class _VectorBase(object):
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
+        if type(index) is int:
+            return self._getitem(_element_index(index, self.dim))
+        if type(index) is slice:
+            unit_slice = _unit_slice(index, self.dim)
+            if unit_slice:
+                return _sub_vector(self, *unit_slice)
         ret = self.numpy().__getitem__(index)
         if isinstance(ret, numpy.float32):
             return float(ret)
@@ -622,12 +641,16 @@ class _VectorBase(object):
 
         This operation is offloaded to NumPy. Hence, it supports all NumPy array
         indexing schemes: field access, basic slicing and advanced indexing.
-        For details see `NumPy Array Indexing`_.
+        For details see `NumPy Array Indexing`_. Setting a single element to a
+        scalar value is handled natively.
 
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
-        self.numpy().__setitem__(index, value)
+        if type(index) is int and type(value) in (float, int):
+            self._setitem_(_element_index(index, self.dim), value)
+        else:
+            self._view().__setitem__(index, value)
 
     # Numpy array interface methods were adapted from PyTorch.
     # https://github.com/pytorch/pytorch/commit/c488a9e9bf9eddca6d55957304612b88f4638ca7
@@ -640,32 +663,27 @@ class _VectorBase(object):
             return self.numpy().astype(dtype, copy=False)
 
     # Wrap Numpy array in a vector or matrix when done, to support e.g.
-    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`
+    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`.
+    # Single and double precision arrays are wrapped without any copies.
     def __array_wrap__(self, array):
-        if array.ndim == 0:
-            if array.dtype.kind == 'b':
-                return bool(array)
-            elif array.dtype.kind in ('i', 'u'):
-                return int(array)
-            elif array.dtype.kind == 'f':
-                return float(array)
-            elif array.dtype.kind == 'c':
-                return complex(array)
-            else:
-                raise RuntimeError('bad scalar {!r}'.format(array))
-        elif array.ndim == 1:
-            if array.dtype != numpy.float32:
-                # Vector stores single precision floats.
-                array = array.astype('float32')
-            return SubVector(array)
-        elif array.ndim == 2:
-            if array.dtype != numpy.float32:
-                # Matrix stores single precision floats.
-                array = array.astype('float32')
-            return SubMatrix(array)
-        else:
-            raise RuntimeError('{} dimensional array cannot be converted to a '
-                               'vector or matrix type'.format(array.ndim))
+        return _wrap_array(array, False)
+
+    # Map NumPy ufuncs writing into their only input to Kaldi in-place
+    # operations, e.g. `numpy.exp(x, out=x) -> x.apply_exp_()`. Other ufuncs
+    # are offloaded to NumPy, their results are wrapped with __array_wrap__.
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _array_ufunc(ufunc, method, inputs, kwargs, False)
+
+    # Export data to other array libraries without copies. DLPack export
+    # requires NumPy >= 1.22, buffer protocol export requires Python >= 3.12.
+    def __dlpack__(self, **kwargs):
+        return self.numpy().__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return _DLPACK_CPU_DEVICE
+
+    def __buffer__(self, flags):
+        return memoryview(self.numpy())
 
 
 class Vector(_VectorBase, _kaldi_vector.Vector):
@@ -720,6 +738,32 @@ class Vector(_VectorBase, _kaldi_vector.Vector):
                              .format(index, self.dim))
         self._remove_element_(index)
 
+    @staticmethod
+    def from_pool(size, undefined=True):
+        """Returns a vector view backed by a pooled memory buffer.
+
+        Buffers are taken from a size-bucketed pool shared by the process and
+        are returned to the pool automatically when the returned view is
+        released, i.e. garbage collected. This avoids allocating and zeroing
+        new memory for each temporary vector in streaming workloads. Capacity
+        of the pool can be adjusted with :func:`set_pool_size`.
+
+        The returned object is a :class:`SubVector` instance, i.e. it does not
+        support operations that reallocate memory. Any other views into it
+        keep it alive, but raw pointers or buffers obtained elsewhere must not
+        be used after it is released.
+
+        Args:
+            size (int): Size of the vector view.
+            undefined (bool): Whether to leave the elements uninitialized.
+                If ``False``, the elements are set to zero.
+                Defaults to ``True``.
+
+        Returns:
+            SubVector: A vector view backed by a pooled buffer.
+        """
+        return _from_pool(_PooledSubVector, Vector, (size,), undefined)
+
 
 class SubVector(_VectorBase, _matrix_ext.SubVector):
     """Single precision vector view."""
@@ -768,6 +812,8 @@ class _MatrixBase(object):
     No constructor.
     """
 
+    _cached_view = None
+
     def copy_(self, src, trans=_matrix_common.MatrixTransposeType.NO_TRANS):
         """Copies the elements from another matrix.
 
@@ -858,6 +904,12 @@ class _MatrixBase(object):
         """
         return _matrix_ext.matrix_to_numpy(self)
 
+    def _view(self):
+        # NumPy view cached for indexing. It does not hold a reference to this
+        # matrix, hence it is never handed out.
+        self._cached_view = _matrix_ext.matrix_view(self, self._cached_view)
+        return self._cached_view
+
     @property
     def data(self):
         """Matrix data as a memoryview."""
@@ -1178,6 +1230,41 @@ class _MatrixBase(object):
         _kaldi_matrix_ext._add_rows(self, alpha, src, indices)
         return self
 
+    def batch_add_mat_mat_(self, A, B,
+                           transA=_matrix_common.MatrixTransposeType.NO_TRANS,
+                           transB=_matrix_common.MatrixTransposeType.NO_TRANS,
+                           alpha=1.0, beta=1.0):
+        """Adds the products of given batches of matrices.
+
+        Treats this matrix as a vertical stack of equally shaped blocks, one
+        per batch element, and performs the operation
+        :math:`M_k = \\alpha\\ A_k\\ B_k + \\beta\\ M_k` for each block
+        :math:`M_k` in a single call.
+
+        Args:
+            A (Matrix or List[Matrix]): The first input matrices. If a single
+                matrix is given, it is used for all blocks.
+            B (Matrix or List[Matrix]): The second input matrices. If a single
+                matrix is given, it is used for all blocks.
+            transA (MatrixTransposeType): Whether to use **A** or its transpose.
+                Defaults to ``MatrixTransposeType.NO_TRANS``.
+            transB (MatrixTransposeType): Whether to use **B** or its transpose.
+                Defaults to ``MatrixTransposeType.NO_TRANS``.
+            alpha (float): The scalar multiplier for the products.
+                Defaults to ``1.0``.
+            beta (float): The scalar multiplier for the destination blocks.
+                Defaults to ``1.0``.
+
+        Raises:
+            RuntimeError: In case of size mismatch.
+        """
+        if isinstance(A, _kaldi_matrix.MatrixBase):
+            A = [A]
+        if isinstance(B, _kaldi_matrix.MatrixBase):
+            B = [B]
+        _kaldi_matrix_ext._add_mat_mat_batch(self, alpha, A, transA, B, transB, beta)
+        return self
+
     def __getitem__(self, index):
         """Implements self[index].
 
@@ -1186,6 +1273,9 @@ class _MatrixBase(object):
         For details see `NumPy Array Indexing`_.
 
         Slicing shares data with the source matrix when possible (see Caveats).
+        Integer indexing and unit step slicing of rows, as well as element
+        indexing and unit step slicing of both rows and columns, are handled
+        natively without creating any intermediate NumPy arrays.
 
         Returns:
             - a float if the result of numpy indexing is a scalar
@@ -1212,6 +1302,25 @@ class _MatrixBase(object):
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
+        if type(index) is int:
+            row = _element_index(index, self.num_rows)
+            return _sub_vector(self, row, self.num_cols)
+        if type(index) is slice:
+            unit_slice = _unit_slice(index, self.num_rows)
+            if unit_slice:
+                return _sub_matrix(self, unit_slice[0], unit_slice[1],
+                                   0, self.num_cols)
+        elif type(index) is tuple and len(index) == 2:
+            row, col = index
+            if type(row) is int and type(col) is int:
+                return self._getitem(_element_index(row, self.num_rows),
+                                     _element_index(col, self.num_cols))
+            if type(row) is slice and type(col) is slice:
+                rows = _unit_slice(row, self.num_rows)
+                cols = _unit_slice(col, self.num_cols)
+                if rows and cols:
+                    return _sub_matrix(self, rows[0], rows[1],
+                                       cols[0], cols[1])
         ret = self.numpy().__getitem__(index)
         if isinstance(ret, numpy.float32):
             return float(ret)
@@ -1231,16 +1340,23 @@ class _MatrixBase(object):
 
         This operation is offloaded to NumPy. Hence, it supports all NumPy array
         indexing schemes: field access, basic slicing and advanced indexing.
-        For details see `NumPy Array Indexing`_.
+        For details see `NumPy Array Indexing`_. Setting a single element to a
+        scalar value is handled natively.
 
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
-        self.numpy().__setitem__(index, value)
+        if (type(index) is tuple and len(index) == 2
+                and type(index[0]) is int and type(index[1]) is int
+                and type(value) in (float, int)):
+            self._setitem_(_element_index(index[0], self.num_rows),
+                           _element_index(index[1], self.num_cols), value)
+        else:
+            self._view().__setitem__(index, value)
 
     def __contains__(self, value):
         """Implements value in self."""
-        return value in self.numpy()
+        return value in self._view()
 
     def __repr__(self):
         return str(self)
@@ -1271,32 +1387,27 @@ class _MatrixBase(object):
             return self.numpy().astype(dtype, copy=False)
 
     # Wrap Numpy array in a vector or matrix when done, to support e.g.
-    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`
+    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`.
+    # Single and double precision arrays are wrapped without any copies.
     def __array_wrap__(self, array):
-        if array.ndim == 0:
-            if array.dtype.kind == 'b':
-                return bool(array)
-            elif array.dtype.kind in ('i', 'u'):
-                return int(array)
-            elif array.dtype.kind == 'f':
-                return float(array)
-            elif array.dtype.kind == 'c':
-                return complex(array)
-            else:
-                raise RuntimeError('bad scalar {!r}'.format(array))
-        elif array.ndim == 1:
-            if array.dtype != numpy.float32:
-                # Vector stores single precision floats.
-                array = array.astype('float32')
-            return SubVector(array)
-        elif array.ndim == 2:
-            if array.dtype != numpy.float32:
-                # Matrix stores single precision floats.
-                array = array.astype('float32')
-            return SubMatrix(array)
-        else:
-            raise RuntimeError('{} dimensional array cannot be converted to a '
-                               'Kaldi vector or matrix type'.format(array.ndim))
+        return _wrap_array(array, False)
+
+    # Map NumPy ufuncs writing into their only input to Kaldi in-place
+    # operations, e.g. `numpy.exp(x, out=x) -> x.apply_exp_()`. Other ufuncs
+    # are offloaded to NumPy, their results are wrapped with __array_wrap__.
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _array_ufunc(ufunc, method, inputs, kwargs, False)
+
+    # Export data to other array libraries without copies. DLPack export
+    # requires NumPy >= 1.22, buffer protocol export requires Python >= 3.12.
+    def __dlpack__(self, **kwargs):
+        return self.numpy().__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return _DLPACK_CPU_DEVICE
+
+    def __buffer__(self, flags):
+        return memoryview(self.numpy())
 
 
 class Matrix(_MatrixBase, _kaldi_matrix.Matrix):
@@ -1360,6 +1471,33 @@ class Matrix(_MatrixBase, _kaldi_matrix.Matrix):
                              .format(index, self.num_rows))
         self._remove_row_(index)
 
+    @staticmethod
+    def from_pool(num_rows, num_cols, undefined=True):
+        """Returns a matrix view backed by a pooled memory buffer.
+
+        Buffers are taken from a size-bucketed pool shared by the process and
+        are returned to the pool automatically when the returned view is
+        released, i.e. garbage collected. This avoids allocating and zeroing
+        new memory for each temporary matrix in streaming workloads. Capacity
+        of the pool can be adjusted with :func:`set_pool_size`.
+
+        The returned object is a :class:`SubMatrix` instance, i.e. it does not
+        support operations that reallocate memory. Any other views into it
+        keep it alive, but raw pointers or buffers obtained elsewhere must not
+        be used after it is released.
+
+        Args:
+            num_rows (int): Number of rows of the matrix view.
+            num_cols (int): Number of columns of the matrix view.
+            undefined (bool): Whether to leave the elements uninitialized.
+                If ``False``, the elements are set to zero.
+                Defaults to ``True``.
+
+        Returns:
+            SubMatrix: A matrix view backed by a pooled buffer.
+        """
+        return _from_pool(_PooledSubMatrix, Matrix, (num_rows, num_cols), undefined)
+
 
 class SubMatrix(_MatrixBase, _matrix_ext.SubMatrix):
     """Single precision matrix view."""
@@ -1437,6 +1575,8 @@ class _DoubleVectorBase(object):
     No constructor.
     """
 
+    _cached_view = None
+
     def copy_(self, src):
         """Copies the elements from another vector.
 
@@ -1508,6 +1648,13 @@ class _DoubleVectorBase(object):
         """
         return _matrix_ext.double_vector_to_numpy(self)
 
+    def _view(self):
+        # NumPy view cached for indexing. It does not hold a reference to this
+        # vector, hence it is never handed out.
+        self._cached_view = _matrix_ext.double_vector_view(self,
+                                                           self._cached_view)
+        return self._cached_view
+
     @property
     def data(self):
         """Vector data as a memoryview."""
@@ -1950,6 +2097,8 @@ class _DoubleVectorBase(object):
         For details see `NumPy Array Indexing`_.
 
         Slicing shares data with the source vector when possible (see Caveats).
+        Integer indexing and unit step slicing are handled natively without
+        creating any intermediate NumPy arrays.
 
         Returns:
             - a float if the result of numpy indexing is a scalar
@@ -1976,6 +2125,12 @@ class _DoubleVectorBase(object):
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
+        if type(index) is int:
+            return self._getitem(_element_index(index, self.dim))
+        if type(index) is slice:
+            unit_slice = _unit_slice(index, self.dim)
+            if unit_slice:
+                return _double_sub_vector(self, *unit_slice)
         ret = self.numpy().__getitem__(index)
         if isinstance(ret, numpy.float64):
             return float(ret)
@@ -1995,12 +2150,16 @@ class _DoubleVectorBase(object):
 
         This operation is offloaded to NumPy. Hence, it supports all NumPy array
         indexing schemes: field access, basic slicing and advanced indexing.
-        For details see `NumPy Array Indexing`_.
+        For details see `NumPy Array Indexing`_. Setting a single element to a
+        scalar value is handled natively.
 
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
-        self.numpy().__setitem__(index, value)
+        if type(index) is int and type(value) in (float, int):
+            self._setitem_(_element_index(index, self.dim), value)
+        else:
+            self._view().__setitem__(index, value)
 
     # Numpy array interface methods were adapted from PyTorch.
     # https://github.com/pytorch/pytorch/commit/c488a9e9bf9eddca6d55957304612b88f4638ca7
@@ -2013,32 +2172,27 @@ class _DoubleVectorBase(object):
             return self.numpy().astype(dtype, copy=False)
 
     # Wrap Numpy array in a vector or matrix when done, to support e.g.
-    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`
+    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`.
+    # Single and double precision arrays are wrapped without any copies.
     def __array_wrap__(self, array):
-        if array.ndim == 0:
-            if array.dtype.kind == 'b':
-                return bool(array)
-            elif array.dtype.kind in ('i', 'u'):
-                return int(array)
-            elif array.dtype.kind == 'f':
-                return float(array)
-            elif array.dtype.kind == 'c':
-                return complex(array)
-            else:
-                raise RuntimeError('bad scalar {!r}'.format(array))
-        elif array.ndim == 1:
-            if array.dtype != numpy.float64:
-                # DoubleVector stores double precision floats.
-                array = array.astype('float64')
-            return DoubleSubVector(array)
-        elif array.ndim == 2:
-            if array.dtype != numpy.float64:
-                # DoubleMatrix stores double precision floats.
-                array = array.astype('float64')
-            return DoubleSubMatrix(array)
-        else:
-            raise RuntimeError('{} dimensional array cannot be converted to a '
-                               'Kaldi vector or matrix type'.format(array.ndim))
+        return _wrap_array(array, True)
+
+    # Map NumPy ufuncs writing into their only input to Kaldi in-place
+    # operations, e.g. `numpy.exp(x, out=x) -> x.apply_exp_()`. Other ufuncs
+    # are offloaded to NumPy, their results are wrapped with __array_wrap__.
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _array_ufunc(ufunc, method, inputs, kwargs, True)
+
+    # Export data to other array libraries without copies. DLPack export
+    # requires NumPy >= 1.22, buffer protocol export requires Python >= 3.12.
+    def __dlpack__(self, **kwargs):
+        return self.numpy().__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return _DLPACK_CPU_DEVICE
+
+    def __buffer__(self, flags):
+        return memoryview(self.numpy())
 
 
 class DoubleVector(_DoubleVectorBase, _kaldi_vector.DoubleVector):
@@ -2093,6 +2247,32 @@ class DoubleVector(_DoubleVectorBase, _kaldi_vector.DoubleVector):
                              .format(index, self.dim))
         self._remove_element_(index)
 
+    @staticmethod
+    def from_pool(size, undefined=True):
+        """Returns a vector view backed by a pooled memory buffer.
+
+        Buffers are taken from a size-bucketed pool shared by the process and
+        are returned to the pool automatically when the returned view is
+        released, i.e. garbage collected. This avoids allocating and zeroing
+        new memory for each temporary vector in streaming workloads. Capacity
+        of the pool can be adjusted with :func:`set_pool_size`.
+
+        The returned object is a :class:`DoubleSubVector` instance, i.e. it does not
+        support operations that reallocate memory. Any other views into it
+        keep it alive, but raw pointers or buffers obtained elsewhere must not
+        be used after it is released.
+
+        Args:
+            size (int): Size of the vector view.
+            undefined (bool): Whether to leave the elements uninitialized.
+                If ``False``, the elements are set to zero.
+                Defaults to ``True``.
+
+        Returns:
+            DoubleSubVector: A vector view backed by a pooled buffer.
+        """
+        return _from_pool(_PooledDoubleSubVector, DoubleVector, (size,), undefined)
+
 
 class DoubleSubVector(_DoubleVectorBase, _matrix_ext.DoubleSubVector):
     """Double precision vector view."""
@@ -2141,6 +2321,8 @@ class _DoubleMatrixBase(object):
     No constructor.
     """
 
+    _cached_view = None
+
     def copy_(self, src, trans=_matrix_common.MatrixTransposeType.NO_TRANS):
         """Copies the elements from another matrix.
 
@@ -2231,6 +2413,13 @@ class _DoubleMatrixBase(object):
         """
         return _matrix_ext.double_matrix_to_numpy(self)
 
+    def _view(self):
+        # NumPy view cached for indexing. It does not hold a reference to this
+        # matrix, hence it is never handed out.
+        self._cached_view = _matrix_ext.double_matrix_view(self,
+                                                           self._cached_view)
+        return self._cached_view
+
     @property
     def data(self):
         """Matrix data as a memoryview."""
@@ -2547,6 +2736,41 @@ class _DoubleMatrixBase(object):
         _kaldi_matrix_ext._add_rows_double(self, alpha, src, indices)
         return self
 
+    def batch_add_mat_mat_(self, A, B,
+                           transA=_matrix_common.MatrixTransposeType.NO_TRANS,
+                           transB=_matrix_common.MatrixTransposeType.NO_TRANS,
+                           alpha=1.0, beta=1.0):
+        """Adds the products of given batches of matrices.
+
+        Treats this matrix as a vertical stack of equally shaped blocks, one
+        per batch element, and performs the operation
+        :math:`M_k = \\alpha\\ A_k\\ B_k + \\beta\\ M_k` for each block
+        :math:`M_k` in a single call.
+
+        Args:
+            A (DoubleMatrix or List[DoubleMatrix]): The first input matrices. If a single
+                matrix is given, it is used for all blocks.
+            B (DoubleMatrix or List[DoubleMatrix]): The second input matrices. If a single
+                matrix is given, it is used for all blocks.
+            transA (MatrixTransposeType): Whether to use **A** or its transpose.
+                Defaults to ``MatrixTransposeType.NO_TRANS``.
+            transB (MatrixTransposeType): Whether to use **B** or its transpose.
+                Defaults to ``MatrixTransposeType.NO_TRANS``.
+            alpha (float): The scalar multiplier for the products.
+                Defaults to ``1.0``.
+            beta (float): The scalar multiplier for the destination blocks.
+                Defaults to ``1.0``.
+
+        Raises:
+            RuntimeError: In case of size mismatch.
+        """
+        if isinstance(A, _kaldi_matrix.DoubleMatrixBase):
+            A = [A]
+        if isinstance(B, _kaldi_matrix.DoubleMatrixBase):
+            B = [B]
+        _kaldi_matrix_ext._add_mat_mat_batch_double(self, alpha, A, transA, B, transB, beta)
+        return self
+
     def __getitem__(self, index):
         """Implements self[index].
 
@@ -2555,6 +2779,9 @@ class _DoubleMatrixBase(object):
         For details see `NumPy Array Indexing`_.
 
         Slicing shares data with the source matrix when possible (see Caveats).
+        Integer indexing and unit step slicing of rows, as well as element
+        indexing and unit step slicing of both rows and columns, are handled
+        natively without creating any intermediate NumPy arrays.
 
         Returns:
             - a float if the result of numpy indexing is a scalar
@@ -2581,6 +2808,25 @@ class _DoubleMatrixBase(object):
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
+        if type(index) is int:
+            row = _element_index(index, self.num_rows)
+            return _double_sub_vector(self, row, self.num_cols)
+        if type(index) is slice:
+            unit_slice = _unit_slice(index, self.num_rows)
+            if unit_slice:
+                return _double_sub_matrix(self, unit_slice[0], unit_slice[1],
+                                   0, self.num_cols)
+        elif type(index) is tuple and len(index) == 2:
+            row, col = index
+            if type(row) is int and type(col) is int:
+                return self._getitem(_element_index(row, self.num_rows),
+                                     _element_index(col, self.num_cols))
+            if type(row) is slice and type(col) is slice:
+                rows = _unit_slice(row, self.num_rows)
+                cols = _unit_slice(col, self.num_cols)
+                if rows and cols:
+                    return _double_sub_matrix(self, rows[0], rows[1],
+                                              cols[0], cols[1])
         ret = self.numpy().__getitem__(index)
         if isinstance(ret, numpy.float64):
             return float(ret)
@@ -2600,16 +2846,23 @@ class _DoubleMatrixBase(object):
 
         This operation is offloaded to NumPy. Hence, it supports all NumPy array
         indexing schemes: field access, basic slicing and advanced indexing.
-        For details see `NumPy Array Indexing`_.
+        For details see `NumPy Array Indexing`_. Setting a single element to a
+        scalar value is handled natively.
 
         .. _NumPy Array Indexing:
             https://docs.scipy.org/doc/numpy-1.13.0/reference/arrays.indexing.html
         """
-        self.numpy().__setitem__(index, value)
+        if (type(index) is tuple and len(index) == 2
+                and type(index[0]) is int and type(index[1]) is int
+                and type(value) in (float, int)):
+            self._setitem_(_element_index(index[0], self.num_rows),
+                           _element_index(index[1], self.num_cols), value)
+        else:
+            self._view().__setitem__(index, value)
 
     def __contains__(self, value):
         """Implements value in self."""
-        return value in self.numpy()
+        return value in self._view()
 
     def __repr__(self):
         return str(self)
@@ -2640,32 +2893,27 @@ class _DoubleMatrixBase(object):
             return self.numpy().astype(dtype, copy=False)
 
     # Wrap Numpy array in a vector or matrix when done, to support e.g.
-    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`
+    # `numpy.sin(vector) -> vector` or `numpy.greater(vector, 0) -> vector`.
+    # Single and double precision arrays are wrapped without any copies.
     def __array_wrap__(self, array):
-        if array.ndim == 0:
-            if array.dtype.kind == 'b':
-                return bool(array)
-            elif array.dtype.kind in ('i', 'u'):
-                return int(array)
-            elif array.dtype.kind == 'f':
-                return float(array)
-            elif array.dtype.kind == 'c':
-                return complex(array)
-            else:
-                raise RuntimeError('bad scalar {!r}'.format(array))
-        elif array.ndim == 1:
-            if array.dtype != numpy.float64:
-                # DoubleVector stores single precision floats.
-                array = array.astype('float64')
-            return DoubleSubVector(array)
-        elif array.ndim == 2:
-            if array.dtype != numpy.float64:
-                # DoubleMatrix stores single precision floats.
-                array = array.astype('float64')
-            return DoubleSubMatrix(array)
-        else:
-            raise RuntimeError('{} dimensional array cannot be converted to a '
-                               'Kaldi vector or matrix type'.format(array.ndim))
+        return _wrap_array(array, True)
+
+    # Map NumPy ufuncs writing into their only input to Kaldi in-place
+    # operations, e.g. `numpy.exp(x, out=x) -> x.apply_exp_()`. Other ufuncs
+    # are offloaded to NumPy, their results are wrapped with __array_wrap__.
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _array_ufunc(ufunc, method, inputs, kwargs, True)
+
+    # Export data to other array libraries without copies. DLPack export
+    # requires NumPy >= 1.22, buffer protocol export requires Python >= 3.12.
+    def __dlpack__(self, **kwargs):
+        return self.numpy().__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return _DLPACK_CPU_DEVICE
+
+    def __buffer__(self, flags):
+        return memoryview(self.numpy())
 
 
 class DoubleMatrix(_DoubleMatrixBase, _kaldi_matrix.DoubleMatrix):
@@ -2729,6 +2977,33 @@ class DoubleMatrix(_DoubleMatrixBase, _kaldi_matrix.DoubleMatrix):
                              .format(index, self.num_rows))
         self._remove_row_(index)
 
+    @staticmethod
+    def from_pool(num_rows, num_cols, undefined=True):
+        """Returns a matrix view backed by a pooled memory buffer.
+
+        Buffers are taken from a size-bucketed pool shared by the process and
+        are returned to the pool automatically when the returned view is
+        released, i.e. garbage collected. This avoids allocating and zeroing
+        new memory for each temporary matrix in streaming workloads. Capacity
+        of the pool can be adjusted with :func:`set_pool_size`.
+
+        The returned object is a :class:`DoubleSubMatrix` instance, i.e. it does not
+        support operations that reallocate memory. Any other views into it
+        keep it alive, but raw pointers or buffers obtained elsewhere must not
+        be used after it is released.
+
+        Args:
+            num_rows (int): Number of rows of the matrix view.
+            num_cols (int): Number of columns of the matrix view.
+            undefined (bool): Whether to leave the elements uninitialized.
+                If ``False``, the elements are set to zero.
+                Defaults to ``True``.
+
+        Returns:
+            DoubleSubMatrix: A matrix view backed by a pooled buffer.
+        """
+        return _from_pool(_PooledDoubleSubMatrix, DoubleMatrix, (num_rows, num_cols), undefined)
+
 
 class DoubleSubMatrix(_DoubleMatrixBase, _matrix_ext.DoubleSubMatrix):
     """Double precision matrix view."""
@@ -2795,6 +3070,210 @@ class DoubleSubMatrix(_DoubleMatrixBase, _matrix_ext.DoubleSubMatrix):
                                         col_start, num_cols)
 
 
+################################################################################
+# numpy ufunc support
+################################################################################
+
+
+def _wrap_array(array, double):
+    """Wraps the result of a NumPy operation in a vector or matrix.
+
+    Single and double precision arrays are wrapped in single and double
+    precision vector/matrix views without any copies. Other arrays are
+    converted to single precision if **double** is ``False`` and to double
+    precision otherwise. Scalars are converted to Python scalars.
+    """
+    if isinstance(array, numpy.generic):
+        array = numpy.asarray(array)
+    elif not isinstance(array, numpy.ndarray):
+        return array
+    if array.ndim == 0:
+        if array.dtype.kind == 'b':
+            return bool(array)
+        elif array.dtype.kind in ('i', 'u'):
+            return int(array)
+        elif array.dtype.kind == 'f':
+            return float(array)
+        elif array.dtype.kind == 'c':
+            return complex(array)
+        else:
+            raise RuntimeError('bad scalar {!r}'.format(array))
+    if array.ndim > 2:
+        raise RuntimeError('{} dimensional array cannot be converted to a '
+                           'Kaldi vector or matrix type'.format(array.ndim))
+    if array.dtype != numpy.float32 and array.dtype != numpy.float64:
+        array = array.astype('float64' if double else 'float32')
+    if array.dtype == numpy.float64:
+        if array.ndim == 1:
+            return DoubleSubVector(array)
+        return DoubleSubMatrix(array)
+    if array.ndim == 1:
+        return SubVector(array)
+    return SubMatrix(array)
+
+
+def _as_ndarray(obj):
+    """Returns a NumPy view of a vector/matrix, other objects as is."""
+    if isinstance(obj, _kaldi_matrix.MatrixBase):
+        return _matrix_ext.matrix_to_numpy(obj)
+    if isinstance(obj, _kaldi_vector.VectorBase):
+        return _matrix_ext.vector_to_numpy(obj)
+    if isinstance(obj, _kaldi_matrix.DoubleMatrixBase):
+        return _matrix_ext.double_matrix_to_numpy(obj)
+    if isinstance(obj, _kaldi_vector.DoubleVectorBase):
+        return _matrix_ext.double_vector_to_numpy(obj)
+    return obj
+
+
+# Kaldi in-place operations equivalent to NumPy ufuncs writing into their
+# (first) input. Binary operations are keyed on the type of the second input.
+# Only operations giving the same results as NumPy for all inputs are listed,
+# e.g. Kaldi raises an error when taking the log of a negative number,
+# scaling by the reciprocal is not exactly division and Kaldi floors, ceilings
+# and element-wise maximums/minimums do not propagate NaNs, hence numpy.log,
+# division by a scalar, numpy.maximum and numpy.minimum are left to NumPy.
+_UNARY_INPLACE_OPS = {
+    numpy.exp: lambda x: x.apply_exp_(),
+    numpy.absolute: lambda x: x.apply_pow_abs_(1.0),
+    numpy.square: lambda x: x.apply_pow_(2.0),
+    numpy.negative: lambda x: x.scale_(-1.0),
+    numpy.tanh: lambda x: x.tanh_(x),
+}
+
+_SCALAR_INPLACE_OPS = {
+    numpy.add: lambda x, c: x.add_(c),
+    numpy.subtract: lambda x, c: x.add_(-c),
+    numpy.multiply: lambda x, c: x.scale_(c),
+}
+
+_VECTOR_INPLACE_OPS = {
+    numpy.add: lambda x, y: x.add_vec_(1.0, y),
+    numpy.subtract: lambda x, y: x.add_vec_(-1.0, y),
+    numpy.multiply: lambda x, y: x.mul_elements_(y),
+    numpy.true_divide: lambda x, y: x.div_elements_(y),
+}
+
+_MATRIX_INPLACE_OPS = {
+    numpy.add: lambda x, y: x.add_mat_(1.0, y),
+    numpy.subtract: lambda x, y: x.add_mat_(-1.0, y),
+    numpy.multiply: lambda x, y: x.mul_elements_(y),
+    numpy.true_divide: lambda x, y: x.div_elements_(y),
+}
+
+_COMMUTATIVE_UFUNCS = (numpy.add, numpy.multiply)
+
+_VECTOR_MATRIX_BASES = (_VectorBase, _MatrixBase,
+                        _DoubleVectorBase, _DoubleMatrixBase)
+
+
+def _inplace_ufunc(ufunc, inputs, out):
+    """Applies a ufunc with Kaldi in-place operations if possible.
+
+    Returns **out** if the ufunc was applied, ``None`` otherwise.
+    """
+    if len(inputs) == 1:
+        op = _UNARY_INPLACE_OPS.get(ufunc)
+        if op is None or inputs[0] is not out:
+            return None
+        if not isinstance(out, _VECTOR_MATRIX_BASES):
+            return None
+        op(out)
+        return out
+    x, y = inputs
+    if y is out and ufunc in _COMMUTATIVE_UFUNCS:
+        x, y = y, x
+    if x is not out:
+        return None
+    if not isinstance(x, _VECTOR_MATRIX_BASES):
+        return None
+    if type(y) in (float, int):
+        op = _SCALAR_INPLACE_OPS.get(ufunc)
+    else:
+        # Both operands should be of the same vector/matrix family and shape.
+        base = next(b for b in _VECTOR_MATRIX_BASES if isinstance(x, b))
+        if not isinstance(y, base) or y.shape != x.shape:
+            return None
+        if base is _VectorBase or base is _DoubleVectorBase:
+            op = _VECTOR_INPLACE_OPS.get(ufunc)
+        else:
+            op = _MATRIX_INPLACE_OPS.get(ufunc)
+    if op is None:
+        return None
+    op(x, y)
+    return x
+
+
+def _array_ufunc(ufunc, method, inputs, kwargs, double):
+    """Implements __array_ufunc__ for vector/matrix types."""
+    out = kwargs.get("out")
+    if out is not None and len(out) == 1 and len(kwargs) == 1:
+        if method == "__call__" and ufunc.nout == 1:
+            ret = _inplace_ufunc(ufunc, inputs, out[0])
+            if ret is not None:
+                return ret
+    inputs = tuple(_as_ndarray(x) for x in inputs)
+    if out is not None:
+        kwargs["out"] = tuple(_as_ndarray(x) for x in out)
+    results = getattr(ufunc, method)(*inputs, **kwargs)
+    if method == "at":
+        return None
+    if ufunc.nout == 1 or method != "__call__":
+        results = (results,)
+    if out is None:
+        out = (None,) * len(results)
+    results = tuple(_wrap_array(r, double) if o is None else o
+                    for r, o in zip(results, out))
+    return results[0] if len(results) == 1 else results
+
+
+################################################################################
+# dlpack support
+################################################################################
+
+_DLPACK_CPU_DEVICE = (1, 0)  # (kDLCPU, 0)
+
+
+def from_dlpack(x):
+    """Creates a vector/matrix view of an object supporting DLPack.
+
+    The new vector/matrix view shares its data with `x`. A copy will only be
+    made if the exported data is read-only, if vector items are not
+    contiguous or if matrix rows are not contiguous, e.g. if `x` is a
+    transposed matrix. Row strided and column sliced matrices are not copied.
+    Requires NumPy >= 1.22.
+
+    Args:
+        x: An object implementing ``__dlpack__`` and ``__dlpack_device__``
+            methods, e.g. a PyTorch CPU tensor. Exported data should be a 1-D
+            or 2-D single or double precision array residing in host memory.
+
+    Returns:
+        A :class:`SubVector`, :class:`SubMatrix`, :class:`DoubleSubVector` or
+        :class:`DoubleSubMatrix` depending on the shape and type of `x`.
+
+    Raises:
+        TypeError: If exported data is not single or double precision.
+        ValueError: If exported data is not 1-D or 2-D.
+    """
+    array = numpy.from_dlpack(x)
+    if array.dtype != numpy.float32 and array.dtype != numpy.float64:
+        raise TypeError("Cannot create a vector/matrix view of {} data."
+                        .format(array.dtype))
+    if array.ndim != 1 and array.ndim != 2:
+        raise ValueError("Cannot create a vector/matrix view of {}-D data."
+                         .format(array.ndim))
+    double = array.dtype == numpy.float64
+    # Views are constructed directly since the constructors require
+    # C-contiguous arrays. Data is copied if needed to satisfy Kaldi
+    # requirements.
+    if array.ndim == 1:
+        view = _double_sub_vector if double else _sub_vector
+        return view(array, 0, array.shape[0])
+    view = _double_sub_matrix if double else _sub_matrix
+    num_rows, num_cols = array.shape
+    return view(array, 0, num_rows, 0, num_cols)
+
+
 ################################################################################
 # vector/matrix wrappers
 ################################################################################
@@ -2848,9 +3327,197 @@ def _matrix_wrapper(matrix):
         raise TypeError("unrecognized input type")
 
 
+def _element_index(index, size):
+    """Checks and normalizes an integer index into a dimension of given size."""
+    i = index + size if index < 0 else index
+    if not 0 <= i < size:
+        raise IndexError("index {} is out of bounds for axis with size {}"
+                         .format(index, size))
+    return i
+
+
+def _unit_slice(index, size):
+    """Returns (start, length) of a non-empty slice with unit step.
+
+    Returns ``None`` for any other slice.
+    """
+    if index.step is not None and index.step != 1:
+        return None
+    start, stop, _ = index.indices(size)
+    if stop <= start:
+        return None
+    return start, stop - start
+
+
+# The following functions construct vector/matrix views without the argument
+# checks done in the constructors. They are used in indexing fast paths.
+
+def _sub_vector(src, start, length):
+    ret = SubVector.__new__(SubVector)
+    _matrix_ext.SubVector.__init__(ret, src, start, length)
+    return ret
+
+
+def _sub_matrix(src, row_start, num_rows, col_start, num_cols):
+    ret = SubMatrix.__new__(SubMatrix)
+    _matrix_ext.SubMatrix.__init__(ret, src, row_start, num_rows,
+                                   col_start, num_cols)
+    return ret
+
+
+def _double_sub_vector(src, start, length):
+    ret = DoubleSubVector.__new__(DoubleSubVector)
+    _matrix_ext.DoubleSubVector.__init__(ret, src, start, length)
+    return ret
+
+
+def _double_sub_matrix(src, row_start, num_rows, col_start, num_cols):
+    ret = DoubleSubMatrix.__new__(DoubleSubMatrix)
+    _matrix_ext.DoubleSubMatrix.__init__(ret, src, row_start, num_rows,
+                                         col_start, num_cols)
+    return ret
+
+
+################################################################################
+# pooled vector/matrix allocation
+################################################################################
+
+
+class _BufferPool(object):
+    """Size-bucketed pool of vectors/matrices owning memory buffers.
+
+    Buffers are bucketed by type and shape. The leading dimension of each
+    buffer is rounded up to a power of two so that a buffer can back views of
+    any smaller size in the same bucket.
+
+    Buffers are released from `__del__`, which may run during garbage
+    collection in a thread that already holds the lock. Hence released
+    buffers are first appended to a queue without blocking and moved to the
+    buckets by the next thread holding the lock.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._buckets = {}
+        self._released = collections.deque()
+        self._lock = threading.Lock()
+
+    def _drain(self):
+        """Moves released buffers to the buckets. Requires the lock."""
+        while self._released:
+            key, buf = self._released.popleft()
+            nbytes = buf.size_in_bytes()
+            if self._bytes + nbytes <= self.max_bytes:
+                self._buckets.setdefault(key, []).append((buf, nbytes))
+                self._bytes += nbytes
+
+    def acquire(self, key):
+        with self._lock:
+            self._drain()
+            bucket = self._buckets.get(key)
+            if not bucket:
+                return None
+            buf, nbytes = bucket.pop()
+            self._bytes -= nbytes
+            return buf
+
+    def release(self, key, buf):
+        self._released.append((key, buf))
+        if self._lock.acquire(False):
+            try:
+                self._drain()
+            finally:
+                self._lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._released.clear()
+            self._buckets.clear()
+            self._bytes = 0
+
+
+_pool = _BufferPool(256 << 20)
+
+
+def set_pool_size(max_bytes):
+    """Sets the capacity of the vector/matrix buffer pool.
+
+    Released buffers are kept in the pool for reuse by ``from_pool`` methods as
+    long as the total size of the pooled buffers does not exceed **max_bytes**.
+    Buffers currently in the pool are discarded. Defaults to 256 MiB.
+
+    Args:
+        max_bytes (int): Maximum total size (in bytes) of pooled buffers.
+    """
+    if max_bytes < 0:
+        raise ValueError("max_bytes should be non-negative.")
+    _pool.clear()
+    _pool.max_bytes = max_bytes
+
+
+class _PooledView(object):
+    """Mixin returning the buffer backing a view to the pool on release."""
+
+    def __del__(self):
+        buf = self.__dict__.pop("_pool_buffer", None)
+        if buf is not None:
+            self._pool.release(self._pool_key, buf)
+
+
+class _PooledSubVector(_PooledView, SubVector):
+    _init_view = _matrix_ext.SubVector.__init__
+
+
+class _PooledSubMatrix(_PooledView, SubMatrix):
+    _init_view = _matrix_ext.SubMatrix.__init__
+
+
+class _PooledDoubleSubVector(_PooledView, DoubleSubVector):
+    _init_view = _matrix_ext.DoubleSubVector.__init__
+
+
+class _PooledDoubleSubMatrix(_PooledView, DoubleSubMatrix):
+    _init_view = _matrix_ext.DoubleSubMatrix.__init__
+
+
+def _from_pool(view_type, owner_type, shape, undefined):
+    """Returns a view of given shape backed by a pooled buffer."""
+    if any(not isinstance(dim, int) for dim in shape):
+        raise TypeError("dimensions should be integers.")
+    if min(shape) < 0:
+        raise ValueError("dimensions should be non-negative.")
+    if min(shape) == 0:
+        if max(shape) != 0:
+            raise IndexError("dimensions should all be positive or they should "
+                             "all be 0.")
+        # Empty views are not backed by pooled buffers.
+        buf, key = owner_type(), None
+    else:
+        capacity = 1 << (shape[0] - 1).bit_length()
+        key = (owner_type, capacity) + shape[1:]
+        buf = _pool.acquire(key)
+        if buf is None:
+            buf = owner_type()
+            buf.resize_(capacity, *(shape[1:] + (
+                _matrix_common.MatrixResizeType.UNDEFINED,)))
+    view = view_type.__new__(view_type)
+    if len(shape) == 1:
+        view_type._init_view(view, buf, 0, shape[0])
+    else:
+        view_type._init_view(view, buf, 0, shape[0], 0, shape[1])
+    if key is not None:
+        view._pool = _pool
+        view._pool_key = key
+        view._pool_buffer = buf
+    if not undefined:
+        view.set_zero_()
+    return view
+
+
 ################################################################################
 
-_exclude_list = ['sys', 'numpy']
+_exclude_list = ['sys', 'numpy', 'threading', 'collections']
 
 __all__ = [name for name in dir()
            if name[0] != '_'
@@ -1,6 +1,9 @@
 #ifndef PYKALDI_MATRIX_KALDI_MATRIX_EXT_H_
 #define PYKALDI_MATRIX_KALDI_MATRIX_EXT_H_ 1
 
+#include <algorithm>
+#include <vector>
+
 #include "matrix/kaldi-matrix.h"
 
 /// Shims for kaldi::Vector<Real> methods that we cannot wrap in
@@ -93,6 +96,35 @@ void AddRows(MatrixBase<Real> *self, Real alpha, const MatrixBase<Real> &src, co
   self->AddRows(alpha, src, indices.data());
 }
 
+// Treats self as a vertical stack of batch_size equally shaped blocks and adds
+// alpha * A[i] * B[i] to beta * (block i). A and B should either have
+// batch_size elements or a single element shared by all blocks.
+template<typename Real>
+void AddMatMatBatch(MatrixBase<Real> *self, const Real alpha,
+                    const std::vector<MatrixBase<Real> *> &A,
+                    MatrixTransposeType transA,
+                    const std::vector<MatrixBase<Real> *> &B,
+                    MatrixTransposeType transB, const Real beta) {
+  size_t batch_size = std::max(A.size(), B.size());
+  if (A.empty() || B.empty() ||
+      (A.size() != batch_size && A.size() != 1) ||
+      (B.size() != batch_size && B.size() != 1))
+    KALDI_ERR << "Batch size mismatch: " << A.size() << " vs " << B.size();
+  if (self->NumRows() % batch_size != 0)
+    KALDI_ERR << "Number of rows " << self->NumRows()
+              << " is not a multiple of batch size " << batch_size;
+  MatrixIndexT num_rows = self->NumRows() / batch_size;
+  for (size_t i = 0; i < batch_size; ++i) {
+    const MatrixBase<Real> &a = *A[A.size() == 1 ? 0 : i],
+                           &b = *B[B.size() == 1 ? 0 : i];
+    if (a.NumRows() != A[0]->NumRows() || a.NumCols() != A[0]->NumCols() ||
+        b.NumRows() != B[0]->NumRows() || b.NumCols() != B[0]->NumCols())
+      KALDI_ERR << "Matrices in a batch should have the same shape.";
+    SubMatrix<Real> block(*self, i * num_rows, num_rows, 0, self->NumCols());
+    block.AddMatMat(alpha, a, transA, b, transB, beta);
+  }
+}
+
 }
 
 #endif //PYKALDI_MATRIX_KALDI_MATRIX_EXT_H_
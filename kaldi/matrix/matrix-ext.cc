@@ -1,5 +1,6 @@
 
 #include <Python.h>
+#include <stdexcept>
 #include "clif/python/ptr_util.h"
 #include "clif/python/optional.h"
 #include "clif/python/types.h"
@@ -77,14 +78,27 @@ static PyObject* wrapSubVector_float_as___init__(PyObject* self,
       return nullptr;
     }
   } else {
-    ::kaldi::VectorBase<float>* arg1;
-    if (!Clif_PyObjAs(a[0], &arg1))
-      return ArgError("__init__", names[0], "PyArray_Type or ::kaldi::VectorBase<float>", a[0]);
+    ::kaldi::VectorBase<float>* arg1 = nullptr;
+    ::kaldi::MatrixBase<float>* matrix = nullptr;
+    if (!Clif_PyObjAs(a[0], &arg1)) {
+      // Matrix rows can be viewed as vectors too. In that case, start is the
+      // row index and length is the number of leading columns in the view.
+      PyErr_Clear();
+      if (!Clif_PyObjAs(a[0], &matrix))
+        return ArgError("__init__", names[0], "PyArray_Type, ::kaldi::VectorBase<float> or ::kaldi::MatrixBase<float>", a[0]);
+    }
     // Call actual C++ method.
     PyObject* err_type = nullptr;
     string err_msg{"C++ exception"};
     try {
-      reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<float>>(*arg1, std::move(arg2), std::move(arg3));
+      if (arg1) {
+        reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<float>>(*arg1, std::move(arg2), std::move(arg3));
+      } else {
+        if (arg2 < 0 || arg2 >= matrix->NumRows() ||
+            arg3 < 0 || arg3 > matrix->NumCols())
+          throw std::out_of_range("row view out of range");
+        reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<float>>(matrix->RowData(arg2), std::move(arg3));
+      }
     } catch(const std::exception& e) {
       err_type = PyExc_RuntimeError;
       err_msg += string(": ") + e.what();
@@ -116,7 +130,7 @@ static PyObject* as_kaldi_VectorBase_float(PyObject* self) {
 }
 
 static PyMethodDef Methods[] = {
-  {C("__init__"), (PyCFunction)wrapSubVector_float_as___init__, METH_VARARGS | METH_KEYWORDS, C("__init__(t:VectorBase, start:int, length:int)\n  Calls C++ function\n  void ::kaldi::SubVector<float>::SubVector(::kaldi::VectorBase<float>, ::kaldi::MatrixIndexT, ::kaldi::MatrixIndexT)")},
+  {C("__init__"), (PyCFunction)wrapSubVector_float_as___init__, METH_VARARGS | METH_KEYWORDS, C("__init__(t:VectorBase|MatrixBase, start:int, length:int)\n  Calls C++ function\n  void ::kaldi::SubVector<float>::SubVector(::kaldi::VectorBase<float>, ::kaldi::MatrixIndexT, ::kaldi::MatrixIndexT)")},
   {C("as_kaldi_VectorBase_float"), (PyCFunction)as_kaldi_VectorBase_float, METH_NOARGS, C("Upcast to ::kaldi::VectorBase<float>*")},
   {}
 };
@@ -508,14 +522,27 @@ static PyObject* wrapSubVector_double_as___init__(PyObject* self,
       return nullptr;
     }
   } else {
-    ::kaldi::VectorBase<double>* arg1;
-    if (!Clif_PyObjAs(a[0], &arg1))
-      return ArgError("__init__", names[0], "PyArray_Type or ::kaldi::VectorBase<double>", a[0]);
+    ::kaldi::VectorBase<double>* arg1 = nullptr;
+    ::kaldi::MatrixBase<double>* matrix = nullptr;
+    if (!Clif_PyObjAs(a[0], &arg1)) {
+      // Matrix rows can be viewed as vectors too. In that case, start is the
+      // row index and length is the number of leading columns in the view.
+      PyErr_Clear();
+      if (!Clif_PyObjAs(a[0], &matrix))
+        return ArgError("__init__", names[0], "PyArray_Type, ::kaldi::VectorBase<double> or ::kaldi::MatrixBase<double>", a[0]);
+    }
     // Call actual C++ method.
     PyObject* err_type = nullptr;
     string err_msg{"C++ exception"};
     try {
-      reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<double>>(*arg1, std::move(arg2), std::move(arg3));
+      if (arg1) {
+        reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<double>>(*arg1, std::move(arg2), std::move(arg3));
+      } else {
+        if (arg2 < 0 || arg2 >= matrix->NumRows() ||
+            arg3 < 0 || arg3 > matrix->NumCols())
+          throw std::out_of_range("row view out of range");
+        reinterpret_cast<wrapper*>(self)->cpp = ::clif::MakeShared<::kaldi::SubVector<double>>(matrix->RowData(arg2), std::move(arg3));
+      }
     } catch(const std::exception& e) {
       err_type = PyExc_RuntimeError;
       err_msg += string(": ") + e.what();
@@ -547,7 +574,7 @@ static PyObject* as_kaldi_VectorBase_double(PyObject* self) {
 }
 
 static PyMethodDef Methods[] = {
-  {C("__init__"), (PyCFunction)wrapSubVector_double_as___init__, METH_VARARGS | METH_KEYWORDS, C("__init__(t:VectorBase, start:int, length:int)\n  Calls C++ function\n  void ::kaldi::SubVector<double>::SubVector(::kaldi::VectorBase<double>, ::kaldi::MatrixIndexT, ::kaldi::MatrixIndexT)")},
+  {C("__init__"), (PyCFunction)wrapSubVector_double_as___init__, METH_VARARGS | METH_KEYWORDS, C("__init__(t:VectorBase|MatrixBase, start:int, length:int)\n  Calls C++ function\n  void ::kaldi::SubVector<double>::SubVector(::kaldi::VectorBase<double>, ::kaldi::MatrixIndexT, ::kaldi::MatrixIndexT)")},
   {C("as_kaldi_VectorBase_double"), (PyCFunction)as_kaldi_VectorBase_double, METH_NOARGS, C("Upcast to ::kaldi::VectorBase<double>*")},
   {}
 };
@@ -1042,6 +1069,122 @@ static PyObject* DoubleMatrixToNumpy(PyObject* self, PyObject* args, PyObject* k
   return array;
 }
 
+// Returns true if cached is an ndarray viewing the given memory region.
+static bool IsView(PyObject* cached, int type, void* data, int nd,
+                   const npy_intp* sizes, const npy_intp* strides) {
+  if (cached == nullptr || !PyArray_CheckExact(cached)) return false;
+  PyArrayObject* array = (PyArrayObject*)cached;
+  if (PyArray_DATA(array) != data || PyArray_NDIM(array) != nd ||
+      PyArray_TYPE(array) != type)
+    return false;
+  for (int i = 0; i < nd; ++i) {
+    if (PyArray_DIM(array, i) != sizes[i] ||
+        PyArray_STRIDE(array, i) != strides[i])
+      return false;
+  }
+  return true;
+}
+
+// Returns cached if it is still a valid view of the given memory region.
+// Otherwise, returns a new ndarray viewing the memory region. Unlike the
+// arrays returned by the *_to_numpy functions, the new array does not hold
+// a reference to the object owning the memory region. It is meant to be
+// cached by that object and should not outlive it.
+static PyObject* View(PyObject* cached, int type, void* data, int nd,
+                      npy_intp* sizes, npy_intp* strides) {
+  if (IsView(cached, type, data, nd, sizes, strides)) {
+    Py_INCREF(cached);
+    return cached;
+  }
+  PyObject* array = PyArray_New(
+      &PyArray_Type, nd, sizes, type, strides, data, 0,
+      NPY_ARRAY_ALIGNED | NPY_ARRAY_WRITEABLE | NPY_ARRAY_C_CONTIGUOUS,
+      nullptr);
+  if (!array) {
+    PyErr_SetString(PyExc_RuntimeError, "Cannot convert to ndarray.");
+    return nullptr;
+  }
+  return array;
+}
+
+// vector_view(vector:VectorBase, cached:ndarray=None) -> ndarray
+static PyObject* VectorView(PyObject* self, PyObject* args, PyObject* kw) {
+  PyObject* obj;
+  PyObject* cached = nullptr;
+  char* names[] = { C("vector"), C("cached"), nullptr };
+  if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:vector_view",
+                                   names, &obj, &cached)) {
+    return nullptr;
+  }
+  ::kaldi::VectorBase<float>* vector;
+  if (!Clif_PyObjAs(obj, &vector)) {
+    return ArgError("vector_view", names[0],
+                    "::kaldi::VectorBase<float>", obj);
+  }
+  npy_intp size = vector->Dim();
+  npy_intp stride = sizeof(float);
+  return View(cached, NPY_FLOAT, vector->Data(), 1, &size, &stride);
+}
+
+// matrix_view(matrix:MatrixBase, cached:ndarray=None) -> ndarray
+static PyObject* MatrixView(PyObject* self, PyObject* args, PyObject* kw) {
+  PyObject* obj;
+  PyObject* cached = nullptr;
+  char* names[] = { C("matrix"), C("cached"), nullptr };
+  if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:matrix_view",
+                                   names, &obj, &cached)) {
+    return nullptr;
+  }
+  ::kaldi::MatrixBase<float>* matrix;
+  if (!Clif_PyObjAs(obj, &matrix)) {
+    return ArgError("matrix_view", names[0],
+                    "::kaldi::MatrixBase<float>", obj);
+  }
+  npy_intp sizes[2] = { matrix->NumRows(), matrix->NumCols() };
+  npy_intp strides[2] = { matrix->Stride() * ((long)sizeof(float)),
+                          ((long)sizeof(float)) };
+  return View(cached, NPY_FLOAT, matrix->Data(), 2, sizes, strides);
+}
+
+// double_vector_view(vector:DoubleVectorBase, cached:ndarray=None) -> ndarray
+static PyObject* DoubleVectorView(PyObject* self, PyObject* args, PyObject* kw) {
+  PyObject* obj;
+  PyObject* cached = nullptr;
+  char* names[] = { C("vector"), C("cached"), nullptr };
+  if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:double_vector_view",
+                                   names, &obj, &cached)) {
+    return nullptr;
+  }
+  ::kaldi::VectorBase<double>* vector;
+  if (!Clif_PyObjAs(obj, &vector)) {
+    return ArgError("double_vector_view", names[0],
+                    "::kaldi::VectorBase<double>", obj);
+  }
+  npy_intp size = vector->Dim();
+  npy_intp stride = sizeof(double);
+  return View(cached, NPY_DOUBLE, vector->Data(), 1, &size, &stride);
+}
+
+// double_matrix_view(matrix:DoubleMatrixBase, cached:ndarray=None) -> ndarray
+static PyObject* DoubleMatrixView(PyObject* self, PyObject* args, PyObject* kw) {
+  PyObject* obj;
+  PyObject* cached = nullptr;
+  char* names[] = { C("matrix"), C("cached"), nullptr };
+  if (!PyArg_ParseTupleAndKeywords(args, kw, "O|O:double_matrix_view",
+                                   names, &obj, &cached)) {
+    return nullptr;
+  }
+  ::kaldi::MatrixBase<double>* matrix;
+  if (!Clif_PyObjAs(obj, &matrix)) {
+    return ArgError("double_matrix_view", names[0],
+                    "::kaldi::MatrixBase<double>", obj);
+  }
+  npy_intp sizes[2] = { matrix->NumRows(), matrix->NumCols() };
+  npy_intp strides[2] = { matrix->Stride() * ((long)sizeof(double)),
+                          ((long)sizeof(double)) };
+  return View(cached, NPY_DOUBLE, matrix->Data(), 2, sizes, strides);
+}
+
 }  // namespace numpy
 
 static PyMethodDef Methods[] = {
@@ -1057,6 +1200,18 @@ static PyMethodDef Methods[] = {
   { C("double_matrix_to_numpy"), (PyCFunction)numpy::DoubleMatrixToNumpy,
     METH_VARARGS | METH_KEYWORDS,
     C("double_matrix_to_numpy(matrix:DoubleMatrixBase) -> ndarray\n Converts a double precision matrix to a 2-D NumPy array.") },
+  { C("vector_view"), (PyCFunction)numpy::VectorView,
+    METH_VARARGS | METH_KEYWORDS,
+    C("vector_view(vector:VectorBase, cached:ndarray=None) -> ndarray\n Returns a cached 1-D NumPy view of a single precision vector.") },
+  { C("matrix_view"), (PyCFunction)numpy::MatrixView,
+    METH_VARARGS | METH_KEYWORDS,
+    C("matrix_view(matrix:MatrixBase, cached:ndarray=None) -> ndarray\n Returns a cached 2-D NumPy view of a single precision matrix.") },
+  { C("double_vector_view"), (PyCFunction)numpy::DoubleVectorView,
+    METH_VARARGS | METH_KEYWORDS,
+    C("double_vector_view(vector:DoubleVectorBase, cached:ndarray=None) -> ndarray\n Returns a cached 1-D NumPy view of a double precision vector.") },
+  { C("double_matrix_view"), (PyCFunction)numpy::DoubleMatrixView,
+    METH_VARARGS | METH_KEYWORDS,
+    C("double_matrix_view(matrix:DoubleMatrixBase, cached:ndarray=None) -> ndarray\n Returns a cached 2-D NumPy view of a double precision matrix.") },
   {}
 };
 
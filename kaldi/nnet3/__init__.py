@@ -38,6 +38,7 @@ from ._nnet_chain_training import *
 from ._nnet_chain_diagnostics import *
 from ._am_nnet_simple import *
 from ._nnet_am_decodable_simple import *
+from ._nnet_am_decodable_simple_ext import *
 from ._decodable_simple_looped import *
 from ._decodable_online_looped import *
 
@@ -0,0 +1,25 @@
+#ifndef PYKALDI_NNET3_NNET_AM_DECODABLE_SIMPLE_EXT_H_
+#define PYKALDI_NNET3_NNET_AM_DECODABLE_SIMPLE_EXT_H_ 1
+
+#include "nnet3/nnet-am-decodable-simple.h"
+
+namespace kaldi {
+namespace nnet3 {
+
+  // Copies the outputs for frames [start_frame, start_frame + NumRows) into
+  // the rows of output. The network is evaluated chunk by chunk as needed.
+  void GetOutputForFrames(DecodableNnetSimple *decodable, int32 start_frame,
+                          MatrixBase<BaseFloat> *output) {
+    KALDI_ASSERT(start_frame >= 0 &&
+                 start_frame + output->NumRows() <= decodable->NumFrames() &&
+                 output->NumCols() == decodable->OutputDim());
+    for (int32 t = 0; t < output->NumRows(); t++) {
+      SubVector<BaseFloat> row(*output, t);
+      decodable->GetOutputForFrame(start_frame + t, &row);
+    }
+  }
+
+}  // namespace nnet3
+}  // namespace kaldi
+
+#endif // PYKALDI_NNET3_NNET_AM_DECODABLE_SIMPLE_EXT_H_
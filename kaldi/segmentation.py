@@ -2,6 +2,9 @@ from __future__ import division, print_function
 
 import math
 
+import numpy
+
+from .asr import _nnet_lock, _prepare_nnet
 from . import decoder as _dec
 from . import fstext as _fst
 from .fstext import utils as _fst_utils
@@ -14,6 +17,50 @@ from .util import io as _util_io
 __all__ = ['Segmenter', 'NnetSAD', 'SegmentationProcessor']
 
 
+def _label_runs(labels, offset=0):
+    """Converts frame-level labels to a list of (begin, end, label) runs."""
+    changes = numpy.flatnonzero(numpy.diff(labels)) + 1
+    begins = numpy.concatenate(([0], changes))
+    ends = numpy.concatenate((changes, [len(labels)]))
+    return [(begin + offset, end + offset, label)
+            for begin, end, label in zip(begins.tolist(), ends.tolist(),
+                                         labels[begins].tolist())]
+
+
+class _FrameBuffer(object):
+    """Growable buffer of frame-level values, e.g. log-likelihoods.
+
+    Appending frames takes amortized constant time per frame, so a long
+    pending region is not copied again for each new chunk.
+    """
+    def __init__(self):
+        self._data = None
+        self.size = 0
+
+    def append(self, frames):
+        """Appends frames to the end of the buffer."""
+        size = self.size + len(frames)
+        if self._data is None or size > len(self._data):
+            capacity = max(size, 64 if self._data is None
+                           else 2 * len(self._data))
+            data = numpy.empty((capacity,) + frames.shape[1:], frames.dtype)
+            if self._data is not None:
+                data[:self.size] = self._data[:self.size]
+            self._data = data
+        self._data[self.size:size] = frames
+        self.size = size
+
+    def drop(self, num_frames):
+        """Removes frames from the start of the buffer."""
+        remaining = self.size - num_frames
+        self._data[:remaining] = self._data[num_frames:self.size]
+        self.size = remaining
+
+    def frames(self):
+        """Returns a view of the buffered frames."""
+        return self._data[:self.size]
+
+
 class Segmenter(object):
     """Base class for speech segmenters.
 
@@ -119,9 +166,7 @@ class NnetSAD(Segmenter):
         self.model = model
         self.priors = _mat.Vector()
         self.transform = transform
-        _nnet3.set_batchnorm_test_mode(True, model)
-        _nnet3.set_dropout_test_mode(True, model)
-        _nnet3.collapse_model(_nnet3.CollapseModelConfig(), model)
+        _prepare_nnet(model)
         if decodable_opts:
             if not isinstance(decodable_opts,
                               _nnet3.NnetSimpleComputationOptions):
@@ -154,18 +199,183 @@ class NnetSAD(Segmenter):
 
         post = _mat.Matrix(nnet_computer.num_frames(),
                            nnet_computer.output_dim())
-        for t in range(nnet_computer.num_frames()):
-            nnet_computer.get_output_for_frame(t, post[t])
-        post.apply_exp_()
+        with _nnet_lock.shared():
+            _nnet3.get_output_for_frames(nnet_computer, 0, post)
         # FIXME: Need to keep a reference to log_likes to keep it in scope
-        self._log_likes = _mat.Matrix(post.num_rows, self.transform.num_rows)
-        self._log_likes.add_mat_mat_(post, self.transform,
-                                     _mat_comm.MatrixTransposeType.NO_TRANS,
-                                     _mat_comm.MatrixTransposeType.TRANS,
-                                     1.0, 0.0)
-        self._log_likes.apply_log_()
+        self._log_likes = self._compute_log_likes(post)
         return _dec.DecodableMatrixScaled(self._log_likes, self.acoustic_scale)
 
+    def _compute_log_likes(self, post):
+        """Converts SAD label log-posteriors to pseudo log-likelihoods.
+
+        Args:
+            post (Matrix): SAD label log-posteriors. This matrix is modified
+                in place.
+
+        Returns:
+            Matrix: SAD pseudo log-likelihoods.
+        """
+        post.apply_exp_()
+        log_likes = _mat.Matrix(post.num_rows, self.transform.num_rows)
+        log_likes.add_mat_mat_(post, self.transform,
+                               _mat_comm.MatrixTransposeType.NO_TRANS,
+                               _mat_comm.MatrixTransposeType.TRANS,
+                               1.0, 0.0)
+        log_likes.apply_log_()
+        return log_likes
+
+    def _compute_stream_log_likes(self, feats, feats_begin, begin, end):
+        """Computes SAD pseudo log-likelihoods for a range of stream frames.
+
+        Args:
+            feats (numpy.ndarray): Buffered stream features. It should include
+                the left and right context of the frame range, when available.
+            feats_begin (int): Stream input frame index of the first buffered
+                frame. It should be a multiple of the frame subsampling factor.
+            begin (int): Stream output frame index of the first output frame.
+            end (int): Stream output frame index of the last output frame plus
+                one.
+
+        Returns:
+            numpy.ndarray: SAD pseudo log-likelihoods.
+        """
+        nnet_computer = _nnet3.DecodableNnetSimple(
+            self.decodable_opts, self.model, self.priors, _mat.Matrix(feats),
+            self.compiler, None, None, 0)
+        post = _mat.Matrix(end - begin, nnet_computer.output_dim())
+        subsampling = self.decodable_opts.frame_subsampling_factor
+        with _nnet_lock.shared():
+            _nnet3.get_output_for_frames(
+                nnet_computer, begin - feats_begin // subsampling, post)
+        return self._compute_log_likes(post).numpy()
+
+    def segment_stream(self, chunks, finalize_delay=100,
+                       max_pending_frames=6000):
+        """Segments a stream of feature chunks.
+
+        This is the streaming counterpart of :meth:`segment`. Features are
+        consumed chunk by chunk and finalized segments are generated as soon
+        as they are available, so segments for long or unbounded streams are
+        available while the stream is still being read.
+
+        The SAD model is evaluated on each chunk together with the left and
+        right context frames it needs from the neighboring chunks, so outputs
+        are delayed by the right context of the model. Model outputs are the
+        same as the outputs computed by :meth:`segment` for models without
+        recurrent connections. Decoding is advanced after each chunk. A
+        segment boundary is considered final once it is at least
+        **finalize_delay** frames behind the last decoded frame. All segments
+        before the last final boundary are generated and decoding is restarted
+        from that boundary, which keeps memory usage bounded. If no segment
+        boundary becomes final within **max_pending_frames** frames, the
+        current segment is cut and generated in pieces.
+
+        Since finalized segments are not revised and decoding restarts from
+        the graph start state at each final boundary, generated segments may
+        differ from the output of :meth:`segment` around boundaries that
+        would be moved by the evidence in later frames. Increasing
+        **finalize_delay** makes such differences less likely at the cost of
+        a longer output delay.
+
+        Generated segments are (segment-beg, segment-end, label) tuples, where
+        segment boundaries are output frame indices relative to the start of
+        the stream, as in the "alignment" output of :meth:`segment`. If the
+        frame subsampling factor is greater than 1, output frames are
+        subsampled input frames. Segments are generated for all labels, in
+        order. Consecutive segments may share a label if a segment was cut.
+
+        Args:
+            chunks (Iterable[Matrix or numpy.ndarray]): Feature chunks.
+            finalize_delay (int): Number of output frames after which a
+                segment boundary is considered final.
+            max_pending_frames (int): Maximum number of decoded output frames
+                kept before the current segment is cut.
+
+        Raises:
+            RuntimeError: If segmentation fails.
+        """
+        if max_pending_frames <= finalize_delay:
+            raise ValueError("max_pending_frames should be greater than "
+                             "finalize_delay.")
+        subsampling = self.decodable_opts.frame_subsampling_factor
+        left, right = _nnet3.compute_simple_nnet_context(self.model)
+
+        # Features are buffered starting from the left context of the first
+        # output frame that has not been computed yet. Output frame t is
+        # computed around input frame t * subsampling, hence the buffer always
+        # starts at a multiple of the subsampling factor.
+        feats, feats_begin, num_computed = None, 0, 0
+        # Log-likelihoods are kept starting from the last decoder restart.
+        log_likes, offset = _FrameBuffer(), 0
+
+        def advance():
+            """Advances decoding over the buffered log-likelihoods."""
+            log_likes_matrix = _mat.SubMatrix(log_likes.frames())
+            self.decoder.advance_decoding(
+                _dec.DecodableMatrixScaled(log_likes_matrix,
+                                           self.acoustic_scale))
+
+        def best_alignment(use_final_probs):
+            """Returns the alignment for the current best path."""
+            try:
+                best_path = self.decoder.get_best_path(use_final_probs)
+            except RuntimeError:
+                raise RuntimeError("Empty segmentation output.")
+            ali, _, _ = _fst_utils.get_linear_symbol_sequence(best_path)
+            return numpy.asarray(ali)
+
+        self.decoder.init_decoding()
+        for chunk in chunks:
+            chunk = numpy.asarray(chunk, dtype=numpy.float32)
+            if len(chunk) == 0:
+                continue
+            feats = chunk if feats is None else numpy.concatenate((feats,
+                                                                   chunk))
+            # Output frame t needs input frames up to t * subsampling + right.
+            ready = (feats_begin + len(feats) - 1 - right) // subsampling + 1
+            if ready <= num_computed:
+                continue
+            log_likes.append(self._compute_stream_log_likes(
+                feats, feats_begin, num_computed, ready))
+            advance()
+            num_computed = ready
+            drop = max(0, num_computed * subsampling - left - feats_begin)
+            drop -= drop % subsampling
+            feats, feats_begin = feats[drop:], feats_begin + drop
+
+            num_stable = self.decoder.num_frames_decoded() - finalize_delay
+            if num_stable <= 0:
+                continue
+            ali = best_alignment(False)
+            changes = numpy.flatnonzero(numpy.diff(ali[:num_stable])) + 1
+            if len(changes):
+                cut = int(changes[-1])
+            elif log_likes.size >= max_pending_frames:
+                cut = num_stable
+            else:
+                continue
+            for segment in _label_runs(ali[:cut], offset):
+                yield segment
+            log_likes.drop(cut)
+            offset += cut
+            self.decoder.init_decoding()
+            advance()
+
+        if feats is None:
+            return
+        # Offline computation outputs ceil(num_frames / subsampling) frames.
+        end = (feats_begin + len(feats) + subsampling - 1) // subsampling
+        if end > num_computed:
+            log_likes.append(self._compute_stream_log_likes(
+                feats, feats_begin, num_computed, end))
+            advance()
+        if self.decoder.num_frames_decoded() == 0:
+            return
+        if not self.decoder.reached_final():
+            raise RuntimeError("No final state was active on the last frame.")
+        for segment in _label_runs(best_alignment(True), offset):
+            yield segment
+
     @staticmethod
     def read_model(model_rxfilename):
         """Reads SAD model from an extended filename."""
@@ -538,12 +748,147 @@ class SegmentationProcessor(object):
         stats.num_segments_final = len(merged_segments)
         return merged_segments
 
+    def process_array(self, alignment):
+        """Converts frame-level segmentation labels to arrays of segments.
+
+        This is the array-based counterpart of :meth:`process`. Segments are
+        represented by three integer arrays holding segment begin frames,
+        segment end frames and segment labels. Run-length detection and
+        post-processing operations are vectorized with NumPy.
+
+        Args:
+            alignment (List[int] or numpy.ndarray): Frame-level segmentation
+                labels.
+
+        Returns:
+            Tuple[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray],
+            SegmentationProcessor.Stats]: Segment begin, end and label arrays,
+            along with segmentation post-processing stats.
+        """
+        alignment = numpy.asarray(alignment)
+        stats = self.Stats()
+        segments = self.initialize_segments_array(alignment, stats)
+        segments = self.filter_short_segments_array(segments, stats)
+        segments = self.pad_segments_array(segments, stats, len(alignment))
+        segments = self.merge_consecutive_segments_array(segments, stats)
+        self.stats.add(stats)
+        return segments, stats
+
+    def initialize_segments_array(self, alignment, stats):
+        """Initializes segment arrays.
+
+        Array-based counterpart of :meth:`initialize_segments`.
+        """
+        alignment = numpy.asarray(alignment)
+        if alignment.size == 0:
+            empty = numpy.zeros(0, dtype=numpy.int64)
+            return empty, empty.copy(), empty.copy()
+        changes = numpy.flatnonzero(numpy.diff(alignment)) + 1
+        begins = numpy.concatenate(([0], changes))
+        ends = numpy.concatenate((changes, [len(alignment)]))
+        labels = alignment[begins]
+        targets = numpy.isin(labels, self.target_labels)
+        begins, ends, labels = begins[targets], ends[targets], labels[targets]
+        num_target_frames = int(numpy.sum(ends - begins))
+        stats.num_segments_initial = len(begins)
+        stats.num_segments_final = len(begins)
+        stats.initial_duration = num_target_frames * self.frame_shift
+        stats.final_duration = stats.initial_duration
+        return begins, ends, labels
+
+    def filter_short_segments_array(self, segments, stats):
+        """Filters out short segments.
+
+        Array-based counterpart of :meth:`filter_short_segments`.
+        """
+        if self.min_segment_dur <= 0:
+            return segments
+        begins, ends, labels = segments
+        durs = ends - begins
+        short = durs < self.min_segment_dur
+        stats.filter_short_duration += (int(numpy.sum(durs[short]))
+                                        * self.frame_shift)
+        stats.num_short_segments_filtered += int(numpy.count_nonzero(short))
+        keep = ~short
+        stats.num_segments_final = int(numpy.count_nonzero(keep))
+        stats.final_duration -= stats.filter_short_duration
+        return begins[keep], ends[keep], labels[keep]
+
+    def pad_segments_array(self, segments, stats, num_utt_frames=None):
+        """Pads segments on both sides.
+
+        Array-based counterpart of :meth:`pad_segments`.
+        """
+        begins, ends, labels = segments
+        # Padded segment ends are limited by the start of the next segment and
+        # padded segment starts are limited by the padded end of the previous
+        # segment, as in pad_segments.
+        padded_ends = ends + self.segment_padding
+        if num_utt_frames is not None:
+            padded_ends = numpy.minimum(padded_ends, num_utt_frames)
+        padded_ends[:-1] = numpy.minimum(padded_ends[:-1], begins[1:])
+        padded_begins = numpy.maximum(begins - self.segment_padding, 0)
+        padded_begins[1:] = numpy.maximum(padded_begins[1:], padded_ends[:-1])
+        num_padded_frames = int(numpy.sum(begins - padded_begins)
+                                + numpy.sum(padded_ends - ends))
+        stats.padding_duration = num_padded_frames * self.frame_shift
+        stats.final_duration += stats.padding_duration
+        return padded_begins, padded_ends, labels
+
+    def merge_consecutive_segments_array(self, segments, stats):
+        """Merges consecutive segments.
+
+        Array-based counterpart of :meth:`merge_consecutive_segments`. Only
+        the pairs of segments sharing a boundary and a label are visited in
+        Python.
+        """
+        begins, ends, labels = segments
+        if self.max_merged_segment_dur <= 0 or len(begins) == 0:
+            return segments
+
+        touching = numpy.flatnonzero((begins[1:] == ends[:-1])
+                                     & (labels[1:] == labels[:-1]))
+        heads = numpy.ones(len(begins), dtype=bool)
+        group_begins = begins.copy()
+        for i in touching.tolist():
+            if ends[i + 1] - group_begins[i] <= self.max_merged_segment_dur:
+                heads[i + 1] = False
+                group_begins[i + 1] = group_begins[i]
+        tails = numpy.append(heads[1:], True)
+
+        stats.num_merges += len(begins) - int(numpy.count_nonzero(heads))
+        stats.num_segments_final = int(numpy.count_nonzero(heads))
+        return begins[heads], ends[tails], labels[heads]
+
+    def _format_segments(self, key, segments):
+        """Formats segments as lines of a segments file."""
+        if len(segments) == 3 and isinstance(segments[0], numpy.ndarray):
+            segments = zip(*(x.tolist() for x in segments))
+        return ["{key}-{label}-{begin:07d}-{end:07d} {key} {begin_time:.2f} "
+                "{end_time:.2f}\n".format(
+                    key=key, label=label, begin=begin, end=end,
+                    begin_time=begin * self.frame_shift,
+                    end_time=end * self.frame_shift)
+                for begin, end, label in segments]
+
     def write(self, key, segments, file_handle):
-        """Writes segments to file"""
-        for begin, end, label in segments:
-            id = "{key}-{label}-{begin:07d}-{end:07d}".format(
-                key=key, label=label, begin=begin, end=end)
-            print("{id} {key} {begin:.2f} {end:.2f}".format(
-                      id=id, key=key, begin=begin * self.frame_shift,
-                      end=end * self.frame_shift),
-                  file=file_handle)
+        """Writes segments to file.
+
+        Segments can be given either as a list of (segment-beg, segment-end,
+        label) tuples or as segment begin, end and label arrays.
+        """
+        file_handle.write("".join(self._format_segments(key, segments)))
+
+    def write_all(self, segmentations, file_handle):
+        """Writes segments for many recordings to file in a single call.
+
+        Args:
+            segmentations (Iterable[Tuple[str, object]]): An iterable of
+                `(key, segments)` pairs, where segments are in any format
+                accepted by :meth:`write`.
+            file_handle (file): The file to write to.
+        """
+        lines = []
+        for key, segments in segmentations:
+            lines.extend(self._format_segments(key, segments))
+        file_handle.write("".join(lines))
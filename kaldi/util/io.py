@@ -9,6 +9,22 @@ see `Kaldi I/O mechanisms`_ and `Kaldi I/O from a command-line perspective`_.
 """
 
 
+import codecs as _codecs
+import gzip as _gzip
+import locale as _locale
+import os as _os
+import re as _re
+import threading as _threading
+try:
+    import queue as _queue
+except ImportError:  # Python 2
+    import Queue as _queue
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
 from ..base import io as _base_io
 from . import _kaldi_io
 from ._kaldi_io import *
@@ -254,6 +270,467 @@ def xopen(xfilename, mode="r", write_header=True):
         return Output(xfilename, binary, write_header)
 
 
+# Compressed files handled in-process by the asynchronous streams. Each entry
+# maps a codec name to the patterns of rxfilenames (pipes decompressing a file)
+# and wxfilenames (pipes compressing to a file) equivalent to that codec.
+_CODEC_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+_CODEC_READ_PIPES = {
+    "gzip": _re.compile(r"^\s*(?:gunzip\s+-c|gzip\s+-(?:cd|dc)|zcat)"
+                        r"\s+(\S+)\s*\|$"),
+    "zstd": _re.compile(r"^\s*(?:zstd\s+-q?(?:cd|dc)q?|zstdcat)"
+                        r"\s+(\S+)\s*\|$"),
+}
+_CODEC_WRITE_PIPES = {
+    "gzip": _re.compile(r"^\|\s*gzip(?:\s+-c)?(?:\s+-([1-9]))?"
+                        r"\s*>\s*(\S+)\s*$"),
+    "zstd": _re.compile(r"^\|\s*zstd(?:\s+-q)?(?:\s+-c)?(?:\s+-(\d+))?"
+                        r"(?:\s+-q)?\s*>\s*(\S+)\s*$"),
+}
+
+# Sentinel queued by AsyncOutput.flush.
+_FLUSH = object()
+
+
+def _codec_for_rxfilename(rxfilename):
+    """Returns (codec, filename) if rxfilename can be decompressed in-process.
+
+    Otherwise, returns ``None``.
+    """
+    for codec, pattern in _CODEC_READ_PIPES.items():
+        match = pattern.match(rxfilename)
+        if match:
+            return codec, match.group(1)
+    if classify_rxfilename(rxfilename) == InputType.FILE_INPUT:
+        codec = _CODEC_EXTENSIONS.get(_os.path.splitext(rxfilename)[1])
+        if codec:
+            return codec, rxfilename
+    return None
+
+
+def _codec_for_wxfilename(wxfilename):
+    """Returns (codec, filename, level) if wxfilename can be compressed
+    in-process.
+
+    Otherwise, returns ``None``. The level is ``None`` unless the pipe
+    specifies one.
+    """
+    for codec, pattern in _CODEC_WRITE_PIPES.items():
+        match = pattern.match(wxfilename)
+        if match:
+            level = match.group(1)
+            return codec, match.group(2), int(level) if level else None
+    if classify_wxfilename(wxfilename) == OutputType.FILE_OUTPUT:
+        codec = _CODEC_EXTENSIONS.get(_os.path.splitext(wxfilename)[1])
+        if codec:
+            return codec, wxfilename, None
+    return None
+
+
+def _open_codec_reader(codec, filename):
+    """Opens a compressed file for reading and returns a file-like object."""
+    if codec == "gzip":
+        return _gzip.open(filename, "rb")
+    f = open(filename, "rb")
+    return _CodecFile(_zstd.ZstdDecompressor().stream_reader(f), f)
+
+
+def _open_codec_writer(codec, filename, level):
+    """Opens a compressed file for writing and returns a file-like object."""
+    if codec == "gzip":
+        return _gzip.open(filename, "wb",
+                          compresslevel=9 if level is None else level)
+    f = open(filename, "wb")
+    compressor = _zstd.ZstdCompressor(level=3 if level is None else level)
+    return _CodecFile(compressor.stream_writer(f), f)
+
+
+class _CodecFile(object):
+    """Closes the underlying file along with a zstandard stream."""
+
+    def __init__(self, stream, f):
+        self._stream = stream
+        self._file = f
+
+    def read(self, size):
+        return self._stream.read(size)
+
+    def write(self, data):
+        return self._stream.write(data)
+
+    def flush(self):
+        self._stream.flush()
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._file.closed:
+                self._file.close()
+
+
+class AsyncInput(object):
+    """Asynchronous input stream for reading from extended filenames.
+
+    Contents of the stream are read in chunks of **chunk_size** bytes by a
+    background thread and buffered in a bounded queue holding at most
+    **max_chunks** chunks, so that reading from a slow pipe or a compressed
+    file overlaps with the processing done by the caller. The background thread
+    releases the GIL while it is blocked on the stream.
+
+    If **decompress** is ``True``, compressed files -- rxfilenames ending with
+    `.gz` or `.zst`, or simple pipes decompressing such a file, e.g.
+    ``"gunzip -c foo.gz |"``, ``"zcat foo.gz |"`` or ``"zstd -dc foo.zst |"``
+    -- are decompressed in-process instead of spawning a shell. Decompressing
+    `.zst` files in-process requires the `zstandard` package. Without it,
+    `.zst` files are decompressed with a ``zstd -dc`` pipe. All other
+    rxfilenames are read with `Input`.
+
+    If **binary** is ``True``, the input stream is opened in binary mode and
+    `read` and `readline` methods return `bytes` objects. If the contents of
+    the stream start with Kaldi binary mode header, `self.binary` attribute is
+    set to ``True`` and the header is skipped. Otherwise, the input stream is
+    opened in text mode and these methods return `unicode` strings, the bytes
+    having been first decoded using the platform-dependent default encoding.
+
+    This class implements the iterator and context manager protocols.
+
+    Args:
+        rxfilename (str): Extended filename to open for reading.
+        binary (bool): Whether to open the stream in binary mode.
+        chunk_size (int): The number of bytes read from the stream at a time.
+        max_chunks (int): The maximum number of chunks buffered in memory.
+        decompress (bool): Whether to decompress compressed files in-process.
+
+    Attributes:
+        binary (bool): Whether the contents of the input stream are binary.
+    """
+
+    def __init__(self, rxfilename, binary=True, chunk_size=65536, max_chunks=16,
+                 decompress=True):
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be positive.")
+        if max_chunks < 1:
+            raise ValueError("max_chunks should be positive.")
+        self.binary = False
+        self._buffer = b""
+        self._eof = False
+        self._closed = False
+        self._stop = _threading.Event()
+        self._queue = _queue.Queue(max_chunks)
+        codec = _codec_for_rxfilename(rxfilename) if decompress else None
+        if codec and codec[0] == "zstd" and _zstd is None:
+            rxfilename, codec = "zstd -dc {} |".format(codec[1]), None
+        if codec:
+            self._file = _open_codec_reader(*codec)
+            self._read_chunk = self._file.read
+        else:
+            self._file = Input(rxfilename, binary)
+            stream = self._file.stream()
+            self._read_chunk = lambda size: _base_io.read_chunk(stream, size)
+        if binary:
+            if codec:
+                self._fill(2)
+                if self._buffer.startswith(b"\0B"):
+                    self.binary = True
+                    self._buffer = self._buffer[2:]
+            else:
+                self.binary = self._file.binary
+            self._decode = None
+        else:
+            encoding = _locale.getpreferredencoding(False)
+            self._decode = _codecs.getincrementaldecoder(encoding)().decode
+        self._thread = _threading.Thread(target=self._pump,
+                                         args=(chunk_size,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __del__(self):
+        if not getattr(self, "_closed", True):
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                break
+            yield line
+
+    def _fill(self, size):
+        # Reads synchronously before the background thread is started.
+        while len(self._buffer) < size:
+            chunk = self._read_chunk(size - len(self._buffer))
+            if not chunk:
+                break
+            self._buffer += chunk
+
+    def _pump(self, chunk_size):
+        try:
+            while not self._stop.is_set():
+                chunk = self._read_chunk(chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as err:
+            self._put(err)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except _queue.Full:
+                pass
+
+    def _next_chunk(self):
+        if self._eof:
+            return b""
+        chunk = self._queue.get()
+        if isinstance(chunk, Exception):
+            self._eof = True
+            raise chunk
+        if not chunk:
+            self._eof = True
+        return chunk
+
+    def _finish(self, data, final=False):
+        if self._decode is None:
+            return data
+        return self._decode(data, final)
+
+    def is_open(self):
+        """Checks if the stream is open."""
+        return not self._closed
+
+    def read(self, size=-1):
+        """Reads and returns at most size bytes from the stream.
+
+        If size is negative, reads until EOF. If stream was opened in binary
+        mode, returns a `bytes` object. Otherwise, returns a `unicode` string
+        decoded from at most size bytes.
+        """
+        if self._closed:
+            raise ValueError("I/O operation on closed stream.")
+        chunks = [self._buffer]
+        count = len(self._buffer)
+        while size < 0 or count < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            chunks.append(chunk)
+            count += len(chunk)
+        data = b"".join(chunks)
+        if size < 0:
+            self._buffer = b""
+        else:
+            data, self._buffer = data[:size], data[size:]
+        return self._finish(data, self._eof and not self._buffer)
+
+    def readline(self):
+        """Reads and returns a line from the stream.
+
+        If stream was opened in binary mode, returns a `bytes` object.
+        Otherwise, returns a `unicode` string. If the stream is at EOF,
+        an empty object is returned.
+        """
+        if self._closed:
+            raise ValueError("I/O operation on closed stream.")
+        start = 0
+        while True:
+            end = self._buffer.find(b"\n", start)
+            if end >= 0:
+                line = self._buffer[:end + 1]
+                self._buffer = self._buffer[end + 1:]
+                return self._finish(line)
+            start = len(self._buffer)
+            chunk = self._next_chunk()
+            if not chunk:
+                line, self._buffer = self._buffer, b""
+                return self._finish(line, True)
+            self._buffer += chunk
+
+    def readlines(self):
+        """Reads and returns the contents of the stream as a list of lines.
+
+        If stream was opened in binary mode, returns a list of `bytes` objects.
+        Otherwise, returns a list of `unicode` strings.
+        """
+        return list(self)
+
+    def close(self):
+        """Closes the stream.
+
+        Stops the background thread and discards any buffered contents.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except _queue.Empty:
+                pass
+        self._thread.join()
+        self._buffer = b""
+        self._file.close()
+
+
+class AsyncOutput(object):
+    """Asynchronous output stream for writing to extended filenames.
+
+    Contents written to the stream are buffered in a bounded queue holding at
+    most **max_chunks** writes and written to the underlying stream by a
+    background thread, so that writing to a slow pipe or compressing a file
+    overlaps with the processing done by the caller. Calls to `write` block
+    only when the queue is full. Errors raised by the background thread are
+    re-raised by the next call to `write`, `flush` or `close`.
+
+    If **compress** is ``True``, compressed files -- wxfilenames ending with
+    `.gz` or `.zst`, or simple pipes compressing to such a file, e.g.
+    ``"| gzip -c > foo.gz"`` or ``"| zstd -c > foo.zst"`` -- are compressed
+    in-process instead of spawning a shell. Compressing `.zst` files in-process
+    requires the `zstandard` package. Without it, `.zst` files are compressed
+    with a ``zstd`` pipe. All other wxfilenames are written with `Output`.
+
+    If **binary** is ``True``, the output stream is opened in binary mode and
+    `write` and `writelines` methods accept `bytes` objects. Otherwise, they
+    accept `unicode` strings. If **write_header** is ``True`` and the stream
+    is opened in binary mode, then Kaldi binary mode header (`\\\\0` then `B`)
+    is written to the beginning of the stream.
+
+    This class implements the context manager protocol.
+
+    Args:
+        wxfilename (str): Extended filename to open for writing.
+        binary (bool): Whether to open the stream in binary mode.
+        write_header (bool): Whether to write Kaldi binary mode header in
+            binary mode.
+        max_chunks (int): The maximum number of writes buffered in memory.
+        compress (bool): Whether to compress compressed files in-process.
+    """
+
+    def __init__(self, wxfilename, binary=True, write_header=True,
+                 max_chunks=16, compress=True):
+        if max_chunks < 1:
+            raise ValueError("max_chunks should be positive.")
+        self._closed = False
+        self._error = None
+        self._queue = _queue.Queue(max_chunks)
+        codec = _codec_for_wxfilename(wxfilename) if compress else None
+        if codec and codec[0] == "zstd" and _zstd is None:
+            wxfilename, codec = "| zstd -q -c > {}".format(codec[1]), None
+        if codec:
+            self._file = _open_codec_writer(*codec)
+            self._write = self._file.write
+            self._flush = self._file.flush
+            if binary and write_header:
+                self._file.write(b"\0B")
+        else:
+            self._file = Output(wxfilename, binary, write_header)
+            self._write = self._file.write
+            self._flush = self._file.flush
+        if binary:
+            self._encode = None
+        else:
+            encoding = _locale.getpreferredencoding(False)
+            self._encode = _codecs.getincrementalencoder(encoding)().encode
+        self._thread = _threading.Thread(target=self._pump)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __del__(self):
+        if not getattr(self, "_closed", True):
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _pump(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    if item is _FLUSH:
+                        self._flush()
+                    else:
+                        self._write(item)
+            except Exception as err:
+                self._error = err
+            finally:
+                self._queue.task_done()
+
+    def _check(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed stream.")
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def is_open(self):
+        """Checks if the stream is open."""
+        return not self._closed
+
+    def write(self, s):
+        """Writes s to the stream.
+
+        Returns the number of bytes/characters written.
+        """
+        self._check()
+        data = s if self._encode is None else self._encode(s)
+        if data:
+            self._queue.put(data)
+        return len(s)
+
+    def writelines(self, lines):
+        """Writes a list of lines to the stream.
+
+        Line separators are not added, so it is usual for each of the lines
+        provided to have a line separator at the end.
+        """
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """Flushes the stream.
+
+        Blocks until all buffered contents are written to the underlying
+        stream.
+        """
+        self._check()
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        self._check()
+
+    def close(self):
+        """Closes the stream.
+
+        Blocks until all buffered contents are written to the underlying
+        stream.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(None)
+            self._thread.join()
+        finally:
+            self._file.close()
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+
 ################################################################################
 
 __all__ = [name for name in dir()
@@ -1,5 +1,10 @@
 
+#include <memory>
+#include <string>
+#include <vector>
+
 #include "util/kaldi-table.h"
+#include "util/table-types.h"
 #include "fstext/kaldi-fst-io.h"
 #include "kws/kaldi-kws.h"
 
@@ -16,4 +21,101 @@ namespace kaldi {
   typedef TableWriter<fst::VectorFstTplHolder<fst::StdArc>> StdVectorFstWriter;
   typedef TableWriter<fst::VectorFstTplHolder<fst::LogArc>> LogVectorFstWriter;
   typedef TableWriter<fst::VectorFstTplHolder<KwsLexicographicArc>> KwsIndexVectorFstWriter;
+
+  typedef RandomAccessTableReaderMapped<KaldiObjectHolder<Vector<double>>> RandomAccessDoubleVectorReaderMapped;
+  typedef RandomAccessTableReaderMapped<KaldiObjectHolder<Matrix<double>>> RandomAccessDoubleMatrixReaderMapped;
+
+  // Returns the values associated with a batch of keys. Values of the keys
+  // that are not in the table are null.
+  template <class Reader>
+  std::vector<std::unique_ptr<typename Reader::T>> LookupMany(
+      Reader *reader, const std::vector<std::string> &keys) {
+    std::vector<std::unique_ptr<typename Reader::T>> values;
+    values.reserve(keys.size());
+    for (const auto &key : keys) {
+      if (reader->HasKey(key))
+        values.emplace_back(new typename Reader::T(reader->Value(key)));
+      else
+        values.emplace_back(nullptr);
+    }
+    return values;
+  }
+
+  std::vector<std::unique_ptr<Vector<float>>>
+  LookupVectors(RandomAccessBaseFloatVectorReader *reader,
+                const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Vector<double>>>
+  LookupDoubleVectors(RandomAccessDoubleVectorReader *reader,
+                      const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Matrix<float>>>
+  LookupMatrices(RandomAccessBaseFloatMatrixReader *reader,
+                 const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Matrix<double>>>
+  LookupDoubleMatrices(RandomAccessDoubleMatrixReader *reader,
+                       const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<int32>>
+  LookupInts(RandomAccessInt32Reader *reader,
+             const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<float>>
+  LookupFloats(RandomAccessBaseFloatReader *reader,
+               const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<double>>
+  LookupDoubles(RandomAccessDoubleReader *reader,
+                const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<bool>>
+  LookupBools(RandomAccessBoolReader *reader,
+              const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Vector<float>>>
+  LookupMappedVectors(RandomAccessBaseFloatVectorReaderMapped *reader,
+                      const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Vector<double>>>
+  LookupMappedDoubleVectors(RandomAccessDoubleVectorReaderMapped *reader,
+                            const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Matrix<float>>>
+  LookupMappedMatrices(RandomAccessBaseFloatMatrixReaderMapped *reader,
+                       const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<Matrix<double>>>
+  LookupMappedDoubleMatrices(RandomAccessDoubleMatrixReaderMapped *reader,
+                             const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
+
+  std::vector<std::unique_ptr<float>>
+  LookupMappedFloats(RandomAccessBaseFloatReaderMapped *reader,
+                     const std::vector<std::string> &keys) {
+    return LookupMany(reader, keys);
+  }
 }
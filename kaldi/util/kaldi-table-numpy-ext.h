@@ -0,0 +1,238 @@
+#ifndef PYKALDI_UTIL_KALDI_TABLE_NUMPY_EXT_H_
+#define PYKALDI_UTIL_KALDI_TABLE_NUMPY_EXT_H_ 1
+
+#include <cstring>
+
+#include "hmm/posterior-ext.h"
+#include "util/kaldi-table.h"
+#include "util/table-types.h"
+
+namespace kaldi {
+
+  // Moves the current value of a sequential reader into value (by swapping
+  // data pointers, i.e. without copying), stores the current key in key and
+  // advances the reader. Returns false if the reader is already exhausted.
+  template <class Holder>
+  bool TakeNext(SequentialTableReader<Holder> *reader, std::string *key,
+                typename Holder::T *value) {
+    if (reader->Done()) return false;
+    *key = reader->Key();
+    value->Swap(&reader->Value());
+    reader->Next();
+    return true;
+  }
+
+  bool TakeNextVector(SequentialBaseFloatVectorReader *reader,
+                      std::string *key, Vector<float> *value) {
+    return TakeNext(reader, key, value);
+  }
+
+  bool TakeNextDoubleVector(SequentialDoubleVectorReader *reader,
+                            std::string *key, Vector<double> *value) {
+    return TakeNext(reader, key, value);
+  }
+
+  bool TakeNextMatrix(SequentialBaseFloatMatrixReader *reader,
+                      std::string *key, Matrix<float> *value) {
+    return TakeNext(reader, key, value);
+  }
+
+  bool TakeNextDoubleMatrix(SequentialDoubleMatrixReader *reader,
+                            std::string *key, Matrix<double> *value) {
+    return TakeNext(reader, key, value);
+  }
+
+  // Matrix sharing the memory of another matrix. Used for writing matrix
+  // views with table writers, which only accept owning matrices, without
+  // copying them. Memory is released by the owner, not by this object.
+  template <typename Real>
+  class BorrowedMatrix : public Matrix<Real> {
+   public:
+    explicit BorrowedMatrix(const MatrixBase<Real> &other) {
+      this->data_ = const_cast<Real *>(other.Data());
+      this->num_rows_ = other.NumRows();
+      this->num_cols_ = other.NumCols();
+      this->stride_ = other.Stride();
+    }
+    ~BorrowedMatrix() {
+      this->data_ = NULL;
+      this->num_rows_ = this->num_cols_ = this->stride_ = 0;
+    }
+  };
+
+  // Vector sharing the memory of another vector. See BorrowedMatrix.
+  template <typename Real>
+  class BorrowedVector : public Vector<Real> {
+   public:
+    explicit BorrowedVector(const VectorBase<Real> &other) {
+      this->data_ = const_cast<Real *>(other.Data());
+      this->dim_ = other.Dim();
+    }
+    ~BorrowedVector() {
+      this->data_ = NULL;
+      this->dim_ = 0;
+    }
+  };
+
+  void WriteVectorBase(BaseFloatVectorWriter *writer, const std::string &key,
+                       const VectorBase<float> &value) {
+    writer->Write(key, BorrowedVector<float>(value));
+  }
+
+  void WriteDoubleVectorBase(DoubleVectorWriter *writer,
+                             const std::string &key,
+                             const VectorBase<double> &value) {
+    writer->Write(key, BorrowedVector<double>(value));
+  }
+
+  void WriteMatrixBase(BaseFloatMatrixWriter *writer, const std::string &key,
+                       const MatrixBase<float> &value) {
+    writer->Write(key, BorrowedMatrix<float>(value));
+  }
+
+  void WriteDoubleMatrixBase(DoubleMatrixWriter *writer,
+                             const std::string &key,
+                             const MatrixBase<double> &value) {
+    writer->Write(key, BorrowedMatrix<double>(value));
+  }
+
+  // Raw bytes of a vector of integers or pairs. Used for exchanging table
+  // values with NumPy without creating a Python object per element.
+  template <typename T>
+  std::string VectorToBytes(const std::vector<T> &v) {
+    return std::string(reinterpret_cast<const char *>(v.data()),
+                       v.size() * sizeof(T));
+  }
+
+  template <typename T>
+  void BytesToVector(const std::string &data, std::vector<T> *v) {
+    KALDI_ASSERT(data.size() % sizeof(T) == 0);
+    v->resize(data.size() / sizeof(T));
+    if (!v->empty()) std::memcpy(v->data(), data.data(), data.size());
+  }
+
+  // Posteriors are exchanged as frame offsets (int32, num_frames + 1 entries)
+  // into the concatenation of all (id, weight) pairs.
+  void PosteriorToBytes(const Posterior &post, std::string *offsets,
+                        std::string *pairs) {
+    std::vector<int32> frame_offsets(post.size() + 1, 0);
+    for (size_t t = 0; t < post.size(); t++)
+      frame_offsets[t + 1] = frame_offsets[t] + post[t].size();
+    *offsets = VectorToBytes(frame_offsets);
+    pairs->resize(frame_offsets.back() * sizeof(std::pair<int32, BaseFloat>));
+    for (size_t t = 0; t < post.size(); t++) {
+      if (post[t].empty()) continue;
+      std::memcpy(&(*pairs)[frame_offsets[t] *
+                            sizeof(std::pair<int32, BaseFloat>)],
+                  post[t].data(),
+                  post[t].size() * sizeof(std::pair<int32, BaseFloat>));
+    }
+  }
+
+  void BytesToPosterior(const std::string &offsets, const std::string &pairs,
+                        Posterior *post) {
+    std::vector<int32> frame_offsets;
+    std::vector<std::pair<int32, BaseFloat>> all_pairs;
+    BytesToVector(offsets, &frame_offsets);
+    BytesToVector(pairs, &all_pairs);
+    KALDI_ASSERT(!frame_offsets.empty() && frame_offsets.front() == 0 &&
+                 static_cast<size_t>(frame_offsets.back()) == all_pairs.size());
+    post->resize(frame_offsets.size() - 1);
+    for (size_t t = 0; t < post->size(); t++) {
+      KALDI_ASSERT(frame_offsets[t] <= frame_offsets[t + 1]);
+      (*post)[t].assign(all_pairs.begin() + frame_offsets[t],
+                        all_pairs.begin() + frame_offsets[t + 1]);
+    }
+  }
+
+  template <class Holder>
+  bool TakeNextBytes(SequentialTableReader<Holder> *reader, std::string *key,
+                     std::string *data) {
+    if (reader->Done()) return false;
+    *key = reader->Key();
+    *data = VectorToBytes(reader->Value());
+    reader->Next();
+    return true;
+  }
+
+  bool TakeNextIntVectorBytes(SequentialInt32VectorReader *reader,
+                              std::string *key, std::string *data) {
+    return TakeNextBytes(reader, key, data);
+  }
+
+  bool TakeNextIntPairVectorBytes(SequentialInt32PairVectorReader *reader,
+                                  std::string *key, std::string *data) {
+    return TakeNextBytes(reader, key, data);
+  }
+
+  bool TakeNextFloatPairVectorBytes(
+      SequentialBaseFloatPairVectorReader *reader,
+      std::string *key, std::string *data) {
+    return TakeNextBytes(reader, key, data);
+  }
+
+  bool TakeNextPosteriorBytes(
+      SequentialTableReader<PosteriorWrapperHolder> *reader,
+      std::string *key, std::string *offsets, std::string *pairs) {
+    if (reader->Done()) return false;
+    *key = reader->Key();
+    PosteriorToBytes(reader->Value().GetPosteriors(), offsets, pairs);
+    reader->Next();
+    return true;
+  }
+
+  std::string IntVectorBytes(RandomAccessInt32VectorReader *reader,
+                             const std::string &key) {
+    return VectorToBytes(reader->Value(key));
+  }
+
+  std::string IntPairVectorBytes(RandomAccessInt32PairVectorReader *reader,
+                                 const std::string &key) {
+    return VectorToBytes(reader->Value(key));
+  }
+
+  std::string FloatPairVectorBytes(
+      RandomAccessBaseFloatPairVectorReader *reader, const std::string &key) {
+    return VectorToBytes(reader->Value(key));
+  }
+
+  void PosteriorBytes(RandomAccessTableReader<PosteriorWrapperHolder> *reader,
+                      const std::string &key, std::string *offsets,
+                      std::string *pairs) {
+    PosteriorToBytes(reader->Value(key).GetPosteriors(), offsets, pairs);
+  }
+
+  void WriteIntVectorBytes(Int32VectorWriter *writer, const std::string &key,
+                           const std::string &data) {
+    std::vector<int32> value;
+    BytesToVector(data, &value);
+    writer->Write(key, value);
+  }
+
+  void WriteIntPairVectorBytes(Int32PairVectorWriter *writer,
+                               const std::string &key,
+                               const std::string &data) {
+    std::vector<std::pair<int32, int32>> value;
+    BytesToVector(data, &value);
+    writer->Write(key, value);
+  }
+
+  void WriteFloatPairVectorBytes(BaseFloatPairVectorWriter *writer,
+                                 const std::string &key,
+                                 const std::string &data) {
+    std::vector<std::pair<BaseFloat, BaseFloat>> value;
+    BytesToVector(data, &value);
+    writer->Write(key, value);
+  }
+
+  void WritePosteriorBytes(TableWriter<PosteriorWrapperHolder> *writer,
+                           const std::string &key, const std::string &offsets,
+                           const std::string &pairs) {
+    PosteriorWrapper value;
+    BytesToPosterior(offsets, pairs, value.GetMutablePosteriors());
+    writer->Write(key, value);
+  }
+
+}  // namespace kaldi
+
+#endif  // PYKALDI_UTIL_KALDI_TABLE_NUMPY_EXT_H_
@@ -9,13 +9,76 @@ read/write specifiers, see `Kaldi I/O mechanisms`_ and
    http://kaldi-asr.org/doc/io_tut.html
 """
 
+import collections as _collections
+import mmap as _mmap
+from multiprocessing.pool import ThreadPool as _ThreadPool
+import os as _os
+import struct as _struct
+import sys as _sys
+import tempfile as _tempfile
+import threading as _threading
+try:
+    import queue as _queue
+except ImportError:
+    import Queue as _queue
+
+import numpy as _np
+
+from ._kaldi_io import classify_rxfilename, InputType
 from . import _kaldi_table
 from ._kaldi_table import (read_script_file, write_script_file,
                            classify_wspecifier, classify_rspecifier,
                            WspecifierType, RspecifierType,
                            WspecifierOptions, RspecifierOptions)
 from . import _kaldi_table_ext
+from . import _kaldi_table_numpy_ext
 import kaldi.matrix as _matrix
+import kaldi.matrix.compressed as _compressed
+
+# Structured NumPy data types used for sequences of pairs and posteriors.
+_INT_PAIR_DTYPE = _np.dtype([("first", "<i4"), ("second", "<i4")])
+_FLOAT_PAIR_DTYPE = _np.dtype([("first", "<f4"), ("second", "<f4")])
+_POSTERIOR_DTYPE = _np.dtype([("id", "<i4"), ("weight", "<f4")])
+
+
+def _pairs_to_bytes(value, dtype):
+    """Converts an array of pairs to the raw bytes of a structured array.
+
+    Args:
+        value: A structured array with two fields or an `N x 2` array.
+        dtype: The structured data type of the result.
+    """
+    value = _np.asarray(value)
+    if value.dtype == dtype:
+        return _np.ascontiguousarray(value).tobytes()
+    first, second = dtype.names
+    if value.dtype.names is not None and len(value.dtype.names) == 2:
+        pairs = _np.empty(value.shape, dtype=dtype)
+        pairs[first] = value[value.dtype.names[0]]
+        pairs[second] = value[value.dtype.names[1]]
+    elif value.ndim == 2 and value.shape[1] == 2:
+        pairs = _np.empty(value.shape[0], dtype=dtype)
+        pairs[first] = value[:, 0]
+        pairs[second] = value[:, 1]
+    else:
+        raise ValueError("Expected a structured array with two fields or an "
+                         "N x 2 array, got an array with dtype {} and shape {}."
+                         .format(value.dtype, value.shape))
+    return pairs.tobytes()
+
+
+def _is_posterior_arrays(value):
+    """Checks if value is an `(offsets, pairs)` tuple of NumPy arrays.
+
+    Only a 1-D integer offsets array is accepted, so that a posterior with
+    two frames given as a tuple is not mistaken for an `(offsets, pairs)`
+    tuple.
+    """
+    if not (isinstance(value, tuple) and len(value) == 2):
+        return False
+    offsets, pairs = value
+    return (isinstance(offsets, _np.ndarray) and offsets.ndim == 1 and
+            offsets.dtype.kind in "iu" and isinstance(pairs, _np.ndarray))
 
 ################################################################################
 # Sequential Readers
@@ -137,29 +200,160 @@ class _SequentialReaderBase(object):
         """
         return super(_SequentialReaderBase, self).close()
 
+    def read_many(self, n):
+        """Reads up to `n` entries from the table.
+
+        Args:
+            n (int): The maximum number of entries to read.
+
+        Returns:
+            A tuple `(keys, values)` of lists. The lists are shorter than `n`
+            only if the table reader is exhausted.
+        """
+        keys, values = [], []
+        while len(keys) < n and not self.done():
+            keys.append(self.key())
+            values.append(self.value())
+            self.next()
+        return keys, values
+
+
+class _SequentialNumpyReaderBase(_SequentialReaderBase):
+    """Base class for sequential table readers supporting NumPy arrays.
+
+    Subclasses implement `_next_numpy`, which returns the current entry as a
+    `(key, array)` pair and advances the reader in a single extension call,
+    or returns None if the reader is exhausted. Hence, if iteration over
+    :meth:`numpy` is stopped early, the reader is positioned at the entry
+    following the last entry yielded.
+    """
+    def _next_numpy(self):
+        raise NotImplementedError
+
+    def _read_many(self, n, next_item):
+        keys, values = [], []
+        while len(keys) < n:
+            item = next_item()
+            if item is None:
+                break
+            keys.append(item[0])
+            values.append(item[1])
+        return keys, values
+
+    def numpy(self):
+        """Iterates over the table, yielding NumPy arrays.
+
+        Yields:
+            `(key, array)` pairs from the table in sequential order.
+        """
+        next_numpy = self._next_numpy
+        while True:
+            item = next_numpy()
+            if item is None:
+                return
+            yield item
+
+    def read_many(self, n, numpy=False):
+        """Reads up to `n` entries from the table.
+
+        Args:
+            n (int): The maximum number of entries to read.
+            numpy (bool): Whether to return values as NumPy arrays.
+
+        Returns:
+            A tuple `(keys, values)` of lists. The lists are shorter than `n`
+            only if the table reader is exhausted.
+        """
+        if not numpy:
+            return super(_SequentialNumpyReaderBase, self).read_many(n)
+        return self._read_many(n, self._next_numpy)
+
+
+class _SequentialArrayReaderBase(_SequentialNumpyReaderBase):
+    """Base class for sequential vector/matrix table readers.
+
+    Entries are moved out of the underlying table holder without copying and
+    the reader is advanced in the same call, which avoids the separate
+    `key()`, `value()` and `next()` calls made by the generic iterator. The
+    :meth:`numpy` iterator and the `numpy` option of :meth:`read_many` return
+    NumPy arrays which take over the memory of the moved entries.
+
+    Since the reader is advanced before an entry is yielded, the position of
+    the reader differs from the generic iterator if iteration is stopped
+    early, e.g. with a `break` statement. The :meth:`key`, :meth:`value` and
+    :meth:`done` methods then refer to the entry following the last entry
+    yielded, and iterating over the reader again resumes with that entry
+    instead of yielding the last entry again.
+    """
+    _take_next = None
+    _value_type = None
+
+    def _next(self):
+        value = self._value_type()
+        ok, key = self._take_next(self, value)
+        return (key, value) if ok else None
+
+    def _next_numpy(self):
+        value = self._value_type()
+        ok, key = self._take_next(self, value)
+        return (key, value.numpy()) if ok else None
+
+    def __iter__(self):
+        """Iterates over the table.
+
+        Unlike the generic iterator, this advances the reader before yielding
+        an entry. See the class documentation for details.
+
+        Yields:
+            `(key, value)` pairs from the table in sequential order.
+        """
+        next_item = self._next
+        while True:
+            item = next_item()
+            if item is None:
+                return
+            yield item
+
+    def read_many(self, n, numpy=False):
+        """Reads up to `n` entries from the table.
+
+        Args:
+            n (int): The maximum number of entries to read.
+            numpy (bool): Whether to return values as NumPy arrays.
+
+        Returns:
+            A tuple `(keys, values)` of lists. The lists are shorter than `n`
+            only if the table reader is exhausted.
+        """
+        return self._read_many(n, self._next_numpy if numpy else self._next)
+
 
-class SequentialVectorReader(_SequentialReaderBase,
+class SequentialVectorReader(_SequentialArrayReaderBase,
                              _kaldi_table.SequentialVectorReader):
     """Sequential table reader for single precision vectors."""
-    pass
+    _take_next = staticmethod(_kaldi_table_numpy_ext.take_next_vector)
+    _value_type = _matrix.Vector
 
 
-class SequentialDoubleVectorReader(_SequentialReaderBase,
+class SequentialDoubleVectorReader(_SequentialArrayReaderBase,
                                    _kaldi_table.SequentialDoubleVectorReader):
     """Sequential table reader for double precision vectors."""
-    pass
+    _take_next = staticmethod(_kaldi_table_numpy_ext.take_next_double_vector)
+    _value_type = _matrix.DoubleVector
 
 
-class SequentialMatrixReader(_SequentialReaderBase,
+class SequentialMatrixReader(_SequentialArrayReaderBase,
                              _kaldi_table.SequentialMatrixReader):
     """Sequential table reader for single precision matrices."""
-    pass
+    _take_next = staticmethod(_kaldi_table_numpy_ext.take_next_matrix)
+    _value_type = _matrix.Matrix
 
 
-class SequentialDoubleMatrixReader(_SequentialReaderBase,
+class SequentialDoubleMatrixReader(_SequentialArrayReaderBase,
                                    _kaldi_table.SequentialDoubleMatrixReader):
     """Sequential table reader for double precision matrices."""
-    pass
+    _take_next = staticmethod(_kaldi_table_numpy_ext.take_next_double_matrix)
+    _value_type = _matrix.DoubleMatrix
 
 
 class SequentialWaveReader(_SequentialReaderBase,
@@ -174,10 +368,22 @@ class SequentialWaveInfoReader(_SequentialReaderBase,
     pass
 
 
-class SequentialPosteriorReader(_SequentialReaderBase,
+class SequentialPosteriorReader(_SequentialNumpyReaderBase,
                                 _kaldi_table.SequentialPosteriorReader):
-    """Sequential table reader for frame posteriors."""
-    pass
+    """Sequential table reader for frame posteriors.
+
+    NumPy values are `(offsets, pairs)` tuples of read-only arrays, where
+    `pairs` is a structured array with fields `id` (int32) and `weight`
+    (float32) holding the posteriors of all frames, and
+    `pairs[offsets[t]:offsets[t+1]]` are the posteriors for frame `t`.
+    """
+    def _next_numpy(self):
+        ok, key, offsets, pairs = (
+            _kaldi_table_numpy_ext.take_next_posterior_bytes(self))
+        if not ok:
+            return None
+        return key, (_np.frombuffer(offsets, dtype=_np.int32),
+                     _np.frombuffer(pairs, dtype=_POSTERIOR_DTYPE))
 
 
 class SequentialGaussPostReader(_SequentialReaderBase,
@@ -260,10 +466,15 @@ class SequentialBoolReader(_SequentialReaderBase,
     pass
 
 
-class SequentialIntVectorReader(_SequentialReaderBase,
+class SequentialIntVectorReader(_SequentialNumpyReaderBase,
                                 _kaldi_table.SequentialIntVectorReader):
-    """Sequential table reader for integer sequences."""
-    pass
+    """Sequential table reader for integer sequences.
+
+    NumPy values are read-only int32 arrays.
+    """
+    def _next_numpy(self):
+        ok, key, data = _kaldi_table_numpy_ext.take_next_int_vector_bytes(self)
+        return (key, _np.frombuffer(data, dtype=_np.int32)) if ok else None
 
 
 class SequentialIntVectorVectorReader(
@@ -274,39 +485,417 @@ class SequentialIntVectorVectorReader(
 
 
 class SequentialIntPairVectorReader(
-        _SequentialReaderBase,
+        _SequentialNumpyReaderBase,
         _kaldi_table.SequentialIntPairVectorReader):
-    """Sequential table reader for sequences of integer pairs."""
-    pass
+    """Sequential table reader for sequences of integer pairs.
+
+    NumPy values are read-only structured arrays with int32 fields `first`
+    and `second`.
+    """
+    def _next_numpy(self):
+        ok, key, data = (
+            _kaldi_table_numpy_ext.take_next_int_pair_vector_bytes(self))
+        if not ok:
+            return None
+        return key, _np.frombuffer(data, dtype=_INT_PAIR_DTYPE)
 
 
 class SequentialFloatPairVectorReader(
-        _SequentialReaderBase,
+        _SequentialNumpyReaderBase,
         _kaldi_table.SequentialFloatPairVectorReader):
-    """Sequential table reader for sequences of single precision float pairs."""
-    pass
+    """Sequential table reader for sequences of single precision float pairs.
+
+    NumPy values are read-only structured arrays with float32 fields `first`
+    and `second`.
+    """
+    def _next_numpy(self):
+        ok, key, data = (
+            _kaldi_table_numpy_ext.take_next_float_pair_vector_bytes(self))
+        if not ok:
+            return None
+        return key, _np.frombuffer(data, dtype=_FLOAT_PAIR_DTYPE)
+
+
+_END = object()
+
+
+class PrefetchingSequentialReader(object):
+    """Sequential table reader reading ahead in a background thread."""
+    def __init__(self, reader, queue_size=16, num_threads=0, transform=None):
+        """
+        This class wraps a sequential table reader and reads up to
+        **queue_size** entries ahead of the consumer in a background thread,
+        so that I/O, input pipes and decompression of compressed matrices do
+        not stall the consumer. It implements the iterator protocol, returning
+        `(key, value)` pairs in table order.
+
+        If a **transform** is provided, e.g. `lambda m: m.numpy()`, it is
+        applied to each value before the value is returned. Transforms are
+        applied in the background thread, or, if **num_threads** is positive,
+        in a pool of **num_threads** worker threads. Values are returned in
+        table order in both cases.
+
+        Args:
+            reader: An open sequential table reader, e.g. an instance of
+                `SequentialMatrixReader`.
+            queue_size (int): The maximum number of entries read ahead.
+            num_threads (int): The number of worker threads applying the
+                transform. If 0, the transform is applied by the reading
+                thread.
+            transform (callable): A function applied to each value.
+
+        Raises:
+            ValueError: If **queue_size** is not positive.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size should be positive.")
+        self._reader = reader
+        self._transform = transform
+        if transform is not None and num_threads > 0:
+            self._pool = _ThreadPool(num_threads)
+        else:
+            self._pool = None
+        self._queue = _queue.Queue(queue_size)
+        self._stop = _threading.Event()
+        self._done = False
+        self._thread = _threading.Thread(target=self._read)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except _queue.Full:
+                pass
+        return False
+
+    def _read(self):
+        transform, pool = self._transform, self._pool
+        try:
+            for key, value in self._reader:
+                if pool is not None:
+                    value = pool.apply_async(transform, (value,))
+                elif transform is not None:
+                    value = transform(value)
+                if not self._put((key, value)):
+                    return
+        except Exception as e:
+            self._put((_END, e))
+        else:
+            self._put((_END, None))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while not self._done:
+            key, value = self._queue.get()
+            if key is _END:
+                self._done = True
+                if value is not None:
+                    raise value
+                return
+            if self._pool is not None:
+                value = value.get()
+            yield key, value
+
+    def is_open(self):
+        """Indicates whether the reader is open or not.
+
+        Returns:
+          True if the reader is open, False otherwise.
+        """
+        return not self._stop.is_set()
+
+    def close(self):
+        """Stops reading ahead and closes the underlying table reader.
+
+        Returns:
+            True if the underlying table is closed successfully, False
+            otherwise.
+        """
+        if self._stop.is_set():
+            return True
+        self._stop.set()
+        self._thread.join()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+        self._done = True
+        return self._reader.close()
 
 ################################################################################
 # Random Access Readers
 ################################################################################
 
+_CacheInfo = _collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "size", "max_size",
+                  "num_items", "max_items"])
+
+_MISSING = object()
+
+
+def _value_nbytes(value):
+    """Returns the memory footprint of a table value in bytes.
+
+    Raises:
+        TypeError: If the size of the value is not known.
+    """
+    if isinstance(value, (_matrix._kaldi_matrix.MatrixBase,
+                          _matrix._kaldi_matrix.DoubleMatrixBase,
+                          _matrix._kaldi_vector.VectorBase,
+                          _matrix._kaldi_vector.DoubleVectorBase)):
+        return value.numpy().nbytes
+    if isinstance(value, _np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bool, int, float)):
+        return _sys.getsizeof(value)
+    raise TypeError("Size of {} values is not known."
+                    .format(type(value).__name__))
+
+
+def _new_cache(reader, cache_size, cache_items):
+    """Returns a new cache for the reader or None if caching is disabled.
+
+    Raises:
+        ValueError: If **cache_size** is provided for a reader whose values
+            have unknown sizes.
+    """
+    if cache_size is None and cache_items is None:
+        return None
+    if cache_size is not None and not reader._sized_values:
+        raise ValueError("Sizes of {} values are not known. Use cache_items "
+                         "to limit the number of cached values instead of "
+                         "cache_size.".format(type(reader).__name__))
+    return _LruCache(cache_size, cache_items)
+
+
+class _LruCache(object):
+    """Least recently used cache of table values.
+
+    The cache is bounded by the total size of the values in bytes, by the
+    number of values, or both.
+    """
+    def __init__(self, max_size=None, max_items=None):
+        self.max_size = max_size
+        self.max_items = max_items
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._entries = _collections.OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        try:
+            value, nbytes = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return _MISSING
+        self._entries[key] = value, nbytes
+        self.hits += 1
+        return value
+
+    def _full(self):
+        return ((self.max_size is not None and self.size > self.max_size) or
+                (self.max_items is not None and
+                 len(self._entries) > self.max_items))
+
+    def put(self, key, value):
+        if self.max_size is not None:
+            nbytes = _value_nbytes(value)
+            if nbytes > self.max_size:
+                return
+        else:
+            nbytes = 0
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        self._entries[key] = value, nbytes
+        self.size += nbytes
+        while self._full():
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def info(self):
+        return _CacheInfo(self.hits, self.misses, self.evictions,
+                          self.size, self.max_size, len(self._entries),
+                          self.max_items)
+
+
+def _script_locations(rxfilename):
+    """Maps the keys of a script file to `(filename, offset)` pairs.
+
+    Only regular script files are read. An empty dict is returned for other
+    inputs, e.g. pipes, which cannot be read again without running the
+    command again.
+    """
+    locations = {}
+    if classify_rxfilename(rxfilename) != InputType.FILE_INPUT:
+        return locations
+    ok, script = read_script_file(rxfilename, False)
+    if not ok:
+        return locations
+    for key, location in script:
+        filename, _, offset = location.rpartition(":")
+        if filename and offset.isdigit():
+            locations[key] = (filename, int(offset))
+        else:
+            locations[key] = (location, 0)
+    return locations
+
+
+def _open_indexed(rspecifier, open_table):
+    """Opens an unsorted binary archive through a temporary script file.
+
+    Kaldi readers keep every value read from an unsorted archive in memory.
+    Reading the archive through an index avoids this.
+
+    Args:
+        rspecifier (str): Kaldi rspecifier for reading the table.
+        open_table (callable): Opens the table given an rspecifier and
+            returns True if the table is opened successfully.
+
+    Returns:
+        A tuple `(ok, script_rspecifier, rxfilename, entries)`, where `ok` is
+        the return value of **open_table** and `entries` are the `(key,
+        offset)` pairs of the archive, or None if the table is not an unsorted
+        binary archive file.
+    """
+    rspecifier_type, rxfilename, opts = classify_rspecifier(rspecifier)
+    if (rspecifier_type != RspecifierType.ARCHIVE_SPECIFIER
+            or opts.sorted or opts.once or not _os.path.isfile(rxfilename)):
+        return None
+    fd, script = _tempfile.mkstemp(suffix=".scp")
+    _os.close(fd)
+    try:
+        try:
+            entries = index_archive(rxfilename, script)
+        except ValueError:
+            return None
+        options = ["scp" if option.strip() == "ark" else option
+                   for option in rspecifier.split(":", 1)[0].split(",")]
+        script_rspecifier = "{}:{}".format(",".join(options), script)
+        # Script files are read into memory when the table is opened.
+        ok = open_table(script_rspecifier)
+        return ok, script_rspecifier, rxfilename, entries
+    finally:
+        _os.remove(script)
+
+
+def _batch_lookup(lookup_many, wrapper=None):
+    """Returns a batch lookup method for a random access reader class.
+
+    Args:
+        lookup_many (callable): Returns the values associated with a list of
+            keys given a reader, None for keys that are not in the table.
+        wrapper (callable): Applied to the values found, if provided.
+    """
+    if wrapper is None:
+        return staticmethod(lookup_many)
+    def lookup(reader, keys):
+        return [None if value is None else wrapper(value)
+                for value in lookup_many(reader, keys)]
+    return staticmethod(lookup)
+
+
+def _get_many(reader, keys, indices):
+    """Looks up the keys of a random access reader in the given order.
+
+    Values not found in the reader cache are looked up in a single call if
+    the reader supports batch lookups and one at a time otherwise.
+
+    Args:
+        reader: The random access reader.
+        keys (List[str]): The keys.
+        indices (List[int]): The indices of the keys in the order of lookup.
+
+    Returns:
+        list: The values associated with the keys, in the order of the keys.
+        None for keys that are not in the table.
+    """
+    values = [None] * len(keys)
+    if reader._lookup_many is None:
+        lookup = reader._lookup
+        for i in indices:
+            value = lookup(keys[i])
+            if value is not _MISSING:
+                values[i] = value
+        return values
+    cache = reader._cache
+    if cache is not None:
+        misses = []
+        for i in indices:
+            value = cache.get(keys[i])
+            if value is _MISSING:
+                misses.append(i)
+            else:
+                values[i] = value
+        indices = misses
+    found = reader._lookup_many(reader, [keys[i] for i in indices])
+    for i, value in zip(indices, found):
+        if value is not None:
+            values[i] = value
+            if cache is not None:
+                cache.put(keys[i], value)
+    return values
+
+
 class _RandomAccessReaderBase(object):
     """Base class defining the Python API for random access table readers."""
-    def __init__(self, rspecifier=""):
+    # Whether the memory footprints of the values are known.
+    _sized_values = False
+    # Looks up a batch of keys in a single call. If None, keys are looked up
+    # one at a time.
+    _lookup_many = None
+
+    def __init__(self, rspecifier="", cache_size=None, cache_items=None):
         """
         This class is used for randomly accessing objects in an archive or
         script file. It implements `__contains__` and `__getitem__` methods to
         provide a dictionary-like interface for accessing table entries. e.g.
         `reader[key]` returns the `value` associated with the `key`.
 
+        If **cache_size** or **cache_items** is provided, values returned by
+        the reader are kept in a least recently used cache holding at most
+        **cache_size** bytes of values and at most **cache_items** values.
+        Sizes are known only for vectors, matrices and scalars, hence
+        **cache_size** is supported only by the readers of these types. Use
+        **cache_items** with other readers. Cached values are shared between
+        lookups and should not be modified. Since Kaldi readers keep every
+        value read from an unsorted archive in memory, a binary archive that
+        is neither sorted nor read once (i.e. opened without the `s` or `o`
+        options) is indexed when the reader is opened and then read through
+        the index like a script file, so that memory use is bounded by the
+        cache size.
+
         Args:
             rspecifier(str): Kaldi rspecifier for reading the table.
                 If provided, the table is opened for reading.
+            cache_size (int): The maximum total size of cached values in
+                bytes. If None, the total size is not limited.
+            cache_items (int): The maximum number of cached values. If None,
+                the number of values is not limited. If both **cache_size**
+                and **cache_items** are None, values are not cached.
 
         Raises:
             IOError: If opening the table for reading fails.
+            ValueError: If **cache_size** is provided but the sizes of the
+                values are not known.
         """
         super(_RandomAccessReaderBase, self).__init__()
+        self._cache = _new_cache(self, cache_size, cache_items)
+        self._rspecifier = rspecifier
+        self._locations = None
         if rspecifier != "":
             if not self.open(rspecifier):
                 raise IOError("Error opening random access table reader with "
@@ -316,13 +905,43 @@ class _RandomAccessReaderBase(object):
         return self
 
     def __contains__(self, key):
+        if self._cache is not None and key in self._cache:
+            return True
         return self.has_key(key)
 
     def __getitem__(self, key):
-        if self.has_key(key):
-            return self.value(key)
-        else:
+        value = self._lookup(key)
+        if value is _MISSING:
             raise KeyError(key)
+        return value
+
+    def _lookup(self, key):
+        cache = self._cache
+        if cache is not None:
+            value = cache.get(key)
+            if value is not _MISSING:
+                return value
+        if not self.has_key(key):
+            return _MISSING
+        value = self.value(key)
+        if cache is not None:
+            cache.put(key, value)
+        return value
+
+    def cache_info(self):
+        """Returns the cache statistics.
+
+        Returns:
+            A named tuple `(hits, misses, evictions, size, max_size,
+            num_items, max_items)`, or None if the reader does not cache
+            values. `hits` and `misses` count the lookups served from the
+            cache and from the table, `evictions` counts the values dropped
+            from the cache, `size` and `max_size` are the current and maximum
+            total sizes of cached values in bytes, and `num_items` and
+            `max_items` are the current and maximum numbers of cached values.
+            Maximums are None if not limited.
+        """
+        return self._cache.info() if self._cache is not None else None
 
     def open(self, rspecifier):
         """Opens the table for reading.
@@ -337,8 +956,58 @@ class _RandomAccessReaderBase(object):
         Raises:
             IOError: If opening the table for reading fails.
         """
+        self._rspecifier = rspecifier
+        self._locations = None
+        if self._cache is not None:
+            self._cache.clear()
+            indexed = _open_indexed(
+                rspecifier, super(_RandomAccessReaderBase, self).open)
+            if indexed is not None:
+                ok, self._rspecifier, rxfilename, entries = indexed
+                self._locations = {key: (rxfilename, offset)
+                                   for key, offset in entries}
+                return ok
         return super(_RandomAccessReaderBase, self).open(rspecifier)
 
+    def _lookup_order(self, keys):
+        """Returns the indices of the keys in the order of lookup."""
+        rspecifier_type, rxfilename, opts = classify_rspecifier(
+            self._rspecifier)
+        indices = list(range(len(keys)))
+        if opts.called_sorted or (
+                opts.sorted and
+                rspecifier_type == RspecifierType.ARCHIVE_SPECIFIER):
+            indices.sort(key=keys.__getitem__)
+        elif rspecifier_type == RspecifierType.SCRIPT_SPECIFIER:
+            if self._locations is None:
+                self._locations = _script_locations(rxfilename)
+            locations = self._locations
+            if locations:
+                indices.sort(key=lambda i: locations.get(keys[i], ("", -1)))
+        return indices
+
+    def get_many(self, keys):
+        """Returns the values associated with a batch of keys.
+
+        Keys are looked up in the order their values are stored in the table,
+        i.e. in the order of archive offsets for script files and in sorted
+        order for sorted archives, so that values are read sequentially.
+        Script files are parsed for this purpose once, on the first call.
+        Script files read from pipes or the standard input are not parsed
+        again and keys are looked up in the given order.
+        Vectors, matrices and scalars not found in the cache are read in a
+        single call to the underlying reader.
+
+        Args:
+            keys (List[str]): The keys.
+
+        Returns:
+            list: The values associated with the keys, in the order of the
+            keys. None for keys that are not in the table.
+        """
+        keys = list(keys)
+        return _get_many(self, keys, self._lookup_order(keys))
+
     def has_key(self, key):
         """Checks whether the table has the key.
 
@@ -387,33 +1056,65 @@ class _RandomAccessReaderBase(object):
         Returns:
             True if table is closed successfully, False otherwise.
         """
+        if self._cache is not None:
+            self._cache.clear()
         return super(_RandomAccessReaderBase, self).close()
 
 
-class RandomAccessVectorReader(_RandomAccessReaderBase,
+class _RandomAccessNumpyReaderBase(_RandomAccessReaderBase):
+    """Base class for random access table readers supporting NumPy arrays."""
+    def _value_numpy(self, key):
+        return self.value(key).numpy()
+
+    def numpy(self, key):
+        """Returns the value associated with the key as a NumPy array.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            The value associated with the key.
+
+        Raises:
+            KeyError: If the table does not have the key.
+        """
+        if not self.has_key(key):
+            raise KeyError(key)
+        return self._value_numpy(key)
+
+
+class RandomAccessVectorReader(_RandomAccessNumpyReaderBase,
                                _kaldi_table.RandomAccessVectorReader):
     """Random access table reader for single precision vectors."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_vectors,
+                                 _matrix._vector_wrapper)
 
 
 class RandomAccessDoubleVectorReader(
-        _RandomAccessReaderBase,
+        _RandomAccessNumpyReaderBase,
         _kaldi_table.RandomAccessDoubleVectorReader):
     """Random access table reader for double precision vectors."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_double_vectors,
+                                 _matrix._vector_wrapper)
 
 
-class RandomAccessMatrixReader(_RandomAccessReaderBase,
+class RandomAccessMatrixReader(_RandomAccessNumpyReaderBase,
                                _kaldi_table.RandomAccessMatrixReader):
     """Random access table reader for single precision matrices."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_matrices,
+                                 _matrix._matrix_wrapper)
 
 
 class RandomAccessDoubleMatrixReader(
-        _RandomAccessReaderBase,
+        _RandomAccessNumpyReaderBase,
         _kaldi_table.RandomAccessDoubleMatrixReader):
     """Random access table reader for double precision matrices."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_double_matrices,
+                                 _matrix._matrix_wrapper)
 
 
 class RandomAccessWaveReader(_RandomAccessReaderBase,
@@ -428,10 +1129,17 @@ class RandomAccessWaveInfoReader(_RandomAccessReaderBase,
     pass
 
 
-class RandomAccessPosteriorReader(_RandomAccessReaderBase,
+class RandomAccessPosteriorReader(_RandomAccessNumpyReaderBase,
                                   _kaldi_table.RandomAccessPosteriorReader):
-    """Random access table reader for frame posteriors."""
-    pass
+    """Random access table reader for frame posteriors.
+
+    NumPy values are `(offsets, pairs)` tuples as returned by
+    :class:`SequentialPosteriorReader`.
+    """
+    def _value_numpy(self, key):
+        offsets, pairs = _kaldi_table_numpy_ext.posterior_bytes(self, key)
+        return (_np.frombuffer(offsets, dtype=_np.int32),
+                _np.frombuffer(pairs, dtype=_POSTERIOR_DTYPE))
 
 
 class RandomAccessGaussPostReader(_RandomAccessReaderBase,
@@ -487,31 +1195,40 @@ class RandomAccessNnetChainExampleReader(
 class RandomAccessIntReader(_RandomAccessReaderBase,
                             _kaldi_table.RandomAccessIntReader):
     """Random access table reader for integers."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_ints)
 
 
 class RandomAccessFloatReader(_RandomAccessReaderBase,
                               _kaldi_table.RandomAccessFloatReader):
     """Random access table reader for single precision floats."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_floats)
 
 
 class RandomAccessDoubleReader(_RandomAccessReaderBase,
                                _kaldi_table.RandomAccessDoubleReader):
     """Random access table reader for double precision floats."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_doubles)
 
 
 class RandomAccessBoolReader(_RandomAccessReaderBase,
                              _kaldi_table.RandomAccessBoolReader):
     """Random access table reader for Booleans."""
-    pass
+    _sized_values = True
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_bools)
 
 
-class RandomAccessIntVectorReader(_RandomAccessReaderBase,
+class RandomAccessIntVectorReader(_RandomAccessNumpyReaderBase,
                                   _kaldi_table.RandomAccessIntVectorReader):
-    """Random access table reader for integer sequences."""
-    pass
+    """Random access table reader for integer sequences.
+
+    NumPy values are read-only int32 arrays.
+    """
+    def _value_numpy(self, key):
+        return _np.frombuffer(
+            _kaldi_table_numpy_ext.int_vector_bytes(self, key), dtype=_np.int32)
 
 
 class RandomAccessIntVectorVectorReader(
@@ -522,19 +1239,32 @@ class RandomAccessIntVectorVectorReader(
 
 
 class RandomAccessIntPairVectorReader(
-        _RandomAccessReaderBase,
+        _RandomAccessNumpyReaderBase,
         _kaldi_table.RandomAccessIntPairVectorReader):
-    """Random access table reader for sequences of integer pairs."""
-    pass
+    """Random access table reader for sequences of integer pairs.
+
+    NumPy values are read-only structured arrays with int32 fields `first`
+    and `second`.
+    """
+    def _value_numpy(self, key):
+        return _np.frombuffer(
+            _kaldi_table_numpy_ext.int_pair_vector_bytes(self, key),
+            dtype=_INT_PAIR_DTYPE)
 
 
 class RandomAccessFloatPairVectorReader(
-        _RandomAccessReaderBase,
+        _RandomAccessNumpyReaderBase,
         _kaldi_table.RandomAccessFloatPairVectorReader):
     """
     Random access table reader for sequences of single precision float pairs.
+
+    NumPy values are read-only structured arrays with float32 fields `first`
+    and `second`.
     """
-    pass
+    def _value_numpy(self, key):
+        return _np.frombuffer(
+            _kaldi_table_numpy_ext.float_pair_vector_bytes(self, key),
+            dtype=_FLOAT_PAIR_DTYPE)
 
 ################################################################################
 # Mapped Random Access Readers
@@ -544,7 +1274,14 @@ class _RandomAccessReaderMappedBase(object):
     """
     Base class defining the Python API for mapped random access table readers.
     """
-    def __init__(self, table_rspecifier="", map_rspecifier=""):
+    # Whether the memory footprints of the values are known.
+    _sized_values = True
+    # Looks up a batch of keys in a single call. If None, keys are looked up
+    # one at a time.
+    _lookup_many = None
+
+    def __init__(self, table_rspecifier="", map_rspecifier="",
+                 cache_size=None, cache_items=None):
         """
         This class is used for randomly accessing objects in an archive or
         script file. It implements `__contains__` and `__getitem__` methods to
@@ -554,18 +1291,32 @@ class _RandomAccessReaderMappedBase(object):
         the `value` associated with the key `map[key]`. Otherwise, it works like
         a random access table reader.
 
+        If **cache_size** or **cache_items** is provided, values returned by
+        the reader are kept in a least recently used cache holding at most
+        **cache_size** bytes of values and at most **cache_items** values.
+        Values are cached by the keys used for querying the reader. Cached
+        values are shared between lookups and should not be modified. As with
+        the other random access readers, an unsorted binary archive table is
+        read through an index so that its values are not kept in memory.
+
         Args:
             table_rspecifier(str): Kaldi rspecifier for reading the table.
                 If provided, the table is opened for reading.
             map_rspecifier (str): Kaldi rspecifier for reading the map.
                 If provided, the map is opened for reading.
+            cache_size (int): The maximum total size of cached values in
+                bytes. If None, the total size is not limited.
+            cache_items (int): The maximum number of cached values. If None,
+                the number of values is not limited. If both **cache_size**
+                and **cache_items** are None, values are not cached.
 
         Raises:
             IOError: If opening the table or map for reading fails.
         """
         super(_RandomAccessReaderMappedBase, self).__init__()
+        self._cache = _new_cache(self, cache_size, cache_items)
         if table_rspecifier != "" and map_rspecifier != "":
-            if not self.Open(table_rspecifier, map_rspecifier):
+            if not self.open(table_rspecifier, map_rspecifier):
                 raise IOError("Error opening mapped random access table reader "
                               "with table_rspecifier: {}, map_rspecifier: {}"
                               .format(table_rspecifier, map_rspecifier))
@@ -574,13 +1325,43 @@ class _RandomAccessReaderMappedBase(object):
         return self
 
     def __contains__(self, key):
+        if self._cache is not None and key in self._cache:
+            return True
         return self.has_key(key)
 
     def __getitem__(self, key):
-        if self.has_key(key):
-            return self.value(key)
-        else:
+        value = self._lookup(key)
+        if value is _MISSING:
             raise KeyError(key)
+        return value
+
+    def _lookup(self, key):
+        cache = self._cache
+        if cache is not None:
+            value = cache.get(key)
+            if value is not _MISSING:
+                return value
+        if not self.has_key(key):
+            return _MISSING
+        value = self.value(key)
+        if cache is not None:
+            cache.put(key, value)
+        return value
+
+    def cache_info(self):
+        """Returns the cache statistics.
+
+        Returns:
+            A named tuple `(hits, misses, evictions, size, max_size,
+            num_items, max_items)`, or None if the reader does not cache
+            values. `hits` and `misses` count the lookups served from the
+            cache and from the table, `evictions` counts the values dropped
+            from the cache, `size` and `max_size` are the current and maximum
+            total sizes of cached values in bytes, and `num_items` and
+            `max_items` are the current and maximum numbers of cached values.
+            Maximums are None if not limited.
+        """
+        return self._cache.info() if self._cache is not None else None
 
     def open(self, table_rspecifier, map_rspecifier):
         """Opens the table for reading.
@@ -597,8 +1378,28 @@ class _RandomAccessReaderMappedBase(object):
         Raises:
             IOError: If opening the table or map for reading fails.
         """
-        return super(_RandomAccessReaderMappedBase, self).open(table_rspecifier,
-                                                               map_rspecifier)
+        base_open = super(_RandomAccessReaderMappedBase, self).open
+        if self._cache is not None:
+            self._cache.clear()
+            indexed = _open_indexed(
+                table_rspecifier,
+                lambda rspecifier: base_open(rspecifier, map_rspecifier))
+            if indexed is not None:
+                return indexed[0]
+        return base_open(table_rspecifier, map_rspecifier)
+
+    def get_many(self, keys):
+        """Returns the values associated with a batch of keys.
+
+        Args:
+            keys (List[str]): The keys.
+
+        Returns:
+            list: The values associated with the keys, in the order of the
+            keys. None for keys that are not in the table.
+        """
+        keys = list(keys)
+        return _get_many(self, keys, range(len(keys)))
 
     def has_key(self, key):
         """Checks whether the table has the key.
@@ -648,6 +1449,8 @@ class _RandomAccessReaderMappedBase(object):
         Returns:
             True if table is closed successfully, False otherwise.
         """
+        if self._cache is not None:
+            self._cache.clear()
         return super(_RandomAccessReaderMappedBase, self).close()
 
 
@@ -655,35 +1458,432 @@ class RandomAccessVectorReaderMapped(
         _RandomAccessReaderMappedBase,
         _kaldi_table.RandomAccessVectorReaderMapped):
     """Mapped random access table reader for single precision vectors."""
-    pass
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_mapped_vectors,
+                                 _matrix._vector_wrapper)
 
 
 class RandomAccessDoubleVectorReaderMapped(
         _RandomAccessReaderMappedBase,
         _kaldi_table.RandomAccessDoubleVectorReaderMapped):
     """Mapped random access table reader for double precision vectors."""
-    pass
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_mapped_double_vectors,
+                                 _matrix._vector_wrapper)
 
 
 class RandomAccessMatrixReaderMapped(
         _RandomAccessReaderMappedBase,
         _kaldi_table.RandomAccessMatrixReaderMapped):
     """Mapped random access table reader for single precision matrices."""
-    pass
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_mapped_matrices,
+                                 _matrix._matrix_wrapper)
 
 
 class RandomAccessDoubleMatrixReaderMapped(
         _RandomAccessReaderMappedBase,
         _kaldi_table.RandomAccessDoubleMatrixReaderMapped):
     """Mapped random access table reader for double precision matrices."""
-    pass
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_mapped_double_matrices,
+                                 _matrix._matrix_wrapper)
 
 
 class RandomAccessFloatReaderMapped(
         _RandomAccessReaderMappedBase,
         _kaldi_table.RandomAccessFloatReaderMapped):
     """Mapped random access table reader for single precision floats."""
-    pass
+    _lookup_many = _batch_lookup(_kaldi_table_ext.lookup_mapped_floats)
+
+################################################################################
+# Archive Indexing
+################################################################################
+
+_ARRAY_TYPES = {b"FM": ("<f4", 2), b"DM": ("<f8", 2),
+                b"FV": ("<f4", 1), b"DV": ("<f8", 1)}
+
+_COMPRESSED_MATRIX_TOKENS = (b"CM", b"CM2", b"CM3")
+
+_FST_MAGIC = 2125659606
+
+# Sizes of the fixed size weights, keyed by OpenFst arc type.
+_FST_WEIGHT_SIZES = {b"standard": 4, b"log": 4, b"lattice4": 8, b"lattice8": 16}
+
+# Sizes of the lattice weights in compact lattice weights, keyed by arc type.
+_FST_COMPACT_WEIGHT_SIZES = {b"compactlattice44": 8, b"compactlattice84": 16}
+
+
+def _read_token(buf, pos):
+    """Reads a space terminated token from buf starting at pos."""
+    end = buf.find(b" ", pos)
+    if end < 0:
+        raise ValueError("Unexpected end of archive at byte {}.".format(pos))
+    return buf[pos:end], end + 1
+
+
+def _read_int32(buf, pos):
+    """Reads an int32 written by Kaldi's WriteBasicType from buf at pos."""
+    size, value = _struct.unpack_from("<bi", buf, pos)
+    if size not in (4, -4):
+        raise ValueError("Expected a binary int32 at byte {}.".format(pos))
+    return value, pos + 5
+
+
+def _read_array_header(buf, pos):
+    """Parses the header of a binary vector/matrix object starting at pos.
+
+    Returns:
+        A tuple `(token, dtype, shape, begin, end)` where `[begin, end)` is the
+        byte range of the array data.
+    """
+    if buf[pos:pos + 2] != b"\0B":
+        raise ValueError("Object at byte {} is not in binary format."
+                         .format(pos))
+    token, begin = _read_token(buf, pos + 2)
+    if token not in _ARRAY_TYPES:
+        raise ValueError("Object at byte {} is of type {!r}. Only uncompressed "
+                         "vectors and matrices are supported."
+                         .format(pos, token))
+    pos = begin
+    dtype, ndim = _ARRAY_TYPES[token]
+    shape = []
+    for _ in range(ndim):
+        dim, pos = _read_int32(buf, pos)
+        shape.append(dim)
+    size = _np.dtype(dtype).itemsize
+    for dim in shape:
+        size *= dim
+    return token, dtype, tuple(shape), pos, pos + size
+
+
+def _scan_archive(buf, skip_object):
+    """Iterates over the entries of a binary archive.
+
+    Args:
+        buf: The archive contents, e.g. an `mmap.mmap` object.
+        skip_object: A function that takes `(buf, offset)` and returns the
+            byte offset just past the object starting at `offset`.
+
+    Yields:
+        `(key, offset)` pairs, where `offset` is the byte offset of the object
+        associated with `key`, i.e. the offset used in Kaldi script files.
+    """
+    pos, size = 0, len(buf)
+    while True:
+        while pos < size and buf[pos:pos + 1].isspace():
+            pos += 1
+        if pos >= size:
+            return
+        key, pos = _read_token(buf, pos)
+        yield key.decode("utf-8"), pos
+        pos = skip_object(buf, pos)
+
+
+def _skip_compressed_matrix(buf, token, pos):
+    """Skips a compressed matrix whose header starts at pos."""
+    num_rows, num_cols = _struct.unpack_from("<ii", buf, pos + 8)
+    pos += 16
+    if num_rows == 0:
+        return pos
+    if token == b"CM":
+        return pos + num_cols * (8 + num_rows)
+    elif token == b"CM2":
+        return pos + 2 * num_rows * num_cols
+    else:
+        return pos + num_rows * num_cols
+
+
+def _read_fst_string(buf, pos):
+    """Reads a length prefixed string written by OpenFst."""
+    size, = _struct.unpack_from("<i", buf, pos)
+    pos += 4
+    return buf[pos:pos + size], pos + size
+
+
+def _skip_fst(buf, pos):
+    """Skips a binary vector FST whose header starts at pos."""
+    start = pos
+    fst_type, pos = _read_fst_string(buf, pos + 4)
+    arc_type, pos = _read_fst_string(buf, pos)
+    _, flags, _, _, num_states, _ = _struct.unpack_from("<iiQqqq", buf, pos)
+    pos += 40
+    if fst_type != b"vector" or num_states < 0:
+        raise ValueError("FST at byte {} is of type {!r}. Only vector FSTs "
+                         "are supported.".format(start, fst_type))
+    if flags & 0x7:
+        raise ValueError("FST at byte {} has symbol tables or is aligned, "
+                         "which is not supported.".format(start))
+    unpack_from = _struct.unpack_from
+    if arc_type in _FST_WEIGHT_SIZES:
+        weight_size = _FST_WEIGHT_SIZES[arc_type]
+        arc_size = 12 + weight_size
+        for _ in range(num_states):
+            num_arcs, = unpack_from("<q", buf, pos + weight_size)
+            pos += weight_size + 8 + num_arcs * arc_size
+    elif arc_type in _FST_COMPACT_WEIGHT_SIZES:
+        # Compact lattice weights are followed by variable length strings.
+        weight_size = _FST_COMPACT_WEIGHT_SIZES[arc_type]
+        for _ in range(num_states):
+            pos += weight_size
+            pos += 4 + 4 * unpack_from("<i", buf, pos)[0]
+            num_arcs, = unpack_from("<q", buf, pos)
+            pos += 8
+            for _ in range(num_arcs):
+                pos += 8 + weight_size
+                pos += 8 + 4 * unpack_from("<i", buf, pos)[0]
+    else:
+        raise ValueError("FST at byte {} has unsupported arc type {!r}."
+                         .format(start, arc_type))
+    return pos
+
+
+def _skip_object(buf, pos):
+    """Returns the byte offset just past the binary object starting at pos.
+
+    Supported objects are vectors, matrices, compressed matrices and vector
+    FSTs, e.g. lattices and compact lattices. Lattices and compact lattices
+    are written without the binary header, i.e. they start with the FST
+    magic number.
+    """
+    if (len(buf) >= pos + 4 and
+            _struct.unpack_from("<i", buf, pos)[0] == _FST_MAGIC):
+        return _skip_fst(buf, pos)
+    if buf[pos:pos + 2] != b"\0B":
+        raise ValueError("Object at byte {} is not in binary format."
+                         .format(pos))
+    if (len(buf) >= pos + 6 and
+            _struct.unpack_from("<i", buf, pos + 2)[0] == _FST_MAGIC):
+        return _skip_fst(buf, pos + 2)
+    token, begin = _read_token(buf, pos + 2)
+    if token in _ARRAY_TYPES:
+        return _read_array_header(buf, pos)[4]
+    if token in _COMPRESSED_MATRIX_TOKENS:
+        return _skip_compressed_matrix(buf, token, begin)
+    raise ValueError("Object at byte {} is of unsupported type {!r}."
+                     .format(pos, token))
+
+
+def _read_index(filename, archive):
+    """Reads a `key path:offset` script file into a dict of offsets.
+
+    Raises:
+        ValueError: If an entry is invalid or if its path does not resolve to
+            **archive**.
+    """
+    index = {}
+    paths = set()
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            key, location = line.split(None, 1)
+            path, _, offset = location.rpartition(":")
+            if not path or not offset.isdigit():
+                raise ValueError("Invalid index entry: {!r}".format(line))
+            if path not in paths:
+                try:
+                    same_file = _os.path.samefile(path, archive)
+                except OSError:
+                    same_file = False
+                if not same_file:
+                    raise ValueError("Index entry {!r} does not refer to "
+                                     "archive {}.".format(line, archive))
+                paths.add(path)
+            index[key] = int(offset)
+    return index
+
+
+def _write_index(filename, path, entries):
+    """Writes `(key, offset)` pairs as a `key path:offset` script file."""
+    with open(filename, "w") as f:
+        for key, offset in entries:
+            f.write("{} {}:{}\n".format(key, path, offset))
+
+
+def index_archive(filename, script_filename=None):
+    """Indexes a binary archive.
+
+    The archive is scanned by parsing the object headers and skipping the
+    object payloads, i.e. without reading the objects themselves. Supported
+    archives are archives of vectors, matrices, compressed matrices, lattices
+    and compact lattices.
+
+    If **script_filename** is provided, the index is written to a Kaldi script
+    file with lines of the form `key filename:offset`. This script file can be
+    used with any random access table reader, e.g.
+    `RandomAccessMatrixReader("scp:" + script_filename)`.
+
+    Args:
+        filename (str): The name of the binary archive file.
+        script_filename (str): The name of the script file to write.
+
+    Returns:
+        List[Tuple[str,int]]: The `(key, offset)` pairs, where `offset` is the
+        byte offset of the object associated with `key`.
+
+    Raises:
+        IOError: If opening the archive or script file fails.
+        ValueError: If the archive is not a binary archive of the supported
+            object types.
+    """
+    with open(filename, "rb") as f:
+        if _os.fstat(f.fileno()).st_size > 0:
+            buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            try:
+                entries = list(_scan_archive(buf, _skip_object))
+            finally:
+                buf.close()
+        else:
+            entries = []
+    if script_filename is not None:
+        _write_index(script_filename, filename, entries)
+    return entries
+
+
+################################################################################
+# Memory-Mapped Readers
+################################################################################
+
+
+class _MemoryMappedReaderBase(object):
+    """Base class for memory-mapped random access archive readers."""
+    _ndim = None
+
+    def __init__(self, filename, index_filename=None, write_index=True):
+        """
+        This class provides random access to the objects in a binary archive
+        by memory-mapping the archive file. It implements `__contains__` and
+        `__getitem__` methods to provide a dictionary-like interface for
+        accessing archive entries, e.g. `reader[key]` returns a read-only NumPy
+        array which is a view into the memory-mapped archive. No data is read
+        from disk until the array is accessed.
+
+        Entries are located using an index mapping keys to byte offsets in the
+        archive. The index is stored as a Kaldi script file, i.e. with lines of
+        the form `key filename:offset`, hence script files generated with an
+        `ark,scp:` wspecifier can be used as index files. If the index file does
+        not exist, or is older than the archive, the index is built by
+        scanning the archive headers and, if **write_index** is True, written
+        to the index file for later use.
+
+        Args:
+            filename (str): The name of the binary archive file.
+            index_filename (str): The name of the index file. If None,
+                defaults to `filename + ".idx"`.
+            write_index (bool): Whether to write the index file after
+                building the index.
+
+        Raises:
+            IOError: If opening the archive fails.
+            ValueError: If the archive is not a binary archive of the
+                supported object types or if the index file refers to another
+                archive.
+        """
+        if index_filename is None:
+            index_filename = filename + ".idx"
+        self._filename = filename
+        self._index_filename = index_filename
+        with open(filename, "rb") as f:
+            if _os.fstat(f.fileno()).st_size > 0:
+                self._buf = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            else:
+                self._buf = b""
+        try:
+            if (_os.path.exists(index_filename) and
+                    _os.path.getmtime(index_filename) >=
+                    _os.path.getmtime(filename)):
+                self._index = _read_index(index_filename, filename)
+            else:
+                self._index = self._build_index(write_index)
+        except:
+            self.close()
+            raise
+
+    def _build_index(self, write_index):
+        entries = list(_scan_archive(self._buf, _skip_object))
+        if write_index:
+            try:
+                _write_index(self._index_filename, self._filename, entries)
+            except (IOError, OSError):
+                pass
+        return dict(entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        if not self.is_open():
+            raise RuntimeError("Reader is not open.")
+        try:
+            offset = self._index[key]
+        except KeyError:
+            raise KeyError(key)
+        _, dtype, shape, begin, end = _read_array_header(self._buf, offset)
+        if len(shape) != self._ndim:
+            raise ValueError("Object associated with key {} has {} "
+                             "dimension(s), expected {}."
+                             .format(key, len(shape), self._ndim))
+        if begin == end:
+            return _np.zeros(shape, dtype=dtype)
+        return _np.frombuffer(self._buf, dtype=dtype, count=(end - begin) //
+                              _np.dtype(dtype).itemsize,
+                              offset=begin).reshape(shape)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def get_many(self, keys):
+        """Returns the values associated with a batch of keys.
+
+        Args:
+            keys (List[str]): The keys.
+
+        Returns:
+            list: The values associated with the keys, in the order of the
+            keys. None for keys that are not in the archive.
+        """
+        return [self[key] if key in self._index else None for key in keys]
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        """Returns the list of keys in the archive."""
+        return list(self._index)
+
+    def is_open(self):
+        """Indicates whether the reader is open or not.
+
+        Returns:
+          True if the reader is open, False otherwise.
+        """
+        return self._buf is not None
+
+    def close(self):
+        """Closes the reader.
+
+        The archive is unmapped once all arrays returned by the reader are
+        garbage collected.
+
+        Returns:
+            True.
+        """
+        self._buf = None
+        return True
+
+
+class MemoryMappedVectorReader(_MemoryMappedReaderBase):
+    """Memory-mapped random access reader for binary vector archives."""
+    _ndim = 1
+
+
+class MemoryMappedMatrixReader(_MemoryMappedReaderBase):
+    """Memory-mapped random access reader for binary matrix archives."""
+    _ndim = 2
 
 ################################################################################
 # Writers
@@ -780,13 +1980,21 @@ class VectorWriter(_WriterBase, _kaldi_table.VectorWriter):
         This method is provided for compatibility with the C++ API only;
         most users should use the Pythonic API.
 
-        Overrides write to accept both Vector and SubVector.
+        Overrides write to accept Vector, SubVector and any other vector like
+        object, e.g. a NumPy array. Vectors, vector views and C-contiguous
+        NumPy arrays of the matching data type are written without copying
+        their contents. Other values are converted to Vector.
 
         Args:
             key (str): The key.
             value: The value.
         """
-        super(VectorWriter, self).write(key, _matrix.Vector(value))
+        if isinstance(value, _np.ndarray):
+            value = _np.ascontiguousarray(value, dtype=_np.float32)
+            value = _matrix.SubVector(value)
+        elif not isinstance(value, _matrix._kaldi_vector.VectorBase):
+            value = _matrix.Vector(value)
+        _kaldi_table_numpy_ext.write_vector_base(self, key, value)
 
 
 class DoubleVectorWriter(_WriterBase, _kaldi_table.DoubleVectorWriter):
@@ -797,13 +2005,22 @@ class DoubleVectorWriter(_WriterBase, _kaldi_table.DoubleVectorWriter):
         This method is provided for compatibility with the C++ API only;
         most users should use the Pythonic API.
 
-        Overrides write to accept both DoubleVector and DoubleSubVector.
+        Overrides write to accept DoubleVector, DoubleSubVector and any other
+        vector like object, e.g. a NumPy array. Vectors, vector views and
+        C-contiguous NumPy arrays of the matching data type are written
+        without copying their contents. Other values are converted to
+        DoubleVector.
 
         Args:
             key (str): The key.
             value: The value.
         """
-        super(DoubleVectorWriter, self).write(key, _matrix.DoubleVector(value))
+        if isinstance(value, _np.ndarray):
+            value = _np.ascontiguousarray(value, dtype=_np.float64)
+            value = _matrix.DoubleSubVector(value)
+        elif not isinstance(value, _matrix._kaldi_vector.DoubleVectorBase):
+            value = _matrix.DoubleVector(value)
+        _kaldi_table_numpy_ext.write_double_vector_base(self, key, value)
 
 
 class MatrixWriter(_WriterBase, _kaldi_table.MatrixWriter):
@@ -814,13 +2031,26 @@ class MatrixWriter(_WriterBase, _kaldi_table.MatrixWriter):
         This method is provided for compatibility with the C++ API only;
         most users should use the Pythonic API.
 
-        Overrides write to accept both Matrix and SubMatrix.
+        Overrides write to accept Matrix, SubMatrix and any other matrix like
+        object, e.g. a NumPy array. Matrices, matrix views and C-contiguous
+        NumPy arrays of the matching data type are written without copying
+        their contents. Other values are converted to Matrix.
 
         Args:
             key (str): The key.
             value: The value.
         """
-        super(MatrixWriter, self).write(key, _matrix.Matrix(value))
+        if isinstance(value, _np.ndarray):
+            value = _np.ascontiguousarray(value, dtype=_np.float32)
+            value = _matrix.SubMatrix(value)
+        elif not isinstance(value, _matrix._kaldi_matrix.MatrixBase):
+            value = _matrix.Matrix(value)
+        _kaldi_table_numpy_ext.write_matrix_base(self, key, value)
+
+
+class CompressedMatrixWriter(_WriterBase, _kaldi_table.CompressedMatrixWriter):
+    """Table writer for compressed matrices."""
+    pass
 
 
 class DoubleMatrixWriter(_WriterBase, _kaldi_table.DoubleMatrixWriter):
@@ -831,13 +2061,22 @@ class DoubleMatrixWriter(_WriterBase, _kaldi_table.DoubleMatrixWriter):
         This method is provided for compatibility with the C++ API only;
         most users should use the Pythonic API.
 
-        Overrides write to accept both DoubleMatrix and DoubleSubMatrix.
+        Overrides write to accept DoubleMatrix, DoubleSubMatrix and any other
+        matrix like object, e.g. a NumPy array. Matrices, matrix views and
+        C-contiguous NumPy arrays of the matching data type are written
+        without copying their contents. Other values are converted to
+        DoubleMatrix.
 
         Args:
             key (str): The key.
             value: The value.
         """
-        super(DoubleMatrixWriter, self).write(key, _matrix.DoubleMatrix(value))
+        if isinstance(value, _np.ndarray):
+            value = _np.ascontiguousarray(value, dtype=_np.float64)
+            value = _matrix.DoubleSubMatrix(value)
+        elif not isinstance(value, _matrix._kaldi_matrix.DoubleMatrixBase):
+            value = _matrix.DoubleMatrix(value)
+        _kaldi_table_numpy_ext.write_double_matrix_base(self, key, value)
 
 
 class WaveWriter(_WriterBase, _kaldi_table.WaveWriter):
@@ -847,7 +2086,32 @@ class WaveWriter(_WriterBase, _kaldi_table.WaveWriter):
 
 class PosteriorWriter(_WriterBase, _kaldi_table.PosteriorWriter):
     """Table writer for frame posteriors."""
-    pass
+    def write(self, key, value):
+        """Writes the `(key, value)` pair to the table.
+
+        This method is provided for compatibility with the C++ API only;
+        most users should use the Pythonic API.
+
+        Overrides write to accept `(offsets, pairs)` tuples of NumPy
+        arrays, where `pairs` holds the `(id, weight)` pairs of all frames
+        and `pairs[offsets[t]:offsets[t+1]]` are the posteriors for frame `t`.
+        `offsets` should be a 1-D integer array. `pairs` can be a structured
+        array or an `N x 2` array. Any other value, e.g. a sequence of frames
+        where each frame is a sequence of `(id, weight)` pairs, is written as
+        a posterior.
+
+        Args:
+            key (str): The key.
+            value: The value.
+        """
+        if _is_posterior_arrays(value):
+            offsets, pairs = value
+            offsets = _np.ascontiguousarray(offsets, dtype=_np.int32)
+            _kaldi_table_numpy_ext.write_posterior_bytes(
+                self, key, offsets.tobytes(),
+                _pairs_to_bytes(pairs, _POSTERIOR_DTYPE))
+        else:
+            super(PosteriorWriter, self).write(key, value)
 
 
 class GaussPostWriter(_WriterBase, _kaldi_table.GaussPostWriter):
@@ -917,7 +2181,24 @@ class BoolWriter(_WriterBase, _kaldi_table.BoolWriter):
 
 class IntVectorWriter(_WriterBase, _kaldi_table.IntVectorWriter):
     """Table writer for integer sequences."""
-    pass
+    def write(self, key, value):
+        """Writes the `(key, value)` pair to the table.
+
+        This method is provided for compatibility with the C++ API only;
+        most users should use the Pythonic API.
+
+        Overrides write to accept integer sequences given as NumPy
+        arrays. Arrays are converted to int32.
+
+        Args:
+            key (str): The key.
+            value: The value.
+        """
+        if isinstance(value, _np.ndarray):
+            data = _np.ascontiguousarray(value, dtype=_np.int32).tobytes()
+            _kaldi_table_numpy_ext.write_int_vector_bytes(self, key, data)
+        else:
+            super(IntVectorWriter, self).write(key, value)
 
 
 class IntVectorVectorWriter(_WriterBase, _kaldi_table.IntVectorVectorWriter):
@@ -927,12 +2208,246 @@ class IntVectorVectorWriter(_WriterBase, _kaldi_table.IntVectorVectorWriter):
 
 class IntPairVectorWriter(_WriterBase, _kaldi_table.IntPairVectorWriter):
     """Table writer for sequences of integer pairs."""
-    pass
+    def write(self, key, value):
+        """Writes the `(key, value)` pair to the table.
+
+        This method is provided for compatibility with the C++ API only;
+        most users should use the Pythonic API.
+
+        Overrides write to accept NumPy arrays, either structured
+        arrays with two fields or `N x 2` arrays.
+
+        Args:
+            key (str): The key.
+            value: The value.
+        """
+        if isinstance(value, _np.ndarray):
+            _kaldi_table_numpy_ext.write_int_pair_vector_bytes(
+                self, key, _pairs_to_bytes(value, _INT_PAIR_DTYPE))
+        else:
+            super(IntPairVectorWriter, self).write(key, value)
 
 
 class FloatPairVectorWriter(_WriterBase, _kaldi_table.FloatPairVectorWriter):
     """Table writer for sequences of single precision float pairs."""
-    pass
+    def write(self, key, value):
+        """Writes the `(key, value)` pair to the table.
+
+        This method is provided for compatibility with the C++ API only;
+        most users should use the Pythonic API.
+
+        Overrides write to accept NumPy arrays, either structured
+        arrays with two fields or `N x 2` arrays.
+
+        Args:
+            key (str): The key.
+            value: The value.
+        """
+        if isinstance(value, _np.ndarray):
+            _kaldi_table_numpy_ext.write_float_pair_vector_bytes(
+                self, key, _pairs_to_bytes(value, _FLOAT_PAIR_DTYPE))
+        else:
+            super(FloatPairVectorWriter, self).write(key, value)
+
+################################################################################
+# Sharded Writers
+################################################################################
+
+def _fsync_file(filename):
+    """Flushes a file that is already closed to disk."""
+    with open(filename, "r+b") as f:
+        _os.fsync(f.fileno())
+
+
+class ShardedMatrixWriter(object):
+    """Table writer distributing single precision matrices over archives."""
+    def __init__(self, archive_pattern, num_shards, script_filename=None,
+                 compress=False, compression_method=None, fsync=False,
+                 queue_size=16, script_pattern=None):
+        """
+        This class writes matrices to **num_shards** archives in parallel. It
+        implements the `__setitem__` method to provide a dictionary-like
+        interface for writing table entries, e.g. `writer[key] = value` writes
+        the pair `(key, value)` to one of the archives.
+
+        Entries are assigned to the archives in a round-robin fashion. Each
+        archive is written, and if **compress** is True each matrix is
+        compressed, by a dedicated worker thread. Next to each archive, a
+        script file is written. By default, its name is the name of the
+        archive followed by `.scp`. When the writer is closed, these are
+        combined into a script file with entries in the order they were
+        written.
+
+        Values are written asynchronously. A value passed to the writer should
+        not be modified afterwards. Values that are not `Matrix` instances,
+        e.g. `SubMatrix` instances or NumPy arrays, are copied.
+
+        Args:
+            archive_pattern (str): The pattern for archive file names, e.g.
+                `"feats.{}.ark"`. It is formatted with the shard index.
+            num_shards (int): The number of archives.
+            script_filename (str): The name of the combined script file. If
+                None, no combined script file is written.
+            compress (bool): Whether to write compressed matrices.
+            compression_method (CompressionMethod): The compression method.
+                If None, defaults to `CompressionMethod.AUTO`.
+            fsync (bool): Whether to flush the archives and script files to
+                disk when the writer is closed.
+            queue_size (int): The maximum number of pending entries per
+                archive.
+            script_pattern (str): The pattern for the names of the script
+                files written next to the archives, e.g. `"feats.{}.scp"`. It
+                is formatted with the shard index. If None, the script file
+                names are the archive file names followed by `.scp`.
+
+        Raises:
+            ValueError: If **num_shards** is not positive or if the archive
+                and script file names are not unique.
+            IOError: If opening an archive for writing fails.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards should be positive.")
+        if compression_method is None:
+            compression_method = _compressed.CompressionMethod.AUTO
+        self._compress = compress
+        self._compression_method = compression_method
+        self._fsync = fsync
+        self._script_filename = script_filename
+        self._archives = [archive_pattern.format(i) for i in range(num_shards)]
+        if script_pattern is None:
+            self._scripts = [archive + ".scp" for archive in self._archives]
+        else:
+            self._scripts = [script_pattern.format(i)
+                             for i in range(num_shards)]
+        if len(set(self._archives + self._scripts)) < 2 * num_shards:
+            raise ValueError("Archive and script file names should be unique.")
+        self._keys = []
+        self._next_shard = 0
+        self._error = None
+        self._closed = False
+        self._writers, self._queues, self._threads = [], [], []
+        self._closed_ok = [False] * num_shards
+        writer_type = CompressedMatrixWriter if compress else MatrixWriter
+        try:
+            for archive, script in zip(self._archives, self._scripts):
+                self._writers.append(
+                    writer_type("ark,scp:{},{}".format(archive, script)))
+        except:
+            for writer in self._writers:
+                writer.close()
+            raise
+        for shard in range(num_shards):
+            queue = _queue.Queue(queue_size)
+            thread = _threading.Thread(target=self._write_shard,
+                                       args=(shard, queue))
+            thread.daemon = True
+            thread.start()
+            self._queues.append(queue)
+            self._threads.append(thread)
+
+    def _write_shard(self, shard, queue):
+        writer = self._writers[shard]
+        while True:
+            item = queue.get()
+            if item is None:
+                self._close_shard(shard)
+                return
+            if self._error is not None:
+                continue
+            key, value = item
+            try:
+                if self._compress:
+                    value = _compressed.CompressedMatrix(
+                        value, self._compression_method)
+                writer[key] = value
+            except Exception as e:
+                self._error = e
+
+    def _close_shard(self, shard):
+        """Closes the archive and script file of a shard.
+
+        If **fsync** was set, these are flushed to disk here, by the worker
+        thread of the shard, so that shards are flushed in parallel.
+        """
+        try:
+            self._closed_ok[shard] = self._writers[shard].close()
+            if self._fsync:
+                for filename in (self._archives[shard], self._scripts[shard]):
+                    _fsync_file(filename)
+        except Exception as e:
+            self._error = e
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __setitem__(self, key, value):
+        self.write(key, value)
+
+    def write(self, key, value):
+        """Writes the `(key, value)` pair to one of the archives.
+
+        Args:
+            key (str): The key.
+            value: The value.
+
+        Raises:
+            RuntimeError: If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("Writer is closed.")
+        self._check_error()
+        if not isinstance(value, _matrix.Matrix):
+            value = _matrix.Matrix(value)
+        self._queues[self._next_shard].put((key, value))
+        self._next_shard = (self._next_shard + 1) % len(self._queues)
+        self._keys.append(key)
+
+    def is_open(self):
+        """Indicates whether the writer is open or not.
+
+        Returns:
+          True if the writer is open, False otherwise.
+        """
+        return not self._closed
+
+    def close(self):
+        """Finishes writing the archives and writes the combined script file.
+
+        Returns:
+            True if all archives are closed successfully, False otherwise.
+
+        Raises:
+            Exception: Any error raised while writing the entries.
+        """
+        if self._closed:
+            return True
+        self._closed = True
+        for queue in self._queues:
+            queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        ok = all(self._closed_ok)
+        self._check_error()
+        if self._script_filename is not None:
+            locations = {}
+            for script in self._scripts:
+                with open(script) as f:
+                    for line in f:
+                        key, location = line.split(None, 1)
+                        locations[key] = location
+            with open(self._script_filename, "w") as f:
+                for key in self._keys:
+                    f.write("{} {}".format(key, locations[key]))
+            if self._fsync:
+                _fsync_file(self._script_filename)
+        return ok
 
 ################################################################################
 
@@ -0,0 +1,283 @@
+from __future__ import division
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from kaldi.asr import (AsyncBatchRecognizer, NnetBatchLikelihoodComputer,
+                       RecognizerPool, _SharedLock, _get_decoding_output)
+from kaldi.base.io import istringstream
+from kaldi.fstext import LatticeArc, LatticeVectorFst, LatticeWeight
+import kaldi.fstext.utils
+from kaldi.matrix import Matrix
+from kaldi.nnet3 import AmNnetSimple, Nnet
+from kaldi.util.table import MatrixWriter
+
+
+class _EchoRecognizer(object):
+    """Recognizer stub returning the number of rows as the only word."""
+
+    symbols = None
+
+    def decode(self, input):
+        num_rows = input.num_rows
+        if num_rows == 0:
+            raise RuntimeError("Empty feature matrix.")
+        if num_rows == 13:
+            time.sleep(60)
+        return {"words": [num_rows], "likelihood": float(num_rows)}
+
+
+def _echo_recognizer():
+    return _EchoRecognizer()
+
+
+class _EchoBatchRecognizer(object):
+    """Batch recognizer stub returning the number of rows as the only word.
+
+    Inputs with 7 rows fail the recognizer.
+    """
+
+    def __init__(self):
+        self.outputs = []
+
+    def accept_input(self, key, input):
+        if input.num_rows == 0:
+            raise ValueError("Empty feature matrix.")
+        self.outputs.append({"key": key, "words": [input.num_rows]})
+
+    def get_outputs(self):
+        while self.outputs:
+            output = self.outputs.pop(0)
+            if output["words"] == [7]:
+                raise RuntimeError("Batch recognizer failed.")
+            yield output
+
+    def finished(self):
+        pass
+
+
+class _LatticeRecognizer(object):
+    """Recognizer stub recording the decoder and lattice operations used."""
+
+    symbols = None
+    allow_partial = True
+    acoustic_scale = 0.1
+
+    def __init__(self):
+        self.decoder = self
+        self.calls = []
+
+    def reached_final(self):
+        return True
+
+    def _lattice(self):
+        lat = LatticeVectorFst()
+        lat.add_state()
+        lat.add_state()
+        lat.set_start(0)
+        lat.add_arc(0, LatticeArc(1, 2, LatticeWeight(1.0, 2.0), 1))
+        lat.set_final(1, LatticeWeight.one())
+        return lat
+
+    def get_best_path(self):
+        self.calls.append("get_best_path")
+        return self._lattice()
+
+    def get_raw_lattice(self):
+        self.calls.append("get_raw_lattice")
+        return self._lattice()
+
+    def _determinize_lattice(self, lattice):
+        self.calls.append("determinize_lattice")
+        return lattice
+
+
+class TestRecognizerPool(unittest.TestCase):
+
+    def test_decode(self):
+        inputs = [("a", Matrix(3, 2)), ("b", Matrix(0, 0)),
+                  ("c", Matrix(5, 2))]
+        with RecognizerPool(_echo_recognizer, num_workers=2,
+                            max_in_flight=1) as pool:
+            outputs = list(pool.decode(inputs))
+            self.assertEqual(["a", "c"], [key for key, _ in outputs])
+            self.assertEqual([3], outputs[0][1]["words"])
+            self.assertEqual((2, 1), (pool.num_success, pool.num_failed))
+
+    def test_timeout(self):
+        inputs = [("a", Matrix(13, 2))]
+        inputs += [(str(i), Matrix(i + 1, 2)) for i in range(4)]
+        with RecognizerPool(_echo_recognizer, num_workers=1,
+                            timeout=1.0) as pool:
+            start = time.time()
+            outputs = list(pool.decode(inputs))
+            self.assertLess(time.time() - start, 30.0)
+            self.assertEqual(["0", "1", "2", "3"], [k for k, _ in outputs])
+            self.assertEqual((4, 1), (pool.num_success, pool.num_failed))
+
+    def test_decode_table_text_without_symbols(self):
+        tmp = tempfile.mkdtemp()
+        feats = os.path.join(tmp, "feats.ark")
+        text = os.path.join(tmp, "text")
+        with MatrixWriter("ark:" + feats) as writer:
+            writer["a"] = Matrix(np.ones((4, 2), dtype=np.float32))
+        with RecognizerPool(_echo_recognizer, num_workers=1) as pool:
+            self.assertEqual((1, 0), pool.decode_table(
+                "ark:" + feats, text_wxfilename=text))
+        with open(text) as f:
+            self.assertEqual("a 4\n", f.read())
+
+
+class TestAsyncBatchRecognizer(unittest.TestCase):
+
+    def test_decode(self):
+        async def decode(asr):
+            return await asyncio.gather(
+                asr.decode("a", Matrix(3, 2)), asr.decode("b", Matrix(0, 2)),
+                asr.decode("c", Matrix(5, 2)), return_exceptions=True)
+
+        # Constructed outside of a running event loop.
+        with AsyncBatchRecognizer(_EchoBatchRecognizer()) as asr:
+            a, b, c = asyncio.run(decode(asr))
+            self.assertEqual({"key": "a", "words": [3]}, a)
+            self.assertIsInstance(b, ValueError)
+            self.assertEqual({"key": "c", "words": [5]}, c)
+        with self.assertRaises(ValueError):
+            asr.decode("d", Matrix(3, 2))
+
+    def test_decode_outside_event_loop(self):
+        with AsyncBatchRecognizer(_EchoBatchRecognizer()) as asr:
+            with self.assertRaises(RuntimeError):
+                asr.decode("a", Matrix(3, 2))
+
+    def test_recognizer_failure(self):
+        async def decode(asr):
+            first = await asyncio.gather(
+                asr.decode("a", Matrix(3, 2)), asr.decode("b", Matrix(7, 2)),
+                return_exceptions=True)
+            second = await asyncio.gather(asr.decode("c", Matrix(5, 2)),
+                                          return_exceptions=True)
+            return first + second
+
+        with AsyncBatchRecognizer(_EchoBatchRecognizer()) as asr:
+            a, b, c = asyncio.run(asyncio.wait_for(decode(asr), 10.0))
+            self.assertEqual({"key": "a", "words": [3]}, a)
+            self.assertIsInstance(b, RuntimeError)
+            self.assertIs(b, c)
+
+
+class TestNnetBatchLikelihoodComputer(unittest.TestCase):
+
+    def setUp(self):
+        nnet = Nnet()
+        nnet.read_config(istringstream.from_str(
+            "input-node name=input dim=3\n"
+            "output-node name=output input=input\n"))
+        self.acoustic_model = AmNnetSimple.from_nnet(nnet)
+        self.inputs = [(str(i), Matrix(np.full((i + 1, 3), i, np.float32)))
+                       for i in range(5)]
+
+    def _check_outputs(self, outputs):
+        self.assertEqual([key for key, _ in self.inputs],
+                         [key for key, _ in outputs])
+        for (_, feats), (_, loglikes) in zip(self.inputs, outputs):
+            self.assertTrue(np.allclose(feats.numpy(), loglikes.numpy()))
+
+    def test_compute(self):
+        computer = NnetBatchLikelihoodComputer(self.acoustic_model)
+        self._check_outputs(list(computer.compute(self.inputs)))
+        # Destroying the computer without accepting input is fine.
+        del computer
+
+    def test_accept_input(self):
+        with NnetBatchLikelihoodComputer(self.acoustic_model) as computer:
+            self.assertEqual([], list(computer.get_outputs()))
+            for key, feats in self.inputs:
+                computer.accept_input(key, feats)
+            computer.finished()
+            outputs = [(out["key"], out["loglikes"])
+                       for out in computer.get_outputs()]
+            self._check_outputs(outputs)
+            with self.assertRaises(ValueError):
+                computer.accept_input("a", self.inputs[0][1])
+
+    def test_close_without_finished(self):
+        computer = NnetBatchLikelihoodComputer(self.acoustic_model)
+        computer.accept_input("a", self.inputs[0][1])
+        computer.close()
+        computer.close()
+        with self.assertRaises(ValueError):
+            computer.get_output()
+
+
+class TestSharedLock(unittest.TestCase):
+    def testWriterPreference(self):
+        lock = _SharedLock()
+        events = []
+
+        def write():
+            with lock.exclusive():
+                events.append("writer")
+
+        def read():
+            with lock.shared():
+                events.append("reader")
+
+        with lock.shared():
+            writer = threading.Thread(target=write)
+            writer.start()
+            while not lock._waiting_writers:
+                time.sleep(0.001)
+            # New readers wait for the waiting writer.
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            self.assertEqual([], events)
+        writer.join()
+        reader.join()
+        self.assertEqual(["writer", "reader"], events)
+
+
+class TestDecodingOutput(unittest.TestCase):
+    def setUp(self):
+        # Record conversions of the best path to a compact lattice.
+        self.convert = kaldi.fstext.utils.convert_lattice_to_compact_lattice
+
+        def convert(lat):
+            self.recognizer.calls.append("convert_best_path")
+            return self.convert(lat)
+
+        kaldi.fstext.utils.convert_lattice_to_compact_lattice = convert
+        self.recognizer = _LatticeRecognizer()
+
+    def tearDown(self):
+        kaldi.fstext.utils.convert_lattice_to_compact_lattice = self.convert
+
+    def testAllOutputs(self):
+        output = _get_decoding_output(self.recognizer)
+        self.assertSetEqual({"alignment", "best_path", "lattice", "likelihood",
+                             "text", "weight", "words"}, set(output))
+        self.assertEqual("2", output["text"])
+        self.assertEqual([2], output["words"])
+        self.assertListEqual(["get_best_path", "convert_best_path",
+                              "get_raw_lattice", "determinize_lattice"],
+                             self.recognizer.calls)
+
+    def testTextOnly(self):
+        output = _get_decoding_output(self.recognizer, outputs=["text"])
+        self.assertDictEqual({"text": "2"}, output)
+        self.assertListEqual(["get_best_path"], self.recognizer.calls)
+
+    def testUnknownOutput(self):
+        with self.assertRaises(ValueError):
+            _get_decoding_output(self.recognizer, outputs=["text", "lattices"])
+        self.assertListEqual([], self.recognizer.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 from kaldi.base import math as kaldi_math
 from kaldi.matrix import Vector, Matrix
 
-from kaldi.cudamatrix import (CuMatrix, CuVector,
+from kaldi.cudamatrix import (CuMatrix, CuVector, array_view,
                               approx_equal_cu_matrix, same_dim_cu_matrix)
 
 import unittest
@@ -38,6 +38,17 @@ class TestCuMatrix(unittest.TestCase):
         self.assertEqual(2, B.num_rows())
         self.assertEqual(2, B.num_cols())
 
+    def testArrayView(self):
+        A = CuMatrix.from_matrix(Matrix([[2, 3], [5, 7]]))
+        view = array_view(A)
+        if hasattr(view, "__cuda_array_interface__"):
+            self.assertEqual((2, 2), view.__cuda_array_interface__["shape"])
+        else:
+            view[0, 0] = 11.0
+            B = Matrix(2, 2)
+            A.copy_to_mat(B)
+            self.assertEqual(11.0, B[0, 0])
+
     def testResize(self):
         A = CuMatrix()
         A.resize(10, 10)
@@ -2,8 +2,10 @@ from __future__ import division
 import unittest
 import numpy as np
 
+import kaldi.matrix
 from kaldi.matrix import Matrix, SubMatrix, SubVector
 from kaldi.matrix import DoubleMatrix, DoubleSubMatrix, DoubleSubVector
+from kaldi.matrix import from_dlpack
 from kaldi.matrix.packed import SpMatrix, TpMatrix
 
 class _Tests(object):
@@ -127,6 +129,55 @@ class _Tests(object):
         for i in range(len(max0_m)):
             self.assertEqual(max0_m[i], max0_n[i])
 
+        # Test in-place ufuncs mapped to Kaldi operations
+        calls = []
+
+        class CountingMatrix(self.matrix_class):
+            def apply_pow_abs_(self, *args):
+                calls.append("apply_pow_abs_")
+                return super(CountingMatrix, self).apply_pow_abs_(*args)
+
+            def scale_(self, *args):
+                calls.append("scale_")
+                return super(CountingMatrix, self).scale_(*args)
+
+            def add_mat_(self, *args):
+                calls.append("add_mat_")
+                return super(CountingMatrix, self).add_mat_(*args)
+
+        m = CountingMatrix([[1, -2], [3, -4]])
+        self.assertIs(m, np.absolute(m, out=m))
+        self.assertIs(m, np.multiply(m, 2, out=(m,)))
+        self.assertIs(m, np.add(m, m, out=m))
+        self.assertEqual([[4, 8], [12, 16]], m.numpy().tolist())
+        self.assertEqual(["apply_pow_abs_", "scale_", "add_mat_"], calls)
+
+        # Test ufuncs without equivalent Kaldi operations fall back to NumPy
+        del calls[:]
+        self.assertIs(m, np.true_divide(m, 4, out=m))
+        np.add(m, 1, out=m.numpy())
+        self.assertEqual([[2, 3], [4, 5]], m.numpy().tolist())
+        self.assertEqual([], calls)
+        m = self.matrix_class([[1, -1]])
+        with np.errstate(invalid="ignore"):
+            self.assertIs(m, np.log(m, out=m))
+        self.assertEqual(0.0, m[0, 0])
+        self.assertTrue(np.isnan(m[0, 1]))
+
+        # Test NaNs propagate through element-wise maximums and minimums
+        for ufunc in (np.maximum, np.minimum):
+            m = self.matrix_class([[np.nan, 1]])
+            n = self.matrix_class([[0, np.nan]])
+            self.assertIs(m, ufunc(m, n, out=m))
+            self.assertTrue(np.isnan(m.numpy()).all())
+            m = self.matrix_class([[1, 2]])
+            self.assertIs(m, ufunc(m, np.nan, out=m))
+            self.assertTrue(np.isnan(m.numpy()).all())
+
+        # Test double precision results are wrapped without conversion
+        self.assertIsInstance(m.numpy().astype('float64') + m,
+                              DoubleSubMatrix)
+
     def test_range(self):
         m = self.matrix_class()
 
@@ -160,6 +211,92 @@ class _Tests(object):
         self.assertAlmostEqual(21.0, m[:, 0].numpy().prod())
         self.assertAlmostEqual(55.0, m[:, 1].numpy().prod())
 
+    def test_from_pool(self):
+        m = self.matrix_class.from_pool(3, 2, undefined=False)
+        self.assertTupleEqual((3, 2), m.shape)
+        self.assertEqual(0.0, m.numpy().sum())
+        address = m.numpy().ctypes.data
+        del m
+        m = self.matrix_class.from_pool(4, 2)
+        self.assertEqual(address, m.numpy().ctypes.data)
+        m = self.matrix_class.from_pool(0, 0)
+        self.assertIsInstance(m, (SubMatrix, DoubleSubMatrix))
+        self.assertTupleEqual((0, 0), m.shape)
+
+    def test_from_pool_release_with_lock_held(self):
+        # Views may be released by the garbage collector while the pool lock
+        # is held by the same thread.
+        m = self.matrix_class.from_pool(5, 3)
+        address = m.numpy().ctypes.data
+        with kaldi.matrix._pool._lock:
+            del m
+        m = self.matrix_class.from_pool(5, 3)
+        self.assertEqual(address, m.numpy().ctypes.data)
+
+    def test_dlpack(self):
+        if not hasattr(np, "from_dlpack"):
+            self.skipTest("numpy.from_dlpack is not available")
+        m = self.matrix_class([[3, 5], [7, 11]])
+        n = np.from_dlpack(m)
+        self.assertEqual(m.numpy().ctypes.data, n.ctypes.data)
+        s = from_dlpack(n)
+        self.assertIsInstance(s, (SubMatrix, DoubleSubMatrix))
+        self.assertEqual([[3, 5], [7, 11]], s.numpy().tolist())
+        with self.assertRaises(ValueError):
+            from_dlpack(np.zeros((1, 1, 1), dtype=np.float32))
+
+        # Row strided and column sliced data is shared
+        n = np.arange(12, dtype=s.numpy().dtype).reshape((3, 4))
+        for x in [n[:, 1:3], n[::2]]:
+            s = from_dlpack(x)
+            self.assertEqual(x.tolist(), s.numpy().tolist())
+            s[0, 0] = -1
+            self.assertEqual(-1, x[0, 0])
+
+        # Data with non-contiguous rows is copied
+        n = np.arange(12, dtype=n.dtype).reshape((3, 4))
+        x = n.T
+        s = from_dlpack(x)
+        self.assertEqual(x.tolist(), s.numpy().tolist())
+        s[0, 0] = -1
+        self.assertEqual(0, n[0, 0])
+
+    def test_batch_add_mat_mat_(self):
+        A = [self.matrix_class([[1, 2], [3, 4]]),
+             self.matrix_class([[5, 6], [7, 8]])]
+        B = self.matrix_class([[1, 0], [0, 2]])
+        m = self.matrix_class(4, 2)
+        m.batch_add_mat_mat_(A, B)
+        self.assertEqual([[1, 4], [3, 8], [5, 12], [7, 16]],
+                         m.numpy().tolist())
+        m.batch_add_mat_mat_(A, [B, B], beta=0.0)
+        self.assertEqual([[1, 4], [3, 8], [5, 12], [7, 16]],
+                         m.numpy().tolist())
+        with self.assertRaises(RuntimeError):
+            self.matrix_class(3, 2).batch_add_mat_mat_(A, B)
+
+        m.add_vec_to_rows_(-1.0, m[0])
+        self.assertAlmostEqual(0.0, m[0].numpy().sum())
+
+    def test__getitem__views(self):
+        m = self.matrix_class([[3, 5], [7, 11]])
+        r = m[-1]
+        r[0] = 13.0
+        self.assertAlmostEqual(13.0, m[1, 0])
+        s = m[1:, -1:]
+        self.assertTupleEqual((1, 1), s.shape)
+        s[0, 0] = 17.0
+        self.assertAlmostEqual(17.0, m[-1, -1])
+        self.assertAlmostEqual(3.0 * 5.0, m[:1].numpy().prod())
+
+        with self.assertRaises(IndexError):
+            m[-3]
+
+        m[:] = 1.0
+        m.resize_(3, 3)
+        m[:] = 2.0
+        self.assertAlmostEqual(18.0, m.numpy().sum())
+
     def test__setitem__(self):
         m = self.matrix_class()
         with self.assertRaises(IndexError):
@@ -0,0 +1,89 @@
+from __future__ import division
+import unittest
+
+import numpy as np
+
+from kaldi.base.io import istringstream
+from kaldi.matrix import Matrix, Vector
+from kaldi.nnet3 import Nnet
+from kaldi.segmentation import NnetSAD, SegmentationProcessor, _label_runs
+
+
+class TestSegmentationProcessor(unittest.TestCase):
+
+    def test_process_array(self):
+        rng = np.random.RandomState(0)
+        for _ in range(3000):
+            processor = SegmentationProcessor(
+                target_labels=[2, 3],
+                segment_padding=rng.randint(0, 4) * 0.01,
+                min_segment_dur=rng.randint(0, 4) * 0.01,
+                max_merged_segment_dur=rng.choice([0, 0.05, 0.1, 1.0]))
+            alignment = rng.randint(1, 4, size=rng.randint(0, 40)).tolist()
+            segments, stats = processor.process(alignment)
+            arrays, array_stats = processor.process_array(alignment)
+            self.assertEqual(segments,
+                             list(zip(*(a.tolist() for a in arrays))))
+            for name, value in vars(stats).items():
+                self.assertAlmostEqual(value, getattr(array_stats, name))
+
+
+class TestNnetSAD(unittest.TestCase):
+
+    def _make_sad(self, frame_subsampling_factor):
+        # Model output for frame t is the sum of input frames t - 1 and t + 1.
+        nnet = Nnet()
+        nnet.read_config(istringstream.from_str(
+            "input-node name=input dim=3\n"
+            "output-node name=output "
+            "input=Sum(Offset(input, -1), Offset(input, 1))\n"))
+        sad = NnetSAD(nnet, NnetSAD.make_sad_transform(Vector([1, 1, 1])),
+                      NnetSAD.make_sad_graph(
+                          frame_shift=0.01 * frame_subsampling_factor))
+        sad.decodable_opts.frame_subsampling_factor = frame_subsampling_factor
+        return sad
+
+    def _make_feats(self, rng, labels):
+        # Features are halved log-posteriors so that model outputs are
+        # log-posteriors inside each block.
+        post = np.full((3, 3), 0.01)
+        np.fill_diagonal(post, 0.98)
+        feats = [np.repeat(0.5 * np.log(post[[label]]), size, axis=0)
+                 for label, size in labels]
+        feats = np.concatenate(feats).astype(np.float32)
+        return feats + rng.uniform(-0.05, 0.05, feats.shape).astype(np.float32)
+
+    def test_segment_stream(self):
+        rng = np.random.RandomState(0)
+        labels = [(0, 120), (1, 250), (0, 90), (1, 400), (0, 160), (1, 301),
+                  (0, 77)]
+        feats = self._make_feats(rng, labels)
+        for factor in (1, 3):
+            sad = self._make_sad(factor)
+            alignment = sad.segment(Matrix(feats))["alignment"]
+            expected = _label_runs(np.asarray(alignment))
+            bounds = np.cumsum(rng.randint(1, 60, size=len(feats)))
+            chunks = np.split(feats, bounds[bounds < len(feats)])
+            segments = list(sad.segment_stream(chunks, finalize_delay=20))
+            self.assertEqual(expected, segments)
+            self.assertEqual(-(-len(feats) // factor), segments[-1][1])
+
+    def test_segment_stream_max_pending_frames(self):
+        rng = np.random.RandomState(1)
+        feats = self._make_feats(rng, [(0, 50), (1, 700), (0, 50)])
+        sad = self._make_sad(1)
+        chunks = np.split(feats, range(25, len(feats), 25))
+        segments = list(sad.segment_stream(chunks, finalize_delay=20,
+                                           max_pending_frames=200))
+        self.assertEqual(0, segments[0][0])
+        self.assertEqual(len(feats), segments[-1][1])
+        for prev, cur in zip(segments, segments[1:]):
+            self.assertEqual(prev[1], cur[0])
+        # Pending frames are cut once they reach max_pending_frames, which is
+        # checked once per chunk.
+        self.assertGreater(len(segments), 3)
+        self.assertTrue(all(end - beg <= 225 for beg, end, _ in segments))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,6 +72,19 @@ class TestKaldiIO(unittest.TestCase):
                 self.assertEqual(line, lines[i])
         os.remove(filename)
 
+    def test_async_io(self):
+        lines = [b"\t500\t600\n", b"700\td\n"]
+        for filename in ["tmpf", "tmpf.gz"]:
+            with AsyncOutput(filename, max_chunks=1) as ko:
+                ko.writelines(lines)
+            with AsyncInput(filename, chunk_size=4, max_chunks=1) as ki:
+                self.assertTrue(ki.binary)
+                self.assertEqual(ki.readlines(), lines)
+            with AsyncInput(filename, chunk_size=4) as ki:
+                self.assertEqual(ki.read(3), lines[0][:3])
+                self.assertEqual(ki.read(), b"".join(lines)[3:])
+            os.remove(filename)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -115,6 +115,63 @@ class TestSequentialMatrixReader(_TestSequentialReaders, unittest.TestCase, Matr
         else:
             self.fail("shouldn't happen")
 
+    def testNumpy(self):
+        with open(self.filename, 'w') as outpt:
+            self.writeExample(outpt)
+
+        with self.getImpl(self.rspecifier) as reader:
+            for idx, (k, m) in enumerate(reader.numpy()):
+                self.assertIsInstance(m, np.ndarray)
+                self.checkRead(idx, (k, Matrix(m)))
+
+    def testIterPosition(self):
+        with open(self.filename, 'w') as outpt:
+            self.writeExample(outpt)
+
+        # The reader is advanced before an entry is yielded.
+        with self.getImpl(self.rspecifier) as reader:
+            for k, m in reader:
+                break
+            self.assertEqual("one", k)
+            self.assertEqual("two", reader.key())
+            self.assertTrue(np.array_equal([[1.0], [2.0], [3.0]],
+                                           reader.value().numpy()))
+            for k, m in reader.numpy():
+                break
+            self.assertEqual("two", k)
+            self.assertEqual("three", reader.key())
+            self.assertListEqual(["three"], [k for k, _ in reader])
+            self.assertTrue(reader.done())
+
+    def testReadMany(self):
+        with open(self.filename, 'w') as outpt:
+            self.writeExample(outpt)
+
+        with self.getImpl(self.rspecifier) as reader:
+            keys, values = reader.read_many(2, numpy=True)
+            self.assertListEqual(["one", "two"], keys)
+            self.assertTrue(np.array_equal(np.arange(9).reshape((3, 3)),
+                                           values[0]))
+            keys, values = reader.read_many(2)
+            self.assertListEqual(["three"], keys)
+            self.assertEqual(0, values[0].num_rows)
+            self.assertEqual(([], []), reader.read_many(2))
+
+class TestPrefetchingSequentialReader(unittest.TestCase, MatrixExampleMixin):
+    def testIter(self):
+        filename = '/tmp/temp.ark'
+        with open(filename, 'w') as outpt:
+            self.writeExample(outpt)
+
+        reader = kaldi.util.table.SequentialMatrixReader('ark,t:' + filename)
+        with kaldi.util.table.PrefetchingSequentialReader(
+                reader, queue_size=1, num_threads=2,
+                transform=lambda m: m.numpy()) as prefetcher:
+            keys = [k for k, _ in prefetcher]
+        self.assertListEqual(["one", "two", "three"], keys)
+        self.assertFalse(reader.is_open())
+        os.remove(filename)
+
 class TestSequentialWaveReader(_TestSequentialReaders, unittest.TestCase, WaveExampleMixin):
     def checkRead(self, idx, pair):
         k, m = pair
@@ -354,6 +411,297 @@ class TestRandomAccessFloatPairVectorReader(_TestRandomAccessReaders, unittest.T
         with self.assertRaises(KeyError):
             reader['four']
 
+################################################################################################################
+# Memory-Mapped Readers
+################################################################################################################
+class TestMemoryMappedMatrixReader(unittest.TestCase):
+    def setUp(self):
+        self.filename = '/tmp/temp.ark'
+        self.index_filename = '/tmp/temp.ark.idx'
+        for filename in (self.filename, self.index_filename):
+            if os.path.exists(filename):
+                os.remove(filename)
+        with kaldi.util.table.MatrixWriter('ark:' + self.filename) as writer:
+            writer['one'] = Matrix(np.arange(6).reshape((2, 3)))
+            writer['two'] = Matrix()
+
+    def tearDown(self):
+        for filename in (self.filename, self.index_filename):
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def testRead(self):
+        with kaldi.util.table.MemoryMappedMatrixReader(self.filename) as reader:
+            self.assertEqual(2, len(reader))
+            self.assertTrue('one' in reader)
+            self.assertTrue(np.array_equal(np.arange(6).reshape((2, 3)),
+                                           reader['one']))
+            self.assertEqual((0, 0), reader['two'].shape)
+            with self.assertRaises(KeyError):
+                reader['three']
+        self.assertTrue(os.path.exists(self.index_filename))
+
+        # Second reader loads the index file
+        with kaldi.util.table.MemoryMappedMatrixReader(self.filename) as reader:
+            self.assertListEqual(['one', 'two'], sorted(reader.keys()))
+            self.assertTrue(np.array_equal(np.arange(6).reshape((2, 3)),
+                                           reader['one']))
+
+    def testIndexOfAnotherArchive(self):
+        other_filename = '/tmp/temp.other.ark'
+        with kaldi.util.table.MatrixWriter(
+                'ark,scp:{},{}'.format(other_filename,
+                                       self.index_filename)) as writer:
+            writer['one'] = Matrix(np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            kaldi.util.table.MemoryMappedMatrixReader(self.filename)
+        os.remove(other_filename)
+
+class TestIndexArchive(unittest.TestCase):
+    def testIndexArchive(self):
+        filename, script_filename = '/tmp/temp.ark', '/tmp/temp.scp'
+        with kaldi.util.table.MatrixWriter('ark:' + filename) as writer:
+            writer['one'] = Matrix(np.arange(6).reshape((2, 3)))
+            writer['two'] = Matrix(np.ones((1, 4)))
+
+        entries = kaldi.util.table.index_archive(filename, script_filename)
+        self.assertListEqual(['one', 'two'], [key for key, _ in entries])
+
+        rspecifier = 'scp:' + script_filename
+        with kaldi.util.table.RandomAccessMatrixReader(rspecifier) as reader:
+            self.assertTrue(np.array_equal(np.ones((1, 4)),
+                                           reader['two'].numpy()))
+            self.assertTrue(np.array_equal(np.arange(6).reshape((2, 3)),
+                                           reader['one'].numpy()))
+            two, missing, one = reader.get_many(['two', 'three', 'one'])
+            self.assertIsNone(missing)
+            self.assertEqual((1, 4), two.shape)
+            self.assertEqual((2, 3), one.shape)
+
+        os.remove(filename)
+        os.remove(script_filename)
+
+    def testIndexLatticeArchive(self):
+        from kaldi.fstext import (LatticeArc, LatticeVectorFst, LatticeWeight,
+                                  CompactLatticeArc, CompactLatticeVectorFst,
+                                  CompactLatticeWeight)
+        filename, script_filename = '/tmp/temp.ark', '/tmp/temp.scp'
+        lattices = {}
+        for key, num_states in [('one', 3), ('two', 1), ('three', 5)]:
+            lat = LatticeVectorFst()
+            for s in range(num_states):
+                lat.add_state()
+            lat.set_start(0)
+            for s in range(num_states - 1):
+                lat.add_arc(s, LatticeArc(s + 1, s + 2,
+                                          LatticeWeight(s, 0.5), s + 1))
+            lat.set_final(num_states - 1, LatticeWeight(1.0, 2.0))
+            lattices[key] = lat
+
+        for compact in [False, True]:
+            if compact:
+                writer_type = kaldi.util.table.CompactLatticeWriter
+                reader_type = kaldi.util.table.RandomAccessCompactLatticeReader
+                expected = {}
+                for key, lat in lattices.items():
+                    clat = CompactLatticeVectorFst()
+                    for s in range(lat.num_states()):
+                        clat.add_state()
+                    clat.set_start(0)
+                    for s in range(lat.num_states() - 1):
+                        clat.add_arc(s, CompactLatticeArc(
+                            s + 1, s + 1, CompactLatticeWeight(
+                                LatticeWeight(s, 0.5), [s + 2, s + 3]),
+                            s + 1))
+                    clat.set_final(lat.num_states() - 1,
+                                   CompactLatticeWeight(
+                                       LatticeWeight(1.0, 2.0), [7]))
+                    expected[key] = clat
+            else:
+                writer_type = kaldi.util.table.LatticeWriter
+                reader_type = kaldi.util.table.RandomAccessLatticeReader
+                expected = lattices
+
+            with writer_type('ark:' + filename) as writer:
+                for key in ['one', 'two', 'three']:
+                    writer[key] = expected[key]
+
+            entries = kaldi.util.table.index_archive(filename, script_filename)
+            self.assertListEqual(['one', 'two', 'three'],
+                                 [key for key, _ in entries])
+            with reader_type('scp:' + script_filename) as reader:
+                for key in ['three', 'one', 'two']:
+                    self.assertEqual(str(expected[key]), str(reader[key]))
+
+        os.remove(filename)
+        os.remove(script_filename)
+
+class TestRandomAccessReaderGetMany(unittest.TestCase):
+    def testPipeScript(self):
+        filename, script_filename = '/tmp/temp.ark', '/tmp/temp.scp'
+        counter_filename = '/tmp/temp.count'
+        with kaldi.util.table.MatrixWriter(
+                'ark,scp:{},{}'.format(filename, script_filename)) as writer:
+            writer['one'] = Matrix(np.ones((1, 2)))
+            writer['two'] = Matrix(np.ones((2, 2)))
+        if os.path.exists(counter_filename):
+            os.remove(counter_filename)
+
+        # The pipe is run only once, when the reader is opened.
+        rspecifier = 'scp:(echo >> {}; cat {}) |'.format(counter_filename,
+                                                         script_filename)
+        with kaldi.util.table.RandomAccessMatrixReader(rspecifier) as reader:
+            for _ in range(2):
+                two, missing, one = reader.get_many(['two', 'three', 'one'])
+                self.assertIsNone(missing)
+                self.assertEqual((2, 2), two.shape)
+                self.assertEqual((1, 2), one.shape)
+        with open(counter_filename) as f:
+            self.assertEqual(1, len(f.readlines()))
+
+        os.remove(filename)
+        os.remove(script_filename)
+        os.remove(counter_filename)
+
+    def testScriptParsedOnFirstCall(self):
+        filename, script_filename = '/tmp/temp.ark', '/tmp/temp.scp'
+        with kaldi.util.table.MatrixWriter(
+                'ark,scp:{},{}'.format(filename, script_filename)) as writer:
+            writer['one'] = Matrix(np.ones((1, 2)))
+            writer['two'] = Matrix(np.ones((2, 2)))
+
+        with kaldi.util.table.RandomAccessMatrixReader(
+                'scp:' + script_filename) as reader:
+            self.assertIsNone(reader._locations)
+            two, one = reader.get_many(['two', 'one'])
+            self.assertEqual(['one', 'two'], sorted(reader._locations))
+            self.assertEqual((2, 2), two.shape)
+            self.assertEqual((1, 2), one.shape)
+
+        os.remove(filename)
+        os.remove(script_filename)
+
+    def testScalars(self):
+        filename = '/tmp/temp.ark'
+        with kaldi.util.table.IntWriter('ark:' + filename) as writer:
+            writer['one'] = 1
+            writer['two'] = 2
+
+        with kaldi.util.table.RandomAccessIntReader(
+                'ark:' + filename) as reader:
+            self.assertEqual([2, None, 1],
+                             reader.get_many(['two', 'three', 'one']))
+
+        os.remove(filename)
+
+    def testMapped(self):
+        filename, map_filename = '/tmp/temp.ark', '/tmp/temp.map'
+        with kaldi.util.table.MatrixWriter('ark:' + filename) as writer:
+            writer['one'] = Matrix(np.ones((1, 2)))
+            writer['two'] = Matrix(np.ones((2, 2)))
+        with open(map_filename, 'w') as f:
+            f.write('a one\nb two\nc three\n')
+
+        with kaldi.util.table.RandomAccessMatrixReaderMapped(
+                'ark:' + filename, 'ark:' + map_filename,
+                cache_items=1) as reader:
+            for _ in range(2):
+                b, c, a = reader.get_many(['b', 'c', 'a'])
+                self.assertIsInstance(b, Matrix)
+                self.assertEqual((2, 2), b.shape)
+                self.assertIsNone(c)
+                self.assertEqual((1, 2), a.shape)
+
+        os.remove(filename)
+        os.remove(map_filename)
+
+class TestRandomAccessReaderCache(unittest.TestCase):
+    def testCache(self):
+        filename = '/tmp/temp.ark'
+        with kaldi.util.table.MatrixWriter('ark:' + filename) as writer:
+            writer['one'] = Matrix(np.ones((2, 3)))
+            writer['two'] = Matrix(np.ones((2, 3)))
+
+        with kaldi.util.table.RandomAccessMatrixReader(
+                'ark:' + filename, cache_size=30) as reader:
+            self.assertEqual((2, 3), reader['one'].shape)
+            self.assertEqual((2, 3), reader['one'].shape)
+            self.assertEqual((2, 3), reader['two'].shape)
+            self.assertIsNone(reader.get_many(['three'])[0])
+            info = reader.cache_info()
+            self.assertEqual(1, info.hits)
+            self.assertEqual(3, info.misses)
+            self.assertEqual(1, info.evictions)
+            self.assertEqual(24, info.size)
+
+        os.remove(filename)
+
+    def testCacheItems(self):
+        filename = '/tmp/temp.ark'
+        with kaldi.util.table.IntVectorWriter('ark:' + filename) as writer:
+            writer['one'] = [1, 2, 3]
+            writer['two'] = [4, 5]
+            writer['three'] = []
+
+        # Sizes of integer sequences are not known.
+        with self.assertRaises(ValueError):
+            kaldi.util.table.RandomAccessIntVectorReader(
+                'ark:' + filename, cache_size=100)
+
+        with kaldi.util.table.RandomAccessIntVectorReader(
+                'ark:' + filename, cache_items=2) as reader:
+            self.assertEqual([1, 2, 3], reader['one'])
+            self.assertEqual([4, 5], reader['two'])
+            self.assertEqual([1, 2, 3], reader['one'])
+            self.assertEqual([], reader['three'])
+            info = reader.cache_info()
+            self.assertEqual(1, info.hits)
+            self.assertEqual(3, info.misses)
+            self.assertEqual(1, info.evictions)
+            self.assertEqual(2, info.num_items)
+            self.assertEqual(2, info.max_items)
+            self.assertFalse('two' in reader._cache)
+
+        os.remove(filename)
+
+    def _write(self, filename, value):
+        with kaldi.util.table.MatrixWriter('ark:' + filename) as writer:
+            writer['one'] = Matrix(np.full((2, 3), value))
+            writer['two'] = Matrix(np.full((2, 3), value))
+
+    def testCacheDoesNotRetainValues(self):
+        filename = '/tmp/temp.ark'
+        self._write(filename, 1.0)
+
+        # Evicted values are read again from the archive.
+        with kaldi.util.table.RandomAccessMatrixReader(
+                'ark:' + filename, cache_size=30) as reader:
+            self.assertEqual(1.0, reader['one'][0, 0])
+            self.assertEqual(1.0, reader['two'][0, 0])
+            self._write(filename, 2.0)
+            self.assertEqual(2.0, reader['one'][0, 0])
+            self.assertEqual(3, reader.cache_info().misses)
+
+        os.remove(filename)
+
+    def testMappedCacheDoesNotRetainValues(self):
+        filename, map_filename = '/tmp/temp.ark', '/tmp/temp.map'
+        self._write(filename, 1.0)
+        with open(map_filename, 'w') as f:
+            f.write('a one\nb two\n')
+
+        with kaldi.util.table.RandomAccessMatrixReaderMapped(
+                'ark:' + filename, 'ark:' + map_filename,
+                cache_size=30) as reader:
+            self.assertEqual(1.0, reader['a'][0, 0])
+            self.assertEqual(1.0, reader['b'][0, 0])
+            self._write(filename, 2.0)
+            self.assertEqual(2.0, reader['a'][0, 0])
+            self.assertEqual(3, reader.cache_info().misses)
+
+        os.remove(filename)
+        os.remove(map_filename)
+
 
 if __name__ == '__main__':
     unittest.main()
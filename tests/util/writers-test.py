@@ -1,8 +1,12 @@
 from __future__ import division
+import numpy as np
 import os
+import threading
 import unittest
 
-from kaldi.matrix import Vector, Matrix, SubMatrix, SubVector
+from kaldi.matrix import (Vector, Matrix, SubMatrix, SubVector, DoubleVector,
+                          DoubleMatrix)
+from kaldi.matrix.compressed import CompressedMatrix
 from kaldi.util import *
 
 from .mixins import *
@@ -60,12 +64,20 @@ class _TestWriters(AuxMixin):
 class TestVectorWriter(_TestWriters, unittest.TestCase):
     def getExampleObj(self):
         return [Vector([1, 2, 3, 4, 5]),
-                SubVector(Vector([1, 2, 3, 4, 5]))]
+                SubVector(Vector([1, 2, 3, 4, 5])),
+                np.array([1, 2, 3, 4, 5], dtype=np.float32),
+                np.array([1, 2, 3, 4, 5], dtype=np.float64)[::2],
+                DoubleVector([1, 2, 3, 4, 5])]
 
 class TestMatrixWriter(_TestWriters, unittest.TestCase):
     def getExampleObj(self):
         return [Matrix([[3, 5], [7, 11]]),
-                SubMatrix(Matrix([[3, 5], [7, 11]]))]
+                SubMatrix(Matrix([[3, 5], [7, 11]])),
+                SubMatrix(Matrix([[3, 5], [7, 11]]), 0, 2, 1, 1),
+                np.array([[3, 5], [7, 11]], dtype=np.float32),
+                np.array([[3, 5], [7, 11]], dtype=np.float64).T,
+                DoubleMatrix([[3, 5], [7, 11]]),
+                CompressedMatrix(Matrix([[3, 5], [7, 11]]))]
 
 class TestIntWriter(_TestWriters, unittest.TestCase):
     def getExampleObj(self):
@@ -95,5 +107,138 @@ class TestFloatPairVectorWriter(_TestWriters, unittest.TestCase):
     def getExampleObj(self):
         return [[(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)]]
 
+class TestNumpyWriters(unittest.TestCase):
+    def setUp(self):
+        self.filename = '/tmp/temp.ark'
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def testIntVector(self):
+        ali = np.array([1, 1, 2, 3], dtype=np.int64)
+        with kaldi.util.table.IntVectorWriter('ark:' + self.filename) as w:
+            w['one'] = ali
+        rspecifier = 'ark:' + self.filename
+        with kaldi.util.table.SequentialIntVectorReader(rspecifier) as r:
+            keys, values = r.read_many(2, numpy=True)
+        self.assertListEqual(['one'], keys)
+        self.assertEqual(np.int32, values[0].dtype)
+        self.assertTrue(np.array_equal(ali, values[0]))
+
+    def testPosterior(self):
+        offsets = np.array([0, 2, 2, 3])
+        pairs = np.array([[1, 0.5], [2, 0.5], [3, 1.0]])
+        with kaldi.util.table.PosteriorWriter('ark:' + self.filename) as w:
+            w['one'] = (offsets, pairs)
+        rspecifier = 'ark:' + self.filename
+        with kaldi.util.table.RandomAccessPosteriorReader(rspecifier) as r:
+            post_offsets, post_pairs = r.numpy('one')
+        self.assertTrue(np.array_equal(offsets, post_offsets))
+        self.assertTrue(np.array_equal([1, 2, 3], post_pairs['id']))
+        self.assertTrue(np.allclose([0.5, 0.5, 1.0], post_pairs['weight']))
+
+    def testPosteriorSequences(self):
+        # Posteriors given as sequences of frames, including a tuple of two
+        # frames, ragged and empty frames.
+        posts = {'one': ([(1, 0.5), (2, 0.5)], [(3, 1.0)]),
+                 'two': [[], [(4, 0.25), (5, 0.75)], []],
+                 'three': []}
+        with kaldi.util.table.PosteriorWriter('ark:' + self.filename) as w:
+            for key, post in posts.items():
+                w[key] = post
+        rspecifier = 'ark:' + self.filename
+        with kaldi.util.table.RandomAccessPosteriorReader(rspecifier) as r:
+            for key, post in posts.items():
+                offsets, pairs = r.numpy(key)
+                self.assertListEqual([len(frame) for frame in post],
+                                     np.diff(offsets).tolist())
+                self.assertListEqual([i for frame in post for i, _ in frame],
+                                     pairs['id'].tolist())
+
+class TestShardedMatrixWriter(unittest.TestCase):
+    def testWrite(self):
+        pattern, script_filename = '/tmp/temp.{}.ark', '/tmp/temp.scp'
+        keys = ["utt{}".format(i) for i in range(5)]
+        with kaldi.util.table.ShardedMatrixWriter(
+                pattern, 2, script_filename, compress=True) as writer:
+            for i, key in enumerate(keys):
+                writer[key] = Matrix([[i, i + 1], [i + 2, i + 3]])
+
+        with open(script_filename) as f:
+            self.assertListEqual(keys, [line.split()[0] for line in f])
+
+        rspecifier = 'scp:' + script_filename
+        with kaldi.util.table.RandomAccessMatrixReader(rspecifier) as reader:
+            for i, key in enumerate(keys):
+                self.assertAlmostEqual(i + 3, reader[key][1, 1], places=1)
+
+        for i in range(2):
+            os.remove(pattern.format(i))
+            os.remove(pattern.format(i) + '.scp')
+        os.remove(script_filename)
+
+    def testScriptNames(self):
+        # The shard index is the suffix of the archive names.
+        pattern, script_filename = '/tmp/temp.ark.{}', '/tmp/temp.scp'
+        keys = ["utt{}".format(i) for i in range(5)]
+        for script_pattern in [None, '/tmp/temp.{}.scp']:
+            with kaldi.util.table.ShardedMatrixWriter(
+                    pattern, 3, script_filename,
+                    script_pattern=script_pattern) as writer:
+                for i, key in enumerate(keys):
+                    writer[key] = Matrix([[i]])
+
+            rspecifier = 'scp:' + script_filename
+            with kaldi.util.table.RandomAccessMatrixReader(rspecifier) as r:
+                for i, key in enumerate(keys):
+                    self.assertEqual(i, r[key][0, 0])
+
+            for i in range(3):
+                if script_pattern is None:
+                    script = pattern.format(i) + '.scp'
+                else:
+                    script = script_pattern.format(i)
+                with open(script) as f:
+                    self.assertListEqual(keys[i::3],
+                                         [line.split()[0] for line in f])
+                os.remove(pattern.format(i))
+                os.remove(script)
+            os.remove(script_filename)
+
+        with self.assertRaises(ValueError):
+            kaldi.util.table.ShardedMatrixWriter(
+                pattern, 2, script_pattern='/tmp/temp.scp')
+
+    def testFsync(self):
+        pattern, script_filename = '/tmp/temp.{}.ark', '/tmp/temp.scp'
+        fsync_file = kaldi.util.table._fsync_file
+        synced = []
+
+        def record(filename):
+            synced.append((filename, threading.current_thread()))
+            fsync_file(filename)
+
+        # Shards are flushed by their worker threads.
+        kaldi.util.table._fsync_file = record
+        try:
+            with kaldi.util.table.ShardedMatrixWriter(
+                    pattern, 2, script_filename, fsync=True) as writer:
+                for i in range(3):
+                    writer["utt{}".format(i)] = Matrix([[i]])
+        finally:
+            kaldi.util.table._fsync_file = fsync_file
+
+        main = threading.current_thread()
+        shard_files = [f for i in range(2)
+                       for f in (pattern.format(i), pattern.format(i) + '.scp')]
+        self.assertListEqual(sorted(shard_files),
+                             sorted(f for f, t in synced if t is not main))
+        self.assertListEqual([script_filename],
+                             [f for f, t in synced if t is main])
+
+        for filename in shard_files + [script_filename]:
+            os.remove(filename)
+
 if __name__ == '__main__':
     unittest.main()